@@ -5,6 +5,25 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+Despliegue ASGI (vistas async de ver_curso, mis_cursos y panel_estudiante):
+
+    pip install uvicorn
+    DJANGO_SETTINGS_MODULE=chuckyescuela.settings_produccion DB_POOL=1 \
+        uvicorn chuckyescuela.asgi:application --workers 4 --host 0.0.0.0 --port 8000
+
+    o con gunicorn como gestor de procesos:
+        gunicorn chuckyescuela.asgi:application -k uvicorn.workers.UvicornWorker -w 4
+
+- Al cargar este módulo VISTAS_ASYNC vale 1 (salvo que el entorno diga
+  otra cosa) y las URLs usan las versiones async. wsgi.py no lo cambia:
+  el despliegue WSGI (gunicorn chuckyescuela.wsgi) sigue con las síncronas.
+- Usar el pool (DB_POOL=1, chuckyescuela/db/pool.py): bajo ASGI cada
+  petición corre su parte síncrona en un hilo propio y CONN_MAX_AGE no
+  alcanza a reutilizar conexiones; el pool sí.
+- Todos los middlewares del proyecto son síncronos y asíncronos, así la
+  petición no salta a un hilo antes de llegar a una vista async.
+- Comparar latencias WSGI vs ASGI: python manage.py bench_asgi
 """
 
 import os
@@ -12,5 +31,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chuckyescuela.settings')
+os.environ.setdefault('VISTAS_ASYNC', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,179 @@
+"""
+Consultas por petición: cuántas, cuánto tiempo de base de datos y si hay
+una misma consulta repetida muchas veces (la huella de un N+1: una
+consulta por fila de un listado en vez de un JOIN o un prefetch).
+
+Piezas:
+
+    ConsultasMiddleware  mide cada petición, la registra en el log
+                         "chuckyescuela.db.consultas" y, con CONSULTAS_CABECERA,
+                         responde X-Consultas y Server-Timing (visible en la
+                         pestaña Red del navegador).
+    medir()              bloque que mide lo que se ejecute dentro (lo usan
+                         el middleware y los tests de presupuesto).
+
+Configuración (settings):
+
+    CONSULTAS_CABECERA = DEBUG   # cabeceras de diagnóstico en la respuesta
+    CONSULTAS_REPETIDAS = 5      # misma consulta N veces = posible N+1
+
+Las respuestas en streaming (exportaciones CSV) consultan después de que
+el middleware terminó: esas consultas no se cuentan.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+logger = logging.getLogger(__name__)
+
+# Medición en curso (None fuera de medir())
+_medicion = ContextVar("consultas_medicion", default=None)
+
+# Literales que cambian de una fila a otra; la "forma" es lo que queda
+_LISTA_IN = re.compile(r"\bIN \((?:%s|\?)(?:, ?(?:%s|\?))*\)", re.IGNORECASE)
+_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+
+
+def forma(sql):
+    """La consulta sin sus valores: dos filas del mismo N+1 dan la misma forma."""
+    sql = _TEXTO.sub("%s", sql)
+    sql = _NUMERO.sub("%s", sql)
+    return _LISTA_IN.sub("IN (...)", sql)
+
+
+class Medicion:
+    __slots__ = ("consultas", "segundos", "formas", "padre")
+
+    def __init__(self, padre=None):
+        self.consultas = 0
+        self.segundos = 0.0
+        self.formas = Counter()
+        self.padre = padre
+
+    def anotar(self, sql, segundos):
+        self.consultas += 1
+        self.segundos += segundos
+        self.formas[forma(sql)] += 1
+        if self.padre is not None:
+            self.padre.anotar(sql, segundos)
+
+    def repetidas(self, umbral=None):
+        """[(forma, veces)] de las consultas que se repiten `umbral` veces o más."""
+        umbral = settings.CONSULTAS_REPETIDAS if umbral is None else umbral
+        return [(f, n) for f, n in self.formas.most_common() if n >= umbral]
+
+
+# =============================================================
+#           REGISTRO DE CONSULTAS EN CADA CONEXIÓN
+# =============================================================
+
+def _registrar(execute, sql, params, many, context):
+    medicion = _medicion.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.anotar(sql, time.perf_counter() - inicio)
+
+
+def _instalar(conexion):
+    if _registrar not in conexion.execute_wrappers:
+        conexion.execute_wrappers.append(_registrar)
+
+
+def _al_conectar(sender, connection, **kwargs):
+    _instalar(connection)
+
+
+# Conexiones nuevas (de cualquier alias, hilo o pool) quedan instrumentadas;
+# medir() cubre las que ya estaban abiertas al importar este módulo
+connection_created.connect(_al_conectar, dispatch_uid="consultas_registrar")
+
+
+@contextmanager
+def medir():
+    """
+    Mide las consultas del bloque. Anidable: lo medido dentro también
+    cuenta para la medición de afuera.
+
+    Uso:
+        with medir() as medicion:
+            ...
+        medicion.consultas, medicion.segundos, medicion.repetidas()
+    """
+    for conexion in connections.all(initialized_only=True):
+        _instalar(conexion)
+    medicion = Medicion(padre=_medicion.get())
+    token = _medicion.set(medicion)
+    try:
+        yield medicion
+    finally:
+        _medicion.reset(token)
+
+
+# =============================================================
+#                        MIDDLEWARE
+# =============================================================
+
+class ConsultasMiddleware:
+    """
+    Debe ir PRIMERO en MIDDLEWARE: así cuenta también las consultas de la
+    sesión, del usuario y del rol, no solo las de la vista.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with medir() as medicion:
+            response = self.get_response(request)
+        return self._informar(request, response, medicion)
+
+    async def __acall__(self, request):
+        # sync_to_async copia el contexto: las consultas del hilo se anotan aquí
+        with medir() as medicion:
+            response = await self.get_response(request)
+        return self._informar(request, response, medicion)
+
+    def _informar(self, request, response, medicion):
+        milisegundos = medicion.segundos * 1000
+        repetidas = medicion.repetidas()
+
+        logger.info(
+            "%s %s → %s consultas, %.1f ms de base de datos",
+            request.method, request.path, medicion.consultas, milisegundos,
+        )
+        for sql, veces in repetidas:
+            logger.warning(
+                "%s %s: posible N+1, la misma consulta %s veces: %s",
+                request.method, request.path, veces, sql[:300],
+            )
+
+        if settings.CONSULTAS_CABECERA:
+            response["X-Consultas"] = str(medicion.consultas)
+            response["Server-Timing"] = (
+                f'db;dur={milisegundos:.1f};desc="{medicion.consultas} consultas"'
+            )
+            if repetidas:
+                response["X-Consultas-Repetidas"] = str(len(repetidas))
+        return response
@@ -0,0 +1,18 @@
+"""
+Backend MySQL (pymysql) con pool de conexiones.
+
+    "ENGINE": "chuckyescuela.db.mysql_pool"
+
+Ver chuckyescuela/db/pool.py para las opciones de la clave "POOL".
+"""
+
+from django.db.backends.mysql import base
+
+from chuckyescuela.db.pool import ConexionesPoolMixin
+
+
+class DatabaseWrapper(ConexionesPoolMixin, base.DatabaseWrapper):
+
+    def _verificar(self, conexion):
+        # pymysql: lanza OperationalError si el servidor cerró la conexión
+        conexion.ping(reconnect=False)
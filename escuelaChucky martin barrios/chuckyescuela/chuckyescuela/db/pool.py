@@ -0,0 +1,261 @@
+"""
+Pool de conexiones a la base de datos, compartido por los hilos de cada
+proceso (worker de gunicorn/uwsgi).
+
+Django abre una conexión nueva por petición cuando CONN_MAX_AGE = 0 y la
+cierra al terminar. Con los backends de chuckyescuela/db/ ese "abrir" y
+"cerrar" pasan por este pool: la conexión física se presta y se devuelve,
+así la petición se ahorra el handshake TCP + autenticación de MySQL.
+
+Configuración (clave "POOL" de DATABASES[alias], todas opcionales):
+
+    "POOL": {
+        "MAX_CONEXIONES": 10,   # tope de conexiones abiertas por proceso
+        "ESPERA_MAX": 5,        # segundos esperando una libre antes de fallar
+        "MAX_INACTIVA": 300,    # se cierra la que pasó más tiempo sin usarse
+        "MAX_VIDA": 3600,       # se recicla aunque esté sana
+        "VERIFICAR_TRAS": 30,   # ping antes de prestar si estuvo inactiva más que esto
+    }
+
+Métricas por alias con estadisticas(): conexiones creadas, préstamos,
+esperas (y segundos esperados), agotamientos y descartes.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+
+OPCIONES_POR_DEFECTO = {
+    "MAX_CONEXIONES": 10,
+    "ESPERA_MAX": 5,
+    "MAX_INACTIVA": 300,
+    "MAX_VIDA": 3600,
+    "VERIFICAR_TRAS": 30,
+}
+
+
+class PoolAgotado(Exception):
+    """No se liberó ninguna conexión dentro de ESPERA_MAX segundos."""
+
+
+class _Entrada:
+    __slots__ = ("conexion", "creada", "usada")
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.creada = self.usada = time.monotonic()
+
+
+class Pool:
+
+    def __init__(self, alias, opciones=None):
+        self.alias = alias
+        self.opciones = {**OPCIONES_POR_DEFECTO, **(opciones or {})}
+        self.pid = os.getpid()
+        self._libres = deque()          # LIFO: la más recién usada sale primero
+        self._prestadas = {}            # id(conexion) → _Entrada
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+        self.metricas = {
+            "creadas": 0,
+            "prestamos": 0,
+            "reutilizadas": 0,
+            "esperas": 0,
+            "segundos_espera": 0.0,
+            "agotado": 0,
+            "descartadas": 0,
+        }
+
+    # ---------------------------------------------------------
+    def prestar(self, crear, verificar, cerrar):
+        """
+        Devuelve (conexion, es_nueva). `crear()` abre una conexión física,
+        `verificar(c)` lanza una excepción si ya no sirve, `cerrar(c)` la cierra.
+        """
+        opciones = self.opciones
+        limite = time.monotonic() + opciones["ESPERA_MAX"]
+        espero = False
+
+        with self._condicion:
+            while True:
+                ahora = time.monotonic()
+                while self._libres:
+                    entrada = self._libres.pop()
+                    if self._vencida(entrada, ahora):
+                        self._descartar(entrada, cerrar)
+                        continue
+                    break
+                else:
+                    entrada = None
+
+                if entrada is not None or self._abiertas < opciones["MAX_CONEXIONES"]:
+                    break
+
+                restante = limite - ahora
+                if restante <= 0:
+                    self.metricas["agotado"] += 1
+                    raise PoolAgotado(
+                        f"Pool '{self.alias}' agotado: {opciones['MAX_CONEXIONES']} "
+                        f"conexiones en uso por más de {opciones['ESPERA_MAX']} s."
+                    )
+                if not espero:
+                    espero = True
+                    self.metricas["esperas"] += 1
+                inicio = time.monotonic()
+                self._condicion.wait(restante)
+                self.metricas["segundos_espera"] += time.monotonic() - inicio
+
+            if entrada is None:
+                # Se reserva el cupo antes de conectar (fuera del lock)
+                self._abiertas += 1
+            self.metricas["prestamos"] += 1
+
+        if entrada is not None:
+            if time.monotonic() - entrada.usada > opciones["VERIFICAR_TRAS"]:
+                try:
+                    verificar(entrada.conexion)
+                except Exception:
+                    with self._condicion:
+                        self._descartar(entrada, cerrar)
+                        self._abiertas += 1
+                    entrada = None
+            if entrada is not None:
+                with self._condicion:
+                    self._prestadas[id(entrada.conexion)] = entrada
+                    self.metricas["reutilizadas"] += 1
+                return entrada.conexion, False
+
+        try:
+            conexion = crear()
+        except Exception:
+            with self._condicion:
+                self._abiertas -= 1
+                self._condicion.notify()
+            raise
+        entrada = _Entrada(conexion)
+        with self._condicion:
+            self._prestadas[id(conexion)] = entrada
+            self.metricas["creadas"] += 1
+        return conexion, True
+
+    def devolver(self, conexion, cerrar, reutilizable=True):
+        with self._condicion:
+            entrada = self._prestadas.pop(id(conexion), None)
+            if entrada is None:
+                # No salió de este pool (p. ej. heredada de otro proceso)
+                cerrar(conexion)
+                return
+            ahora = entrada.usada = time.monotonic()
+            if reutilizable and not self._vencida(entrada, ahora):
+                self._libres.append(entrada)
+            else:
+                self._descartar(entrada, cerrar)
+            # Las más antiguas quedan al fondo (LIFO): se cierran aquí al vencer
+            while self._libres and self._vencida(self._libres[0], ahora):
+                self._descartar(self._libres.popleft(), cerrar)
+            self._condicion.notify()
+
+    # ---------------------------------------------------------
+    def _vencida(self, entrada, ahora):
+        return (
+            ahora - entrada.usada > self.opciones["MAX_INACTIVA"]
+            or ahora - entrada.creada > self.opciones["MAX_VIDA"]
+        )
+
+    def _descartar(self, entrada, cerrar):
+        # Llamar con el lock tomado
+        self._abiertas -= 1
+        self.metricas["descartadas"] += 1
+        try:
+            cerrar(entrada.conexion)
+        except Exception:
+            pass
+
+    def estadisticas(self):
+        with self._condicion:
+            return {
+                **self.metricas,
+                "segundos_espera": round(self.metricas["segundos_espera"], 4),
+                "abiertas": self._abiertas,
+                "en_uso": len(self._prestadas),
+                "libres": len(self._libres),
+                "max_conexiones": self.opciones["MAX_CONEXIONES"],
+                "pid": self.pid,
+            }
+
+
+# =============================================================
+#                  UN POOL POR ALIAS Y PROCESO
+# =============================================================
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def obtener_pool(alias, opciones=None):
+    with _lock:
+        pool = _pools.get(alias)
+        # Tras un fork (gunicorn --preload) el hijo no reutiliza los sockets del padre
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[alias] = Pool(alias, opciones)
+        return pool
+
+
+def estadisticas():
+    """{alias: métricas} de los pools de este proceso."""
+    with _lock:
+        pools = [p for p in _pools.values() if p.pid == os.getpid()]
+    return {pool.alias: pool.estadisticas() for pool in pools}
+
+
+# =============================================================
+#         MIXIN PARA LOS DatabaseWrapper DE DJANGO
+# =============================================================
+
+class ConexionesPoolMixin:
+    """
+    Se antepone al DatabaseWrapper de un backend de Django.
+    Las subclases definen _verificar(conexion) y, si hace falta,
+    _cerrar(conexion).
+    """
+
+    _conexion_nueva = True
+
+    def _pool(self):
+        return obtener_pool(self.alias, self.settings_dict.get("POOL"))
+
+    def get_new_connection(self, conn_params):
+        try:
+            conexion, self._conexion_nueva = self._pool().prestar(
+                lambda: super(ConexionesPoolMixin, self).get_new_connection(conn_params),
+                self._verificar,
+                self._cerrar,
+            )
+        except PoolAgotado as e:
+            raise self.Database.OperationalError(str(e)) from e
+        return conexion
+
+    def init_connection_state(self):
+        # SET SESSION ... solo la primera vez: la conexión reutilizada ya lo tiene
+        if self._conexion_nueva:
+            super().init_connection_state()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        conexion = self.connection
+        # Cerrada dentro de un atomic(): Django conserva la referencia, no se presta
+        reutilizable = not self.in_atomic_block
+        if reutilizable and self.errors_occurred:
+            reutilizable = self.is_usable()
+        if reutilizable and not self.autocommit:
+            try:
+                conexion.rollback()
+            except Exception:
+                reutilizable = False
+        self._pool().devolver(conexion, self._cerrar, reutilizable)
+
+    def _cerrar(self, conexion):
+        conexion.close()
@@ -0,0 +1,231 @@
+"""
+Réplicas de lectura: los listados y reportes leen de una réplica y el
+resto (escrituras, login, sesiones) sigue en "default" (el primario).
+
+Piezas:
+
+    RouterReplicas       (DATABASE_ROUTERS) decide la base de cada consulta.
+    ReplicasMiddleware   abre el estado de la petición y fija al usuario al
+                         primario unos segundos después de que escribió.
+    @usar_replica        marca una vista de solo lectura: sus lecturas van a
+                         una réplica (si no hay fijación ni escrituras).
+    en_primario()        bloque que lee del primario aunque la vista use réplica.
+
+Configuración (settings):
+
+    REPLICAS_LECTURA = ["replica1", ...]  # alias de DATABASES; [] = desactivado
+    REPLICA_FIJAR_SEGUNDOS = 5            # lectura del primario tras escribir
+    REPLICA_REINTENTO_SEGUNDOS = 30       # réplica caída: no se reintenta antes
+
+Lectura de lo propio: al escribir (p. ej. inscribir_en_curso) la respuesta
+deja la cookie REPLICA_COOKIE; mientras exista, ese navegador lee del
+primario y "Mis cursos" ya muestra la inscripción nueva aunque la réplica
+venga atrasada. Una réplica que no responde se marca caída y se lee del
+primario hasta REPLICA_REINTENTO_SEGUNDOS después.
+"""
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+logger = logging.getLogger(__name__)
+
+REPLICA_COOKIE = "leer_primario"
+
+# Estado de la petición en curso (None fuera de ReplicasMiddleware)
+_estado = ContextVar("replicas_estado", default=None)
+
+# alias → time.monotonic() hasta el que se considera caída
+_caidas = {}
+
+
+class _Estado:
+    __slots__ = ("fijado", "usar_replica", "escribio", "replica")
+
+    def __init__(self, fijado=False):
+        self.fijado = fijado
+        self.usar_replica = False
+        self.escribio = False
+        self.replica = None
+
+
+# =============================================================
+#                     SALUD DE LAS RÉPLICAS
+# =============================================================
+
+def replica_disponible(alias):
+    """
+    True si la réplica acepta conexiones. Con la conexión ya abierta no
+    consulta nada; si falla, la réplica queda caída por
+    REPLICA_REINTENTO_SEGUNDOS y las lecturas vuelven al primario.
+    """
+    hasta = _caidas.get(alias)
+    if hasta is not None:
+        if time.monotonic() < hasta:
+            return False
+        del _caidas[alias]
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError as e:
+        _caidas[alias] = time.monotonic() + settings.REPLICA_REINTENTO_SEGUNDOS
+        logger.warning("Réplica '%s' no disponible, se lee del primario: %s", alias, e)
+        return False
+    return True
+
+
+def estado_replicas():
+    """{alias: True/False} según el último chequeo (para diagnóstico)."""
+    ahora = time.monotonic()
+    return {
+        alias: _caidas.get(alias, 0) <= ahora
+        for alias in settings.REPLICAS_LECTURA
+    }
+
+
+def _elegir_replica(estado):
+    # Una sola réplica por petición: todas sus lecturas ven el mismo estado
+    if estado.replica is None:
+        candidatas = [a for a in settings.REPLICAS_LECTURA if replica_disponible(a)]
+        estado.replica = random.choice(candidatas) if candidatas else DEFAULT_DB_ALIAS
+    return estado.replica
+
+
+# =============================================================
+#                          ROUTER
+# =============================================================
+
+class RouterReplicas:
+
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if (
+            estado is None
+            or not estado.usar_replica
+            or estado.fijado
+            or estado.escribio
+            or not settings.REPLICAS_LECTURA
+        ):
+            return None
+        return _elegir_replica(estado)
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            # Desde aquí la petición lee del primario y el navegador queda fijado
+            estado.escribio = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplicas tienen los mismos datos
+        bases = {DEFAULT_DB_ALIAS, *settings.REPLICAS_LECTURA}
+        if obj1._state.db in bases and obj2._state.db in bases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # En producción el esquema llega a las réplicas por replicación;
+        # en local (dos SQLite) se puede migrar cada una con --database.
+        return None
+
+
+# =============================================================
+#                 MIDDLEWARE, DECORADOR Y BLOQUE
+# =============================================================
+
+class ReplicasMiddleware:
+    """
+    Debe ir DESPUÉS de SessionMiddleware y AuthenticationMiddleware: así
+    guardar la sesión o cargar el usuario no cuenta como "escritura" de
+    la vista ni se hace contra la réplica.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        estado = _Estado(fijado=REPLICA_COOKIE in request.COOKIES)
+        token = _estado.set(estado)
+        try:
+            response = self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self._fijar(estado, response)
+
+    async def __acall__(self, request):
+        # Las consultas async (sync_to_async) copian el contexto: ven el estado
+        estado = _Estado(fijado=REPLICA_COOKIE in request.COOKIES)
+        token = _estado.set(estado)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self._fijar(estado, response)
+
+    def _fijar(self, estado, response):
+        if estado.escribio and settings.REPLICAS_LECTURA:
+            response.set_cookie(
+                REPLICA_COOKIE, "1",
+                max_age=settings.REPLICA_FIJAR_SEGUNDOS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def usar_replica(view_func):
+    """
+    Las lecturas de la vista van a una réplica. Poner debajo de
+    @login_required / @role_required: el usuario y su rol se leen antes,
+    del primario.
+
+    Uso:
+        @login_required
+        @role_required("administrador")
+        @usar_replica
+        def admin_reportes(request): ...
+    """
+
+    if iscoroutinefunction(view_func):
+        async def _wrapped(request, *args, **kwargs):
+            with _replica_activa(True):
+                return await view_func(request, *args, **kwargs)
+    else:
+        def _wrapped(request, *args, **kwargs):
+            with _replica_activa(True):
+                return view_func(request, *args, **kwargs)
+
+    return wraps(view_func)(_wrapped)
+
+
+@contextmanager
+def _replica_activa(activa):
+    estado = _estado.get()
+    if estado is None:
+        yield
+        return
+    anterior = estado.usar_replica
+    estado.usar_replica = activa
+    try:
+        yield
+    finally:
+        estado.usar_replica = anterior
+
+
+def en_primario():
+    """Lecturas del bloque al primario (p. ej. para llenar una caché compartida)."""
+    return _replica_activa(False)
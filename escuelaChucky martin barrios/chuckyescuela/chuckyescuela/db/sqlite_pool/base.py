@@ -0,0 +1,22 @@
+"""
+Backend SQLite con el mismo pool que producción, para probar en local.
+
+    "ENGINE": "chuckyescuela.db.sqlite_pool"
+
+Las bases en memoria no pasan por el pool (Django nunca las cierra).
+"""
+
+from django.db.backends.sqlite3 import base
+
+from chuckyescuela.db.pool import ConexionesPoolMixin
+
+
+class DatabaseWrapper(ConexionesPoolMixin, base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        if self.is_in_memory_db():
+            return base.DatabaseWrapper.get_new_connection(self, conn_params)
+        return super().get_new_connection(conn_params)
+
+    def _verificar(self, conexion):
+        conexion.execute("SELECT 1")
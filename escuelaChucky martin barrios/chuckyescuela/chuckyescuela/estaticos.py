@@ -0,0 +1,145 @@
+"""
+Archivos estáticos: nombres versionados + variantes precomprimidas.
+
+ManifestComprimidoStorage (collectstatic)
+    Igual que ManifestStaticFilesStorage (copia cada archivo con el hash
+    de su contenido en el nombre: css/usuarios/login.3f2a9c1b7d4e.css) y
+    además deja junto a cada CSS/JS una versión .gz y, si está instalado
+    el paquete "brotli", una .br. Así no se comprime en cada petición.
+
+servir_estatico (vista)
+    Sirve STATIC_ROOT cuando no hay un servidor web delante (DEBUG=False
+    y SERVIR_ESTATICOS=True). Elige .br/.gz según Accept-Encoding y marca
+    los archivos versionados como inmutables por un año: al cambiar el
+    contenido cambia el nombre, así que el navegador nunca queda con uno
+    viejo. Con nginx se logra lo mismo con gzip_static / brotli_static y
+    "expires max" sobre /static/.
+"""
+
+import gzip
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:  # opcional: sin brotli solo se generan .gz
+    brotli = None
+
+
+EXTENSIONES_COMPRIMIBLES = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map")
+
+UN_ANIO = 60 * 60 * 24 * 365
+
+# nombre.0123456789ab.css → generado por ManifestStaticFilesStorage
+_VERSIONADO = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+
+
+# =============================================================
+#                 STORAGE PARA collectstatic
+# =============================================================
+
+class ManifestComprimidoStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        generados = set()
+        for nombre, hasheado, procesado in super().post_process(paths, dry_run, **options):
+            if hasheado and not isinstance(procesado, Exception):
+                generados.add(hasheado)
+            yield nombre, hasheado, procesado
+
+        if dry_run:
+            return
+
+        for nombre in sorted(generados):
+            if nombre.endswith(EXTENSIONES_COMPRIMIBLES):
+                self._comprimir(nombre)
+
+    def _comprimir(self, nombre):
+        ruta = self.path(nombre)
+        with open(ruta, "rb") as archivo:
+            contenido = archivo.read()
+
+        variantes = [(".gz", gzip.compress(contenido, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variantes.append((".br", brotli.compress(contenido)))
+
+        for extension, comprimido in variantes:
+            # Solo vale la pena si ahorra al menos un 5 %
+            if len(comprimido) < len(contenido) * 0.95:
+                with open(ruta + extension, "wb") as archivo:
+                    archivo.write(comprimido)
+
+
+# =============================================================
+#              VISTA PARA SERVIR STATIC_ROOT
+# =============================================================
+
+# Content-Encoding → extensión del archivo precomprimido, en orden de preferencia
+VARIANTES = {"br": ".br", "gzip": ".gz"}
+
+
+def calidades_aceptadas(cabecera):
+    """
+    Accept-Encoding → {codificación: q}, p. ej. "gzip, br;q=0" da
+    {"gzip": 1.0, "br": 0.0}. Compara tokens completos (no subcadenas);
+    q=0 rechaza la codificación y un q mal escrito cuenta como 0.
+    """
+    calidades = {}
+    for parte in cabecera.split(","):
+        nombre, *parametros = parte.split(";")
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        q = 1.0
+        for parametro in parametros:
+            clave, _, valor = parametro.partition("=")
+            if clave.strip().lower() == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        calidades[nombre] = q
+    return calidades
+
+
+@require_safe
+def servir_estatico(request, ruta):
+    try:
+        completa = safe_join(settings.STATIC_ROOT, ruta)
+    except ValueError:
+        raise Http404("Archivo no encontrado.")
+    if not os.path.isfile(completa):
+        raise Http404("Archivo no encontrado.")
+
+    tipo, _ = mimetypes.guess_type(completa)
+    calidades = calidades_aceptadas(request.headers.get("Accept-Encoding", ""))
+
+    # La de mayor q que exista en disco; a igual q, br antes que gzip
+    codificacion, mejor = None, 0.0
+    for nombre in VARIANTES:
+        q = calidades.get(nombre, calidades.get("*", 0.0))
+        if q > mejor and os.path.isfile(completa + VARIANTES[nombre]):
+            codificacion, mejor = nombre, q
+    if codificacion:
+        completa += VARIANTES[codificacion]
+
+    response = FileResponse(
+        open(completa, "rb"),
+        content_type=tipo or "application/octet-stream",
+        filename=os.path.basename(ruta),
+    )
+    if codificacion:
+        response.headers["Content-Encoding"] = codificacion
+    response.headers["Vary"] = "Accept-Encoding"
+    if _VERSIONADO.search(ruta):
+        response.headers["Cache-Control"] = f"public, max-age={UN_ANIO}, immutable"
+    else:
+        response.headers["Cache-Control"] = "public, max-age=300"
+    return response
@@ -0,0 +1,75 @@
+"""
+Exportación CSV en streaming para los listados del administrador.
+
+Las filas se leen por lotes de `chunk_size` recorriendo la clave primaria
+(WHERE id > :ultimo ORDER BY id LIMIT n) y se envían al cliente a medida
+que se generan, así la memoria usada no depende de la cantidad de filas.
+Se usa keyset por id y no QuerySet.iterator() porque con MySQL (pymysql)
+el cursor normal trae todo el resultado al cliente de una vez.
+"""
+
+import csv
+
+from django.http import StreamingHttpResponse
+
+
+CHUNK_SIZE = 2000
+
+
+class _Eco:
+    """Pseudo-archivo: csv.writer escribe aquí y recibimos la línea de vuelta."""
+
+    def write(self, valor):
+        return valor
+
+
+def filas_por_lotes(queryset, campos, chunk_size=CHUNK_SIZE):
+    """
+    Genera tuplas con los `campos` del queryset, por lotes ordenados por pk.
+    El primer campo de cada consulta es siempre "pk" (se usa como cursor y
+    no se devuelve).
+    """
+    ultimo = None
+    while True:
+        lote = queryset.order_by("pk")
+        if ultimo is not None:
+            lote = lote.filter(pk__gt=ultimo)
+        filas = list(lote.values_list("pk", *campos)[:chunk_size])
+        if not filas:
+            return
+        for fila in filas:
+            yield fila[1:]
+        ultimo = filas[-1][0]
+        if len(filas) < chunk_size:
+            return
+
+
+# Excel / LibreOffice interpretan como fórmula una celda que empieza así
+INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _neutralizar(valor):
+    """
+    Antepone ' a los textos que la planilla tomaría como fórmula (inyección
+    CSV): nombres y demás datos los escribe cualquiera desde el registro.
+    """
+    if isinstance(valor, str) and valor.startswith(INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def generar_csv(encabezados, filas):
+    """Genera el CSV línea a línea (con BOM para que Excel respete los acentos)."""
+    escritor = csv.writer(_Eco())
+    yield "\ufeff" + escritor.writerow(encabezados)
+    for fila in filas:
+        yield escritor.writerow([_neutralizar(valor) for valor in fila])
+
+
+def respuesta_csv(nombre_archivo, encabezados, filas):
+    response = StreamingHttpResponse(
+        generar_csv(encabezados, filas),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{nombre_archivo}"'
+    return response
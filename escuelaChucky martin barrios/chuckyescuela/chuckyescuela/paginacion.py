@@ -0,0 +1,178 @@
+"""
+Paginación por cursor (keyset) para los listados del proyecto.
+
+En vez de OFFSET (que obliga a la base de datos a recorrer todas las filas
+anteriores), cada página se pide "a partir de" los valores de orden de la
+última fila vista:
+
+    WHERE (fecha, id) < (:fecha, :id) ORDER BY fecha DESC, id DESC LIMIT n
+
+Con un índice sobre las columnas de orden, la página N cuesta lo mismo que
+la página 1. El cursor viaja en la URL (?cursor=...) codificado en base64.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+POR_PAGINA = 50
+POR_PAGINA_MAX = 200
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder recorta los datetime a milisegundos; el cursor
+    # necesita el valor exacto para no saltarse filas.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _codificar(direccion, valores):
+    datos = json.dumps({"d": direccion, "v": valores}, cls=_CursorEncoder)
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip("=")
+
+
+def _decodificar(cursor):
+    """Devuelve (direccion, valores) o None si el cursor no es válido."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        direccion, valores = datos["d"], datos["v"]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None
+    if direccion not in ("sig", "ant") or not isinstance(valores, list):
+        return None
+    return direccion, valores
+
+
+class KeysetPage:
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # Se completan con paginar(): "?filtro=...&cursor=..."
+        self.url_siguiente = None
+        self.url_anterior = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pagina un queryset por cursor.
+
+    `ordering` son los campos de orden (con "-" para descendente) y debe
+    terminar en un campo único (normalmente "id") para que el orden sea total.
+    Funciona tanto con instancias de modelo como con querysets `.values()`.
+    """
+
+    def __init__(self, queryset, ordering, per_page=POR_PAGINA):
+        if not ordering:
+            raise ValueError("KeysetPaginator necesita al menos un campo de orden.")
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.campos = [campo.lstrip("-") for campo in self.ordering]
+        self.descendente = [campo.startswith("-") for campo in self.ordering]
+
+    # ---------------------------------------------------------
+    def _valores(self, fila):
+        if isinstance(fila, dict):
+            return [fila[campo] for campo in self.campos]
+        return [getattr(fila, campo) for campo in self.campos]
+
+    def _filtro(self, valores, hacia_atras):
+        """
+        (a, b, c) > (x, y, z) expandido como:
+        a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND c > z)
+        """
+        condicion = Q()
+        iguales = Q()
+        for campo, desc, valor in zip(self.campos, self.descendente, valores):
+            menor = desc != hacia_atras
+            lookup = f"{campo}__lt" if menor else f"{campo}__gt"
+            condicion |= iguales & Q(**{lookup: valor})
+            iguales &= Q(**{campo: valor})
+        return condicion
+
+    def _orden_invertido(self):
+        return [
+            campo[1:] if campo.startswith("-") else f"-{campo}"
+            for campo in self.ordering
+        ]
+
+    # ---------------------------------------------------------
+    def page(self, cursor=None):
+        decodificado = _decodificar(cursor) if cursor else None
+        if decodificado is not None and len(decodificado[1]) != len(self.campos):
+            decodificado = None
+
+        hacia_atras = decodificado is not None and decodificado[0] == "ant"
+
+        qs = self.queryset
+        if decodificado is not None:
+            try:
+                qs = qs.filter(self._filtro(decodificado[1], hacia_atras))
+            except (ValidationError, ValueError, TypeError):
+                # Cursor alterado (valores que no calzan con los campos):
+                # como uno inválido, se vuelve a la primera página
+                decodificado, hacia_atras = None, False
+        qs = qs.order_by(*(self._orden_invertido() if hacia_atras else self.ordering))
+
+        # Se pide una fila extra solo para saber si hay más páginas
+        filas = list(qs[:self.per_page + 1])
+        hay_mas = len(filas) > self.per_page
+        filas = filas[:self.per_page]
+
+        if hacia_atras:
+            filas.reverse()
+            has_previous, has_next = hay_mas, True
+        else:
+            has_previous, has_next = decodificado is not None, hay_mas
+
+        next_cursor = previous_cursor = None
+        if filas and has_next:
+            next_cursor = _codificar("sig", self._valores(filas[-1]))
+        if filas and has_previous:
+            previous_cursor = _codificar("ant", self._valores(filas[0]))
+
+        return KeysetPage(filas, has_next, has_previous, next_cursor, previous_cursor)
+
+
+def paginar(request, queryset, ordering, per_page=None):
+    """
+    Atajo para vistas: lee ?cursor= y ?por_pagina= del request y arma las
+    URLs de página siguiente/anterior conservando los demás filtros del GET.
+    """
+    if per_page is None:
+        try:
+            per_page = int(request.GET.get("por_pagina", POR_PAGINA))
+        except ValueError:
+            per_page = POR_PAGINA
+    per_page = max(1, min(per_page, POR_PAGINA_MAX))
+
+    pagina = KeysetPaginator(queryset, ordering, per_page).page(request.GET.get("cursor"))
+
+    parametros = request.GET.copy()
+    parametros.pop("cursor", None)
+    if pagina.next_cursor:
+        parametros["cursor"] = pagina.next_cursor
+        pagina.url_siguiente = "?" + parametros.urlencode()
+    if pagina.previous_cursor:
+        parametros["cursor"] = pagina.previous_cursor
+        pagina.url_anterior = "?" + parametros.urlencode()
+    return pagina
@@ -0,0 +1,86 @@
+"""
+Apoyo compartido por los tests de las apps (no se usa en producción).
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from chuckyescuela.db import consultas
+from gestorcursos.models import Asignatura, Curso, Inscripcion
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+# =============================================================
+#        PRESUPUESTO DE CONSULTAS — cada URL de una app
+# =============================================================
+
+class PresupuestoConsultasMixin:
+    """
+    Con datos de tamaño realista, ninguna URL de `modulo_urls` supera su
+    presupuesto ni repite una misma consulta (N+1). La caché se vacía
+    antes de cada visita: se mide el peor caso.
+
+    Cada app indica sus URLs, sus presupuestos
+    (nombre → (rol con el que se visita o None, atributo con el objeto
+    del argumento, máximo)) y cuáles solo aceptan POST; los objetos de
+    los argumentos los elige en su setUpTestData a partir de
+    `cls.cursos` y `cls.estudiantes`.
+    """
+
+    modulo_urls = None
+    presupuestos = {}
+    solo_post = frozenset()
+
+    @staticmethod
+    def crear_usuario(correo, rol):
+        user = User.objects.create_user(username=correo, email=correo, password="Chucky123*")
+        PerfilUsuario.objects.create(user=user, rol=rol)
+        return user
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [
+            Curso.objects.create(nombre=f"Curso {i}", descripcion="Descripción", nivel=f"{i % 4 + 1}° Medio")
+            for i in range(30)
+        ]
+        for curso in cls.cursos:
+            for j in range(2):
+                Asignatura.objects.create(nombre=f"Asignatura {j}", descripcion="Texto", curso=curso)
+        cls.estudiantes = []
+        for n in range(40):
+            estudiante = Estudiante.objects.create(
+                user=cls.crear_usuario(f"presupuesto{n}@chucky.cl", "estudiante"), rut=f"{n}-P", nivel="1° Medio"
+            )
+            for curso in cls.cursos[n % 10:n % 10 + 3]:
+                Inscripcion.objects.create(estudiante=estudiante, curso=curso)
+            cls.estudiantes.append(estudiante)
+
+        cls.usuarios = {
+            "estudiante": cls.estudiantes[0].user,
+            "docente": cls.crear_usuario("presupuesto-docente@chucky.cl", "docente"),
+            "administrador": cls.crear_usuario("presupuesto-admin@chucky.cl", "administrador"),
+        }
+
+    def test_todas_las_urls_tienen_presupuesto(self):
+        self.assertEqual({p.name for p in self.modulo_urls.urlpatterns}, set(self.presupuestos))
+
+    def test_consultas_por_url(self):
+        for nombre, (rol, argumento, maximo) in self.presupuestos.items():
+            with self.subTest(nombre):
+                cache.clear()
+                if rol:
+                    self.client.force_login(self.usuarios[rol])
+                else:
+                    self.client.logout()
+                args = [getattr(self, argumento).id] if argumento else []
+
+                pedir = self.client.post if nombre in self.solo_post else self.client.get
+                with consultas.medir() as medicion:
+                    response = pedir(reverse(nombre, args=args))
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+
+                self.assertLess(response.status_code, 400)
+                self.assertLessEqual(medicion.consultas, maximo)
+                self.assertEqual(medicion.repetidas(3), [])
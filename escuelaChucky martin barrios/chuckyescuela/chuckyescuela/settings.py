@@ -31,6 +31,8 @@ INSTALLED_APPS = [
     # Tus apps personalizadas
     'gestorusers',
     'gestorcursos',
+    'gestorreportes',
+    'gestortareas',
 ]
 
 
@@ -38,11 +40,17 @@ INSTALLED_APPS = [
 #       MIDDLEWARE
 # ============================
 MIDDLEWARE = [
+    # Primero: cuenta las consultas de toda la petición (ver abajo CONSULTAS_*)
+    'chuckyescuela.db.consultas.ConsultasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Rol del usuario cacheado en sesión → request.rol / request.perfil
+    'gestorusers.middleware.PerfilUsuarioMiddleware',
+    # Lecturas de listados a réplicas; fija al primario tras escribir
+    'chuckyescuela.db.replicas.ReplicasMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -75,6 +83,11 @@ TEMPLATES = [
 
 
 WSGI_APPLICATION = 'chuckyescuela.wsgi.application'
+ASGI_APPLICATION = 'chuckyescuela.asgi.application'
+
+# Versiones async de ver_curso, mis_cursos y panel_estudiante (ver asgi.py).
+# Solo convienen bajo ASGI: con WSGI cada petición levantaría un event loop.
+VISTAS_ASYNC = os.environ.get("VISTAS_ASYNC", "0") == "1"
 
 
 
@@ -95,6 +108,121 @@ DATABASES = {
     }
 }
 
+# Réplicas de lectura (ver chuckyescuela/db/replicas.py). Sin alias en
+# REPLICAS_LECTURA el router no cambia nada: todo va a "default".
+DATABASE_ROUTERS = ['chuckyescuela.db.replicas.RouterReplicas']
+REPLICAS_LECTURA = []
+REPLICA_FIJAR_SEGUNDOS = 5
+REPLICA_REINTENTO_SEGUNDOS = 30
+
+# Consultas por petición (chuckyescuela/db/consultas.py): cantidad y tiempo
+# en el log "chuckyescuela.db.consultas" y, con CONSULTAS_CABECERA, en las
+# cabeceras X-Consultas / Server-Timing. Una misma consulta repetida
+# CONSULTAS_REPETIDAS veces en una petición se avisa como posible N+1.
+CONSULTAS_CABECERA = os.environ.get("CONSULTAS_CABECERA", "1" if DEBUG else "0") == "1"
+CONSULTAS_REPETIDAS = int(os.environ.get("CONSULTAS_REPETIDAS", "5"))
+
+# Avisos de réplicas y de N+1 a la consola; DB_LOG_NIVEL=INFO agrega una
+# línea por petición con sus consultas
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "consola": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "chuckyescuela.db": {
+            "handlers": ["consola"],
+            "level": os.environ.get("DB_LOG_NIVEL", "WARNING"),
+        },
+    },
+}
+
+
+
+# ============================
+#   CACHÉ, SESIONES Y MENSAJES
+# ============================
+# La caché guarda las versiones del perfil y del catálogo (y las sesiones
+# en modo cached_db). Con varios procesos (gunicorn -w N, o los procesos
+# de bench_pool/bench_asgi) tiene que ser COMPARTIDA, si no cada proceso
+# invalida solo la suya:
+#   CACHE_MODO=local    memoria del proceso (default; desarrollo y tests;
+#                       settings_produccion no lo acepta)
+#   CACHE_MODO=archivo  directorio CACHE_UBICACION, compartido entre procesos
+#                       de la misma máquina (sirve de reemplazo en pruebas)
+#   CACHE_MODO=redis    servidor CACHE_UBICACION (redis://host:6379/0)
+CACHE_MODO = os.environ.get("CACHE_MODO", "local")
+
+_CACHES_POR_MODO = {
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "archivo": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_UBICACION", str(BASE_DIR / ".cache")),
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CACHE_UBICACION", "redis://127.0.0.1:6379/0"),
+    },
+}
+
+CACHES = {
+    "default": _CACHES_POR_MODO[CACHE_MODO],
+}
+
+# Dónde vive la sesión:
+#   SESION_MODO=db         tabla django_session: un SELECT por petición
+#   SESION_MODO=cached_db  caché + tabla: se lee de la caché y la tabla solo
+#                          se escribe cuando la sesión cambia (login, rol)
+#   SESION_MODO=cookie     cookie firmada: ni tabla ni caché. Cerrar sesión
+#                          no invalida copias viejas de la cookie.
+# cached_db con caché local dejaría a cada proceso con su propia copia de
+# la sesión (p. ej. seguiría abierta tras logout en otro worker): por eso
+# solo es el default cuando la caché es compartida.
+SESION_MODO = os.environ.get("SESION_MODO", "db" if CACHE_MODO == "local" else "cached_db")
+
+_SESIONES_POR_MODO = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cookie": "django.contrib.sessions.backends.signed_cookies",
+}
+
+SESSION_ENGINE = _SESIONES_POR_MODO[SESION_MODO]
+
+# Los mensajes (éxito/error tras un redirect) viajan solo en cookie: nunca
+# modifican la sesión. Si no caben (~2 KB) se descartan los más antiguos.
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+
+# ============================
+#  AUTENTICACIÓN Y CONTRASEÑAS
+# ============================
+# Login en una sola consulta: User + PerfilUsuario (select_related).
+# ModelBackend queda después solo para las sesiones abiertas antes del
+# cambio (guardan su ruta); PerfilUsuarioBackend corta la cadena al
+# fallar, así un login fallido no se hashea dos veces.
+AUTHENTICATION_BACKENDS = [
+    'gestorusers.backends.PerfilUsuarioBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Costo del hash PBKDF2 de las contraseñas. Es el factor dominante del
+# tiempo de login: más iteraciones = más seguro pero menos logins/segundo.
+# Se puede SUBIR por entorno y medir con: python manage.py bench_login
+# (al cambiarlo, cada usuario se re-hashea solo en su próximo login).
+# Sin definir (o por debajo del default de Django) se usa el de Django.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", "0")) or None
+
+PASSWORD_HASHERS = [
+    'gestorusers.hashers.PBKDF2ConfigurableHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
 
 
 # ============================
@@ -134,6 +262,28 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static"
 ]
+# Destino de "python manage.py collectstatic"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Fuera de DEBUG: nombres con hash + variantes .gz/.br (chuckyescuela/estaticos.py).
+# Requiere collectstatic antes de levantar el servidor.
+ESTATICOS_MANIFEST = os.environ.get("ESTATICOS_MANIFEST", "0" if DEBUG else "1") == "1"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "chuckyescuela.estaticos.ManifestComprimidoStorage"
+            if ESTATICOS_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
+# Django sirve STATIC_ROOT (con caché de un año) cuando no hay nginx delante
+SERVIR_ESTATICOS = os.environ.get("SERVIR_ESTATICOS", "1") == "1"
 
 
 
@@ -0,0 +1,128 @@
+"""
+Perfil de producción: DJANGO_SETTINGS_MODULE=chuckyescuela.settings_produccion
+
+Parte de settings.py y cambia lo que depende del entorno. Todo se
+configura con variables de entorno:
+
+    DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS (separados por coma), DJANGO_DEBUG
+    DB_MOTOR        mysql (default) | sqlite (para probar el perfil en local)
+    DB_NOMBRE, DB_USUARIO, DB_PASSWORD, DB_HOST, DB_PUERTO
+    DB_POOL         1 (default) = pool de conexiones (chuckyescuela/db/pool.py)
+                    0 = una conexión por petición, o persistente con DB_CONN_MAX_AGE
+    DB_POOL_MAX, DB_POOL_ESPERA, DB_POOL_INACTIVA, DB_POOL_VIDA, DB_POOL_VERIFICAR
+    DB_REPLICAS     réplicas de lectura separadas por coma: hosts (mysql) o
+                    rutas de archivo (sqlite). Quedan como replica1, replica2...
+    DB_REPLICA_FIJAR, DB_REPLICA_REINTENTO   (segundos, ver chuckyescuela/db/replicas.py)
+    CONSULTAS_CABECERA, CONSULTAS_REPETIDAS, DB_LOG_NIVEL   (ver chuckyescuela/db/consultas.py)
+    CACHE_MODO      redis (default) | archivo. "local" no se acepta: con
+                    varios workers cada uno invalidaría solo su propia caché
+    CACHE_UBICACION, SESION_MODO   (ver settings.py)
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import _CACHES_POR_MODO, _SESIONES_POR_MODO, BASE_DIR, DATABASES, SECRET_KEY, STORAGES
+
+
+DEBUG = os.environ.get("DJANGO_DEBUG", "0") == "1"
+SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", SECRET_KEY)
+ALLOWED_HOSTS = [h for h in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",") if h]
+
+
+# ============================
+#   BASE DE DATOS CON POOL
+# ============================
+DB_MOTOR = os.environ.get("DB_MOTOR", "mysql")
+DB_POOL = os.environ.get("DB_POOL", "1") == "1"
+
+if DB_MOTOR == "sqlite":
+    _base = {
+        "ENGINE": "chuckyescuela.db.sqlite_pool" if DB_POOL else "django.db.backends.sqlite3",
+        "NAME": os.environ.get("DB_NOMBRE", str(BASE_DIR / "chuckyescuela_db.sqlite3")),
+    }
+else:
+    _mysql = DATABASES["default"]
+    _base = {
+        **_mysql,
+        "ENGINE": "chuckyescuela.db.mysql_pool" if DB_POOL else "django.db.backends.mysql",
+        "NAME": os.environ.get("DB_NOMBRE", _mysql["NAME"]),
+        "USER": os.environ.get("DB_USUARIO", _mysql["USER"]),
+        "PASSWORD": os.environ.get("DB_PASSWORD", _mysql["PASSWORD"]),
+        "HOST": os.environ.get("DB_HOST", _mysql["HOST"]),
+        "PORT": os.environ.get("DB_PUERTO", _mysql["PORT"]),
+    }
+
+DATABASES = {
+    "default": {
+        **_base,
+        # Con pool, Django "cierra" al final de cada petición y la conexión
+        # vuelve al pool; sin pool se puede usar la persistencia de Django.
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": True,
+        "POOL": {
+            "MAX_CONEXIONES": int(os.environ.get("DB_POOL_MAX", "10")),
+            "ESPERA_MAX": float(os.environ.get("DB_POOL_ESPERA", "5")),
+            "MAX_INACTIVA": float(os.environ.get("DB_POOL_INACTIVA", "300")),
+            "MAX_VIDA": float(os.environ.get("DB_POOL_VIDA", "3600")),
+            "VERIFICAR_TRAS": float(os.environ.get("DB_POOL_VERIFICAR", "30")),
+        },
+    }
+}
+
+# Cada réplica copia la configuración del primario (pool incluido) con
+# otro host o archivo. En los tests apunta al primario (MIRROR).
+REPLICAS_LECTURA = []
+for _n, _destino in enumerate(
+    (d.strip() for d in os.environ.get("DB_REPLICAS", "").split(",") if d.strip()), start=1
+):
+    _clave = "NAME" if DB_MOTOR == "sqlite" else "HOST"
+    DATABASES[f"replica{_n}"] = {
+        **DATABASES["default"],
+        _clave: _destino,
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICAS_LECTURA.append(f"replica{_n}")
+
+REPLICA_FIJAR_SEGUNDOS = int(os.environ.get("DB_REPLICA_FIJAR", "5"))
+REPLICA_REINTENTO_SEGUNDOS = int(os.environ.get("DB_REPLICA_REINTENTO", "30"))
+
+
+# ============================
+#   CACHÉ COMPARTIDA Y SESIONES
+# ============================
+# Las versiones del rol en sesión, del catálogo y del panel del estudiante
+# se invalidan en la caché: si no es compartida, un cambio solo se ve en
+# el proceso que lo hizo y los demás siguen sirviendo datos viejos.
+CACHE_MODO = os.environ.get("CACHE_MODO", "redis")
+if CACHE_MODO not in _CACHES_POR_MODO or CACHE_MODO == "local":
+    raise ImproperlyConfigured(
+        f'CACHE_MODO="{CACHE_MODO}" no sirve en producción: use "redis" o "archivo" (caché compartida).'
+    )
+CACHES = {"default": _CACHES_POR_MODO[CACHE_MODO]}
+
+SESION_MODO = os.environ.get("SESION_MODO", "cached_db")
+SESSION_ENGINE = _SESIONES_POR_MODO[SESION_MODO]
+
+
+# settings.py lo decidió con DEBUG=True
+CONSULTAS_CABECERA = os.environ.get("CONSULTAS_CABECERA", "1" if DEBUG else "0") == "1"
+
+
+# ============================
+#       STATIC FILES
+# ============================
+# settings.py decidió el storage con DEBUG=True; aquí se vuelve a decidir
+ESTATICOS_MANIFEST = os.environ.get("ESTATICOS_MANIFEST", "0" if DEBUG else "1") == "1"
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {
+        "BACKEND": (
+            "chuckyescuela.estaticos.ManifestComprimidoStorage"
+            if ESTATICOS_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
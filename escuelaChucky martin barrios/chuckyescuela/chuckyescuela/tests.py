@@ -0,0 +1,338 @@
+import base64
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import parse_qs
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from chuckyescuela import estaticos, exportacion
+from chuckyescuela.db import pool
+from chuckyescuela.paginacion import KeysetPaginator, paginar
+from gestorcursos.models import Curso, Inscripcion
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+# =============================================================
+#        ESTÁTICOS — variante según Accept-Encoding
+# =============================================================
+
+class ServirEstaticoTests(SimpleTestCase):
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        for nombre in ("app.0123456789ab.css", "app.0123456789ab.css.gz", "app.0123456789ab.css.br"):
+            with open(os.path.join(carpeta.name, nombre), "w") as archivo:
+                archivo.write(nombre)
+
+        ajustes = override_settings(STATIC_ROOT=carpeta.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def servir(self, aceptadas):
+        request = RequestFactory().get("/static/app.0123456789ab.css", HTTP_ACCEPT_ENCODING=aceptadas)
+        response = estaticos.servir_estatico(request, "app.0123456789ab.css")
+        contenido = b"".join(response.streaming_content).decode()
+        response.close()
+        return response.headers.get("Content-Encoding"), contenido
+
+    def test_elige_por_token_y_calidad(self):
+        casos = {
+            "gzip, deflate, br": "br",
+            "gzip, br;q=0": "gzip",
+            "br;q=0.5, gzip;q=0.8": "gzip",
+            "GZIP;Q=1, BR;q=1": "br",
+            "*": "br",
+            "*, br;q=0": "gzip",
+            "brotli, xgzip": None,   # solo contienen "br" / "gzip"
+            "br;q=0, gzip;q=0": None,
+            "br;q=abc": None,
+            "": None,
+        }
+        for aceptadas, esperada in casos.items():
+            with self.subTest(aceptadas=aceptadas):
+                codificacion, contenido = self.servir(aceptadas)
+                self.assertEqual(codificacion, esperada)
+                extension = {"br": ".br", "gzip": ".gz", None: ""}[esperada]
+                self.assertEqual(contenido, "app.0123456789ab.css" + extension)
+
+    def test_calidades_aceptadas(self):
+        self.assertEqual(
+            estaticos.calidades_aceptadas(" gzip ;q=0.3 , br;level=5;q=0,identity"),
+            {"gzip": 0.3, "br": 0.0, "identity": 1.0},
+        )
+
+
+# =============================================================
+#        PAGINACIÓN POR CURSOR (chuckyescuela/paginacion.py)
+# =============================================================
+
+class KeysetPaginatorTests(TestCase):
+    ORDEN = ("-fecha_inscripcion", "-id")
+
+    @classmethod
+    def setUpTestData(cls):
+        estudiante = Estudiante.objects.create(user=User.objects.create(username="pagina@chucky.cl"), rut="1-P")
+        cursos = [Curso.objects.create(nombre=f"Curso {n}") for n in range(7)]
+        cls.inscripciones = [Inscripcion.objects.create(estudiante=estudiante, curso=c) for c in cursos]
+
+        # Empates en la fecha (columna no única): 3 + 2 + 2 filas
+        base = timezone.now().replace(microsecond=123456)
+        for i, inscripcion in enumerate(cls.inscripciones):
+            fecha = base - timedelta(days=(0, 0, 0, 1, 1, 2, 2)[i])
+            Inscripcion.objects.filter(pk=inscripcion.pk).update(fecha_inscripcion=fecha)
+
+        cls.ordenadas = list(Inscripcion.objects.order_by(*cls.ORDEN).values_list("id", flat=True))
+
+    def paginador(self, queryset=None, por_pagina=2):
+        if queryset is None:
+            queryset = Inscripcion.objects.all()
+        return KeysetPaginator(queryset, self.ORDEN, por_pagina)
+
+    def test_hacia_adelante_y_hacia_atras(self):
+        paginas, cursor = [], None
+        while True:
+            pagina = self.paginador().page(cursor)
+            paginas.append(pagina)
+            if not pagina.has_next:
+                break
+            cursor = pagina.next_cursor
+
+        # Todas las filas una sola vez y en orden, pese a los empates
+        self.assertEqual([i.id for p in paginas for i in p], self.ordenadas)
+        self.assertEqual([len(p) for p in paginas], [2, 2, 2, 1])
+        self.assertFalse(paginas[0].has_previous)
+        self.assertIsNone(paginas[0].previous_cursor)
+        self.assertIsNone(paginas[-1].next_cursor)
+
+        # De la última a la primera con el cursor "anterior"
+        hacia_atras, pagina = [], paginas[-1]
+        while pagina.has_previous:
+            pagina = self.paginador().page(pagina.previous_cursor)
+            hacia_atras.append([i.id for i in pagina])
+        self.assertEqual(hacia_atras, [[i.id for i in p] for p in reversed(paginas[:-1])])
+        self.assertTrue(pagina.has_next)
+
+    def test_con_values(self):
+        queryset = Inscripcion.objects.values("id", "fecha_inscripcion")
+        primera = self.paginador(queryset, por_pagina=4).page()
+        segunda = self.paginador(queryset, por_pagina=4).page(primera.next_cursor)
+        self.assertEqual([f["id"] for f in [*primera, *segunda]], self.ordenadas)
+
+    def test_cursor_invalido_o_alterado_da_la_primera_pagina(self):
+        def cursor(datos):
+            return base64.urlsafe_b64encode(json.dumps(datos).encode()).decode()
+
+        primera = [i.id for i in self.paginador().page()]
+        for valor in (
+            "%%no-es-base64%%",
+            base64.urlsafe_b64encode(b"no es json").decode(),
+            cursor({"d": "sig"}),
+            cursor({"d": "arriba", "v": ["2024-01-01T00:00:00+00:00", 1]}),
+            cursor({"d": "sig", "v": [1]}),                         # falta un campo
+            cursor({"d": "sig", "v": ["no-es-fecha", 1]}),
+            cursor({"d": "ant", "v": ["2024-01-01T00:00:00+00:00", "abc"]}),
+            cursor({"d": "sig", "v": [None, None]}),
+            cursor({"d": "sig", "v": [[1], {}]}),
+        ):
+            with self.subTest(cursor=valor):
+                pagina = self.paginador().page(valor)
+                self.assertEqual([i.id for i in pagina], primera)
+                self.assertFalse(pagina.has_previous)
+
+    def test_pagina_vacia(self):
+        pagina = self.paginador(Inscripcion.objects.none()).page()
+        self.assertEqual((list(pagina), pagina.has_next, pagina.has_previous), ([], False, False))
+        self.assertIsNone(pagina.next_cursor)
+
+        # Después de la última fila (se borró lo que seguía): vacía, sin cursores
+        seis = self.paginador(por_pagina=6).page()
+        Inscripcion.objects.filter(pk=self.ordenadas[6]).delete()
+        despues = self.paginador().page(seis.next_cursor)
+        self.assertEqual(list(despues), [])
+        self.assertFalse(despues.has_next)
+        self.assertIsNone(despues.next_cursor)
+        self.assertIsNone(despues.previous_cursor)
+
+    def test_paginar_conserva_los_filtros(self):
+        request = RequestFactory().get("/", {"curso": "3", "por_pagina": "2"})
+        pagina = paginar(request, Inscripcion.objects.all(), self.ORDEN)
+        self.assertEqual(len(pagina), 2)
+        parametros = parse_qs(pagina.url_siguiente[1:])
+        self.assertEqual(parametros["curso"], ["3"])
+        self.assertEqual(parametros["cursor"], [pagina.next_cursor])
+        self.assertIsNone(pagina.url_anterior)
+
+        # por_pagina fuera de rango o inválido
+        for valor, esperado in (("0", 1), ("abc", 7), ("100000", 7)):
+            request = RequestFactory().get("/", {"por_pagina": valor})
+            self.assertEqual(len(paginar(request, Inscripcion.objects.all(), self.ORDEN)), esperado)
+
+
+# =============================================================
+#     POOL DE CONEXIONES (chuckyescuela/db/pool.py, sqlite_pool)
+# =============================================================
+
+class PoolConexionesTests(SimpleTestCase):
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.ruta = os.path.join(carpeta.name, "pool.sqlite3")
+        # Un alias propio por test: los pools son por alias y proceso
+        self.alias = f"pool_{self._testMethodName}"
+        self.addCleanup(self.cerrar_pool)
+
+    def conexiones(self, **opciones):
+        """Handler aparte (no toca django.db.connections) con el backend sqlite_pool."""
+        return ConnectionHandler({
+            # ConnectionHandler exige un "default"; no se usa
+            "default": {"ENGINE": "django.db.backends.dummy"},
+            self.alias: {"ENGINE": "chuckyescuela.db.sqlite_pool", "NAME": self.ruta, "POOL": opciones},
+        })
+
+    def cerrar_pool(self):
+        actual = pool._pools.pop(self.alias, None)
+        if actual is not None:
+            for entrada in actual._libres:
+                entrada.conexion.close()
+
+    def estadisticas(self):
+        return pool.estadisticas()[self.alias]
+
+    def test_la_conexion_se_devuelve_y_se_reutiliza(self):
+        conexion = self.conexiones()[self.alias]
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        fisica = conexion.connection
+        conexion.close()
+        self.assertEqual((self.estadisticas()["libres"], self.estadisticas()["en_uso"]), (1, 0))
+
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertIs(conexion.connection, fisica)
+        conexion.close()
+
+        metricas = self.estadisticas()
+        self.assertEqual((metricas["creadas"], metricas["prestamos"], metricas["reutilizadas"]), (1, 2, 1))
+        self.assertEqual(metricas["abiertas"], 1)
+
+    def test_la_conexion_rota_se_descarta(self):
+        # VERIFICAR_TRAS=0: siempre se verifica antes de prestar
+        conexion = self.conexiones(VERIFICAR_TRAS=0)[self.alias]
+        conexion.ensure_connection()
+        rota = conexion.connection
+        conexion.close()
+        rota.close()  # p. ej. el servidor cortó la conexión mientras esperaba
+
+        conexion.ensure_connection()
+        self.assertIsNot(conexion.connection, rota)
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conexion.close()
+
+        metricas = self.estadisticas()
+        self.assertEqual((metricas["creadas"], metricas["descartadas"], metricas["abiertas"]), (2, 1, 1))
+
+    def test_el_pool_tiene_tope(self):
+        manejador = self.conexiones(MAX_CONEXIONES=2, ESPERA_MAX=0.1)
+        primera, segunda, tercera = (manejador.create_connection(self.alias) for _ in range(3))
+        primera.ensure_connection()
+        segunda.ensure_connection()
+
+        with self.assertRaises(OperationalError):
+            tercera.ensure_connection()
+        metricas = self.estadisticas()
+        self.assertEqual((metricas["agotado"], metricas["abiertas"]), (1, 2))
+
+        # Si otro hilo devuelve una mientras espera, la toma
+        pool.obtener_pool(self.alias).opciones["ESPERA_MAX"] = 5
+        primera.inc_thread_sharing()
+        devolucion = threading.Timer(0.2, primera.close)
+        devolucion.start()
+        tercera.ensure_connection()
+        devolucion.join()
+
+        metricas = self.estadisticas()
+        self.assertEqual((metricas["esperas"], metricas["abiertas"], metricas["creadas"]), (2, 2, 2))
+        self.assertEqual(metricas["reutilizadas"], 1)
+        segunda.close()
+        tercera.close()
+
+
+# =============================================================
+#       EXPORTACIÓN CSV — sin inyección de fórmulas
+# =============================================================
+
+class ExportacionCsvTests(TestCase):
+
+    def test_neutraliza_las_celdas_que_parecen_formula(self):
+        filas = [
+            ("=HYPERLINK(\"http://x\")", "+56 9", "-2+3", "@SUM(A1)", "\tA", "\rB"),
+            ("Ana", "a=b", "", None, -5, 1.5),
+        ]
+        lineas = list(exportacion.generar_csv(["c"] * 6, filas))
+        leidas = list(csv.reader("".join(lineas[1:]).splitlines(keepends=True)))
+        self.assertEqual(leidas, [
+            ["'=HYPERLINK(\"http://x\")", "'+56 9", "'-2+3", "'@SUM(A1)", "'\tA", "'\rB"],
+            ["Ana", "a=b", "", "", "-5", "1.5"],
+        ])
+
+    def test_exportar_estudiantes(self):
+        admin = User.objects.create_user(username="admin-csv@chucky.cl", password="Chucky123*")
+        PerfilUsuario.objects.create(user=admin, rol="administrador")
+        Estudiante.objects.create(
+            user=User.objects.create(username="malo@chucky.cl", first_name="=cmd|' /C calc'!A0", last_name="@Pérez"),
+            rut="2-C",
+        )
+
+        self.client.force_login(admin)
+        response = self.client.get(reverse("admin_exportar_estudiantes"))
+        contenido = b"".join(response.streaming_content).decode("utf-8-sig")
+        encabezados, fila = csv.reader(contenido.splitlines())
+        self.assertEqual(encabezados[0], "Nombre")
+        self.assertEqual(fila[:4], ["'=cmd|' /C calc'!A0", "'@Pérez", "", "2-C"])
+
+
+# =============================================================
+#      PERFIL DE PRODUCCIÓN — caché compartida obligatoria
+# =============================================================
+
+class PerfilProduccionTests(SimpleTestCase):
+
+    def cargar(self, **entorno):
+        """Ejecuta una copia de settings_produccion con `entorno` (sin tocar los settings activos)."""
+        spec = importlib.util.find_spec("chuckyescuela.settings_produccion")
+        modulo = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(os.environ, entorno):
+            for clave in ("CACHE_MODO", "SESION_MODO"):
+                if clave not in entorno:
+                    os.environ.pop(clave, None)
+            spec.loader.exec_module(modulo)
+        return modulo
+
+    def test_por_defecto_redis_y_sesion_cached_db(self):
+        perfil = self.cargar(DB_MOTOR="sqlite")
+        self.assertEqual(perfil.CACHES["default"]["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(perfil.SESSION_ENGINE, "django.contrib.sessions.backends.cached_db")
+
+    def test_archivo_se_acepta(self):
+        perfil = self.cargar(DB_MOTOR="sqlite", CACHE_MODO="archivo")
+        self.assertEqual(perfil.CACHES["default"]["BACKEND"], "django.core.cache.backends.filebased.FileBasedCache")
+
+    def test_cache_local_no_arranca(self):
+        for modo in ("local", "memcached"):
+            with self.subTest(modo=modo), self.assertRaises(ImproperlyConfigured):
+                self.cargar(DB_MOTOR="sqlite", CACHE_MODO=modo)
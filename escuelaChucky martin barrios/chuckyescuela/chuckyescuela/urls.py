@@ -14,8 +14,11 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from chuckyescuela.estaticos import servir_estatico
 
 urlpatterns = [
 
@@ -27,4 +30,17 @@ urlpatterns = [
 
 
     path("cursos/", include("gestorcursos.urls")),
+
+    # API JSON de solo lectura para integraciones (gestorcursos/api.py)
+    path("api/v1/", include("gestorcursos.api")),
 ]
+
+# Archivos estáticos versionados (en DEBUG los sirve runserver directamente)
+if not settings.DEBUG and settings.SERVIR_ESTATICOS:
+    urlpatterns += [
+        re_path(
+            r"^%s(?P<ruta>.*)$" % settings.STATIC_URL.lstrip("/"),
+            servir_estatico,
+            name="servir_estatico",
+        ),
+    ]
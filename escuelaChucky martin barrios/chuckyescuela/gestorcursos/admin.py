@@ -1,3 +1,24 @@
 from django.contrib import admin
+from .models import InscripcionHistorica, Periodo
 
-# Register your models here.
+
+# Los periodos se crean y cierran aquí; archivar_inscripciones hace el resto
+@admin.register(Periodo)
+class PeriodoAdmin(admin.ModelAdmin):
+    list_display = ("nombre", "inicio", "fin", "cerrado", "archivado")
+    list_filter = ("cerrado",)
+
+
+# El historial lo escribe archivar_inscripciones: solo lectura
+@admin.register(InscripcionHistorica)
+class InscripcionHistoricaAdmin(admin.ModelAdmin):
+    list_display = ("id", "estudiante", "curso", "periodo", "fecha_inscripcion")
+    list_filter = ("periodo",)
+    list_select_related = ("estudiante__user", "curso", "periodo")
+    raw_id_fields = ("estudiante", "curso")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
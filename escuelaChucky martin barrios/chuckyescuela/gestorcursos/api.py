@@ -0,0 +1,288 @@
+"""
+API JSON de solo lectura (v1) para integraciones: /api/v1/...
+
+    cursos/         cursos/<id>/
+    asignaturas/    asignaturas/<id>/
+    inscripciones/  inscripciones/<id>/
+    estudiantes/    estudiantes/<id>/
+
+Solo administradores (el mismo rol que las vistas admin_*), con la sesión
+de Django: sin sesión responde 401 y con otro rol 403, en JSON.
+
+Parámetros de los listados:
+
+    ?campos=id,nombre     solo esos campos (el id va siempre)
+    ?nivel=... ?curso=... filtros de cada recurso (ver RECURSOS)
+    ?cursor=...           página siguiente/anterior (paginación por cursor,
+                          chuckyescuela/paginacion.py); ?por_pagina= hasta 200
+
+    {"resultados": [...], "siguiente": "?...&cursor=..." | null, "anterior": ...}
+
+Las filas salen de .values() (sin instanciar modelos) y solo con los JOIN
+que piden los campos. Cada respuesta lleva un ETag calculado de las filas
+de la página: con If-None-Match igual se responde 304 sin serializar nada.
+Por eso la página (hasta 200 filas) se lee entera antes de responder; en
+las de más de STREAMING_DESDE filas lo que va en streaming es el JSON, que
+se serializa por trozos a medida que se envía en vez de armarlo completo.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import path
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from chuckyescuela.db.replicas import usar_replica
+from chuckyescuela.paginacion import paginar
+from gestorcursos.models import Asignatura, Curso, Inscripcion
+from gestorusers.models import Estudiante
+
+
+STREAMING_DESDE = 100
+
+TIPO_JSON = "application/json; charset=utf-8"
+
+# Filas serializadas por trozo de la respuesta en streaming
+FILAS_POR_TROZO = 50
+
+
+class Recurso:
+    """
+    `campos` es {nombre en la API: campo del ORM}; `filtros` es
+    {parámetro GET: lookup}, los que terminan en _id solo aceptan números.
+    """
+
+    def __init__(self, queryset, campos, orden=("id",), filtros=None):
+        self.queryset = queryset
+        self.campos = campos
+        self.orden = orden
+        self.filtros = filtros or {}
+
+
+RECURSOS = {
+    "cursos": Recurso(
+        Curso.objects.all(),
+        {
+            "id": "id",
+            "nombre": "nombre",
+            "descripcion": "descripcion",
+            "nivel": "nivel",
+            "total_inscritos": "total_inscritos",
+            "actualizado": "actualizado",
+        },
+        filtros={"nivel": "nivel"},
+    ),
+    "asignaturas": Recurso(
+        Asignatura.objects.all(),
+        {
+            "id": "id",
+            "nombre": "nombre",
+            "descripcion": "descripcion",
+            "curso": "curso_id",
+            "actualizado": "actualizado",
+        },
+        filtros={"curso": "curso_id", "nivel": "curso__nivel"},
+    ),
+    "inscripciones": Recurso(
+        Inscripcion.objects.all(),
+        {
+            "id": "id",
+            "estudiante": "estudiante_id",
+            "curso": "curso_id",
+            "fecha_inscripcion": "fecha_inscripcion",
+            "actualizado": "actualizado",
+            # Con JOIN: solo si se piden en ?campos=
+            "estudiante_rut": "estudiante__rut",
+            "curso_nombre": "curso__nombre",
+        },
+        # Mismo orden e índices que admin_inscripciones
+        orden=("-fecha_inscripcion", "-id"),
+        filtros={"curso": "curso_id", "nivel": "curso__nivel", "estudiante": "estudiante_id"},
+    ),
+    "estudiantes": Recurso(
+        Estudiante.objects.all(),
+        {
+            "id": "id",
+            "rut": "rut",
+            "nivel": "nivel",
+            "nombre": "user__first_name",
+            "apellido": "user__last_name",
+            "correo": "user__email",
+            "fecha_registro": "fecha_registro",
+        },
+        filtros={"nivel": "nivel", "curso": "inscripcion__curso_id"},
+    ),
+}
+
+# Sin ?campos= se omiten los que agregan un JOIN
+SIN_JOIN_POR_DEFECTO = {"estudiante_rut", "curso_nombre"}
+
+
+class ErrorAPI(Exception):
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+# =============================================================
+#                  ACCESO Y ERRORES EN JSON
+# =============================================================
+
+def api_role_required(*roles):
+    """
+    Como @login_required + @role_required, pero sin redirigir: un cliente
+    de la API recibe 401 / 403 en JSON. Los ErrorAPI de la vista también
+    se responden como {"error": ...}.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return JsonResponse({"error": "Se requiere iniciar sesión."}, status=401)
+            if getattr(request, "rol", None) not in roles:
+                return JsonResponse({"error": "No tiene permisos para usar la API."}, status=403)
+            try:
+                return view_func(request, *args, **kwargs)
+            except ErrorAPI as error:
+                return JsonResponse({"error": error.mensaje}, status=error.estado)
+
+        return _wrapped
+
+    return decorator
+
+
+# =============================================================
+#                 CAMPOS, FILTROS Y FILAS
+# =============================================================
+
+def _campos(request, recurso):
+    pedidos = [c.strip() for c in request.GET.get("campos", "").split(",") if c.strip()]
+    if not pedidos:
+        return [c for c in recurso.campos if c not in SIN_JOIN_POR_DEFECTO]
+
+    desconocidos = [c for c in pedidos if c not in recurso.campos]
+    if desconocidos:
+        raise ErrorAPI(400, f"Campos desconocidos: {', '.join(desconocidos)}.")
+    return list(dict.fromkeys(["id", *pedidos]))
+
+
+def _filtrar(request, recurso, queryset):
+    for parametro, lookup in recurso.filtros.items():
+        valor = request.GET.get(parametro, "").strip()
+        if not valor:
+            continue
+        if lookup.endswith("_id") and not valor.isdigit():
+            raise ErrorAPI(400, f"El filtro '{parametro}' debe ser un número.")
+        queryset = queryset.filter(**{lookup: valor})
+    return queryset
+
+
+def _valores(recurso, queryset, campos):
+    """QuerySet .values() con los campos pedidos y los del orden (para el cursor)."""
+    rutas = dict.fromkeys(
+        [recurso.campos[c] for c in campos] + [o.lstrip("-") for o in recurso.orden]
+    )
+    return queryset.values(*rutas)
+
+
+def _fila(recurso, valores, campos):
+    return {c: valores[recurso.campos[c]] for c in campos}
+
+
+# =============================================================
+#                 RESPUESTA (ETag y streaming)
+# =============================================================
+
+def _json(valor):
+    return json.dumps(valor, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def _etag(request, *partes):
+    # La ruta completa (campos, filtros, cursor) + los valores de las filas
+    datos = repr((request.get_full_path(), partes)).encode()
+    return quote_etag(hashlib.md5(datos, usedforsecurity=False).hexdigest())
+
+
+def _responder(request, etag, contenido, streaming=False):
+    """
+    304 si el cliente ya tiene `etag`; si no, el JSON de `contenido` (un
+    generador de trozos de texto), en streaming o de una vez.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if streaming:
+            response = StreamingHttpResponse(contenido, content_type=TIPO_JSON)
+        else:
+            response = HttpResponse("".join(contenido), content_type=TIPO_JSON)
+    response["ETag"] = etag
+    # Datos personales: el cliente puede guardarlos, pero revalida con el ETag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
+def _generar_lista(filas, siguiente, anterior):
+    yield '{"resultados": ['
+    for i in range(0, len(filas), FILAS_POR_TROZO):
+        trozo = ",".join(_json(fila) for fila in filas[i:i + FILAS_POR_TROZO])
+        yield ("," if i else "") + trozo
+    yield f'], "siguiente": {_json(siguiente)}, "anterior": {_json(anterior)}}}'
+
+
+# =============================================================
+#                          VISTAS
+# =============================================================
+
+@require_safe
+@api_role_required("administrador")
+@usar_replica
+def listar(request, recurso):
+    recurso = RECURSOS[recurso]
+    campos = _campos(request, recurso)
+    queryset = _valores(recurso, _filtrar(request, recurso, recurso.queryset), campos)
+
+    pagina = paginar(request, queryset, recurso.orden)
+    filas = [_fila(recurso, valores, campos) for valores in pagina.object_list]
+
+    etag = _etag(request, [tuple(f.values()) for f in filas], pagina.url_siguiente, pagina.url_anterior)
+    return _responder(
+        request,
+        etag,
+        _generar_lista(filas, pagina.url_siguiente, pagina.url_anterior),
+        streaming=len(filas) > STREAMING_DESDE,
+    )
+
+
+@require_safe
+@api_role_required("administrador")
+@usar_replica
+def detalle(request, recurso, pk):
+    recurso = RECURSOS[recurso]
+    campos = _campos(request, recurso)
+    valores = _valores(recurso, recurso.queryset.filter(pk=pk), campos).first()
+    if valores is None:
+        raise ErrorAPI(404, "No existe.")
+
+    fila = _fila(recurso, valores, campos)
+    return _responder(request, _etag(request, tuple(fila.values())), iter([_json(fila)]))
+
+
+# Incluidas en chuckyescuela/urls.py bajo "api/v1/"
+urlpatterns = [
+    path("cursos/", listar, {"recurso": "cursos"}, name="api_cursos"),
+    path("cursos/<int:pk>/", detalle, {"recurso": "cursos"}, name="api_curso"),
+    path("asignaturas/", listar, {"recurso": "asignaturas"}, name="api_asignaturas"),
+    path("asignaturas/<int:pk>/", detalle, {"recurso": "asignaturas"}, name="api_asignatura"),
+    path("inscripciones/", listar, {"recurso": "inscripciones"}, name="api_inscripciones"),
+    path("inscripciones/<int:pk>/", detalle, {"recurso": "inscripciones"}, name="api_inscripcion"),
+    path("estudiantes/", listar, {"recurso": "estudiantes"}, name="api_estudiantes"),
+    path("estudiantes/<int:pk>/", detalle, {"recurso": "estudiantes"}, name="api_estudiante"),
+]
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GestorcursosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestorcursos'
+
+    def ready(self):
+        # Registra los receptores de señales (contador de inscritos, índice de búsqueda)
+        from gestorcursos import signals  # noqa: F401
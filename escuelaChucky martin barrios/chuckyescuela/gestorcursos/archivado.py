@@ -0,0 +1,107 @@
+"""
+Archivado de inscripciones de periodos cerrados (archivar_inscripciones).
+
+La tabla Inscripcion queda solo con lo vigente: las inscripciones de un
+Periodo cerrado pasan a InscripcionHistorica por lotes de LOTE filas, cada
+lote en su propia transacción corta:
+
+    INSERT INTO historial (...) SELECT ... FROM inscripcion WHERE id IN (lote)
+    DELETE FROM inscripcion WHERE id IN (lote)
+
+Las filas no pasan por Python y cada lote bloquea (SELECT ... FOR UPDATE)
+solo sus filas y por un instante, así que se puede correr con el sitio en
+uso (con `pausa` entre lotes para dejar pasar las peticiones). Si se corta a mitad de camino, la base queda
+consistente y volver a correrlo sigue con lo que falta.
+
+Los reportes (gestorreportes) cuentan también el historial: mover una fila
+no los cambia. Lo vigente sí cambia, y el DELETE directo no dispara
+señales: por lote se recuenta Curso.total_inscritos y se descarta el panel
+en caché de los estudiantes (gestorusers/panel.py).
+"""
+
+import time
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from gestorcursos.models import Curso, Inscripcion, InscripcionHistorica, Periodo
+from gestorusers import panel
+
+
+LOTE = 1000
+
+COLUMNAS = ("id", "estudiante", "curso", "fecha_inscripcion")
+
+
+def pendientes(periodo):
+    """Inscripciones del periodo que siguen en la tabla Inscripcion."""
+    desde, hasta = periodo.rango()
+    return Inscripcion.objects.filter(fecha_inscripcion__gte=desde, fecha_inscripcion__lt=hasta)
+
+
+def _copiar(cursor, ids, periodo_id):
+    """INSERT ... SELECT de las inscripciones `ids` al historial, con su periodo."""
+    q = cursor.db.ops.quote_name
+    origen = ", ".join(q(Inscripcion._meta.get_field(c).column) for c in COLUMNAS)
+    destino = ", ".join(q(InscripcionHistorica._meta.get_field(c).column) for c in (*COLUMNAS, "periodo"))
+    cursor.execute(
+        f"INSERT INTO {q(InscripcionHistorica._meta.db_table)} ({destino}) "
+        f"SELECT {origen}, %s FROM {q(Inscripcion._meta.db_table)} "
+        f"WHERE {q(Inscripcion._meta.pk.column)} IN ({', '.join(['%s'] * len(ids))})",
+        [periodo_id, *ids],
+    )
+    return cursor.rowcount
+
+
+def _borrar(cursor, ids):
+    """DELETE ... WHERE id IN (ids) de Inscripcion. Devuelve cuántas borró."""
+    q = cursor.db.ops.quote_name
+    cursor.execute(
+        f"DELETE FROM {q(Inscripcion._meta.db_table)} "
+        f"WHERE {q(Inscripcion._meta.pk.column)} IN ({', '.join(['%s'] * len(ids))})",
+        ids,
+    )
+    return cursor.rowcount
+
+
+def archivar(periodo, lote=LOTE, pausa=0.0):
+    """
+    Mueve al historial las inscripciones del periodo, que debe estar
+    cerrado y terminado. Devuelve cuántas movió (0 si ya estaba archivado).
+    """
+    if not periodo.cerrado:
+        raise ValueError(f"El periodo {periodo} no está cerrado.")
+    if not periodo.terminado():
+        raise ValueError(f"El periodo {periodo} aún no termina (fin: {periodo.fin}).")
+
+    alias = router.db_for_write(Inscripcion)
+    movidas = 0
+    while True:
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            # Por el índice insc_fecha_id_idx: solo el rango del periodo. FOR
+            # UPDATE: hasta el COMMIT nadie más (el worker de gestortareas)
+            # borra estas filas ni las cuenta por su cuenta
+            filas = list(
+                pendientes(periodo).select_for_update().order_by("fecha_inscripcion", "id")
+                .values_list("id", "curso_id", "estudiante_id")[:lote]
+            )
+            if not filas:
+                break
+            ids = [pk for pk, _, _ in filas]
+            # Si otro proceso se llevó alguna fila entretanto, se deshace el
+            # lote y se vuelve a leer
+            if _copiar(cursor, ids, periodo.pk) != len(ids) or _borrar(cursor, ids) != len(ids):
+                transaction.set_rollback(True, using=alias)
+                continue
+
+            Curso.todos.filter(pk__in={curso_id for _, curso_id, _ in filas}).recontar_inscripciones()
+
+        panel.invalidar({estudiante_id for _, _, estudiante_id in filas})
+        movidas += len(filas)
+        if len(filas) < lote:
+            break
+        if pausa:
+            time.sleep(pausa)
+
+    Periodo.objects.filter(pk=periodo.pk).update(archivado=timezone.now())
+    return movidas
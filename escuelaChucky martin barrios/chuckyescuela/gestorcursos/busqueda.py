@@ -0,0 +1,202 @@
+"""
+Búsqueda de texto completo sobre el catálogo (cursos y asignaturas).
+
+Los textos se copian a una tabla de índice propia, gestorcursos_busqueda,
+que se mantiene al día desde gestorcursos/signals.py:
+
+  - SQLite (local):     tabla virtual FTS5, tokenizer unicode61 con
+                        remove_diacritics → "matematica" encuentra "Matemáticas".
+                        Ranking con bm25().
+  - MySQL (producción): tabla InnoDB con índices FULLTEXT y collation
+                        utf8mb4_unicode_ci (no distingue acentos ni mayúsculas).
+                        Ranking con MATCH ... AGAINST.
+
+La tabla se crea en la migración 0004_indice_busqueda. Si se cargan cursos
+o asignaturas con bulk_create / QuerySet.update (no disparan señales) hay
+que reconstruir el índice: python manage.py reindexar_busqueda
+"""
+
+import re
+
+from django.db import connections, router, transaction
+from django.db.models import Q
+
+from gestorcursos.models import Asignatura, Curso
+
+
+TABLA = "gestorcursos_busqueda"
+LIMITE = 200
+
+CURSO = "curso"
+ASIGNATURA = "asignatura"
+
+# Peso de cada columna en el ranking: el nombre pesa más que la descripción
+PESO_TITULO = 10.0
+PESO_CUERPO = 1.0
+PESO_NIVEL = 5.0
+
+# InnoDB ignora palabras más cortas que innodb_ft_min_token_size (3)
+MYSQL_LARGO_MINIMO = 3
+
+_PALABRA = re.compile(r"\w+", re.UNICODE)
+
+
+def _conexion_lectura():
+    return connections[router.db_for_read(Curso)]
+
+
+def _conexion_escritura():
+    return connections[router.db_for_write(Curso)]
+
+
+# =============================================================
+#                  MANTENCIÓN DEL ÍNDICE
+# =============================================================
+
+def _reemplazar(tipo, objeto_id, curso_id, titulo, cuerpo, nivel):
+    # FTS5 no admite UNIQUE ni UPSERT: se borra y se vuelve a insertar
+    with _conexion_escritura().cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLA} WHERE tipo = %s AND objeto_id = %s",
+            [tipo, objeto_id],
+        )
+        cursor.execute(
+            f"INSERT INTO {TABLA} (tipo, objeto_id, curso_id, titulo, cuerpo, nivel) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            [tipo, objeto_id, curso_id, titulo or "", cuerpo or "", nivel or ""],
+        )
+
+
+def indexar_curso(curso):
+    _reemplazar(CURSO, curso.pk, curso.pk, curso.nombre, curso.descripcion, curso.nivel)
+
+
+def indexar_asignatura(asignatura):
+    _reemplazar(
+        ASIGNATURA, asignatura.pk, asignatura.curso_id,
+        asignatura.nombre, asignatura.descripcion, "",
+    )
+
+
+def quitar(tipo, objeto_id):
+    with _conexion_escritura().cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLA} WHERE tipo = %s AND objeto_id = %s",
+            [tipo, objeto_id],
+        )
+
+
+def quitar_curso(curso_id):
+    """Quita el curso y todas sus asignaturas del índice."""
+    with _conexion_escritura().cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLA} WHERE curso_id = %s", [curso_id])
+
+
+def reconstruir():
+    """
+    Vacía el índice y lo vuelve a llenar con dos INSERT ... SELECT.
+    Devuelve la cantidad de filas indexadas.
+    """
+    conexion = _conexion_escritura()
+    curso = Curso._meta.db_table
+    asignatura = Asignatura._meta.db_table
+
+    with transaction.atomic(using=conexion.alias), conexion.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLA}")
+        cursor.execute(
+            f"INSERT INTO {TABLA} (tipo, objeto_id, curso_id, titulo, cuerpo, nivel) "
+            f"SELECT %s, id, id, nombre, COALESCE(descripcion, ''), COALESCE(nivel, '') "
+            f"FROM {curso} WHERE eliminando = %s",
+            [CURSO, False],
+        )
+        cursor.execute(
+            f"INSERT INTO {TABLA} (tipo, objeto_id, curso_id, titulo, cuerpo, nivel) "
+            f"SELECT %s, id, curso_id, nombre, COALESCE(descripcion, ''), '' "
+            f"FROM {asignatura} WHERE curso_id IN (SELECT id FROM {curso} WHERE eliminando = %s)",
+            [ASIGNATURA, False],
+        )
+        if conexion.vendor == "sqlite":
+            # Fusiona los segmentos del índice FTS5 (consultas más rápidas)
+            cursor.execute(f"INSERT INTO {TABLA} ({TABLA}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLA}")
+        return cursor.fetchone()[0]
+
+
+# =============================================================
+#                         CONSULTA
+# =============================================================
+
+def _palabras(texto):
+    return _PALABRA.findall(texto or "")
+
+
+def _consulta_sqlite(palabras):
+    # "palabra"* = prefijo; varias palabras se combinan con AND implícito
+    return " ".join(f'"{p}"*' for p in palabras)
+
+
+def _consulta_mysql(palabras):
+    palabras = [p for p in palabras if len(p) >= MYSQL_LARGO_MINIMO]
+    return " ".join(f"+{p}*" for p in palabras)
+
+
+def buscar(texto, tipo=CURSO, limite=LIMITE):
+    """
+    Devuelve los id (de Curso o Asignatura, según `tipo`) que coinciden con
+    `texto`, ordenados de más a menos relevante.
+    """
+    palabras = _palabras(texto)
+    if not palabras:
+        return []
+
+    conexion = _conexion_lectura()
+
+    if conexion.vendor == "sqlite":
+        sql = (
+            f"SELECT objeto_id FROM {TABLA} "
+            f"WHERE {TABLA} MATCH %s AND tipo = %s "
+            f"ORDER BY bm25({TABLA}, 0, 0, 0, %s, %s, %s) "
+            "LIMIT %s"
+        )
+        parametros = [
+            _consulta_sqlite(palabras), tipo,
+            PESO_TITULO, PESO_CUERPO, PESO_NIVEL, limite,
+        ]
+    elif conexion.vendor == "mysql":
+        consulta = _consulta_mysql(palabras)
+        if not consulta:
+            return []
+        sql = (
+            f"SELECT objeto_id FROM {TABLA} "
+            "WHERE MATCH (titulo, cuerpo, nivel) AGAINST (%s IN BOOLEAN MODE) AND tipo = %s "
+            "ORDER BY MATCH (titulo) AGAINST (%s IN BOOLEAN MODE) * %s "
+            "+ MATCH (titulo, cuerpo, nivel) AGAINST (%s IN BOOLEAN MODE) DESC "
+            "LIMIT %s"
+        )
+        parametros = [consulta, tipo, consulta, PESO_TITULO, consulta, limite]
+    else:
+        return _buscar_sin_indice(palabras, tipo, limite)
+
+    with conexion.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+def _buscar_sin_indice(palabras, tipo, limite):
+    # Otros motores: LIKE sin ranking (solo para no romper en desarrollo)
+    modelo = Curso if tipo == CURSO else Asignatura
+    qs = modelo.objects.all()
+    for palabra in palabras:
+        qs = qs.filter(Q(nombre__icontains=palabra) | Q(descripcion__icontains=palabra))
+    return list(qs.order_by("nombre").values_list("pk", flat=True)[:limite])
+
+
+def filtrar(queryset, texto, limite=LIMITE):
+    """
+    Aplica la búsqueda a un queryset de Curso o Asignatura y devuelve una
+    lista de objetos en orden de relevancia.
+    """
+    tipo = CURSO if queryset.model is Curso else ASIGNATURA
+    ids = buscar(texto, tipo, limite)
+    objetos = queryset.in_bulk(ids)
+    return [objetos[pk] for pk in ids if pk in objetos]
@@ -0,0 +1,163 @@
+"""
+Caché del catálogo de cursos (datos y fragmentos HTML ya renderizados).
+
+Todas las claves incluyen una "versión del catálogo" que se renueva cada
+vez que se guarda o elimina un Curso o una Asignatura (gestorcursos/signals.py).
+Así nunca hay que borrar claves una por una: al cambiar la versión, las
+entradas viejas simplemente dejan de pedirse y expiran solas.
+
+Lo personal de cada estudiante (en qué cursos está inscrito) NO se guarda
+aquí: las vistas lo agregan encima con su propia consulta.
+
+Ojo: Curso.total_inscritos se actualiza con QuerySet.update (sin señales),
+por eso no forma parte de los datos cacheados; quien lo muestre debe
+leerlo aparte (ver contadores_inscritos()).
+"""
+
+import time
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from chuckyescuela.db.replicas import en_primario
+from gestorcursos.models import Asignatura, Curso
+
+
+CLAVE_VERSION = "catalogo:version"
+CLAVE_ACIERTOS = "catalogo:stats:aciertos"
+CLAVE_FALLOS = "catalogo:stats:fallos"
+
+# Las entradas de versiones viejas se descartan solas al expirar
+DURACION = 60 * 60 * 24
+
+CAMPOS_CURSO = ("id", "nombre", "descripcion", "nivel")
+
+
+# =============================================================
+#                    VERSIÓN DEL CATÁLOGO
+# =============================================================
+
+def version():
+    """Versión actual; si la caché no la tiene se crea una nueva."""
+    valor = cache.get(CLAVE_VERSION)
+    if valor is None:
+        cache.add(CLAVE_VERSION, time.time_ns(), timeout=None)
+        valor = cache.get(CLAVE_VERSION)
+    return valor
+
+
+def invalidar():
+    """Renueva la versión: todas las entradas del catálogo quedan obsoletas."""
+    cache.set(CLAVE_VERSION, time.time_ns(), timeout=None)
+
+
+# =============================================================
+#               LECTURA CON CONTADORES DE ACIERTOS
+# =============================================================
+
+def _contar(clave):
+    try:
+        cache.incr(clave)
+    except ValueError:
+        # La clave no existe todavía (o la caché se reinició)
+        if not cache.add(clave, 1, timeout=None):
+            cache.incr(clave)
+
+
+def _obtener(nombre, construir):
+    clave = f"catalogo:{version()}:{nombre}"
+    valor = cache.get(clave)
+    if valor is None:
+        _contar(CLAVE_FALLOS)
+        # La caché es compartida: se llena desde el primario, nunca con
+        # datos de una réplica atrasada respecto de esta versión
+        with en_primario():
+            valor = construir()
+        cache.set(clave, valor, DURACION)
+    else:
+        _contar(CLAVE_ACIERTOS)
+    return valor
+
+
+def estadisticas():
+    aciertos = cache.get(CLAVE_ACIERTOS) or 0
+    fallos = cache.get(CLAVE_FALLOS) or 0
+    total = aciertos + fallos
+    return {
+        "version": version(),
+        "aciertos": aciertos,
+        "fallos": fallos,
+        "tasa_aciertos": round(aciertos / total, 4) if total else None,
+    }
+
+
+def reiniciar_estadisticas():
+    cache.delete_many([CLAVE_ACIERTOS, CLAVE_FALLOS])
+
+
+# =============================================================
+#                       DATOS CACHEADOS
+# =============================================================
+
+def cursos():
+    """Lista de cursos como dicts (id, nombre, descripcion, nivel)."""
+    return _obtener(
+        "cursos",
+        lambda: list(Curso.objects.order_by("id").values(*CAMPOS_CURSO)),
+    )
+
+
+def tarjetas():
+    """
+    HTML de la tarjeta de cada curso para mis_cursos, {id: html}.
+    Sin el botón de inscripción, que depende del estudiante.
+    """
+    def construir():
+        return {
+            curso["id"]: render_to_string("cursos/_tarjeta_curso.html", {"curso": curso})
+            for curso in Curso.objects.order_by("id").values(*CAMPOS_CURSO)
+        }
+    return _obtener("tarjetas", construir)
+
+
+def lista_tarjetas(ids=None):
+    """
+    [{"id", "html"}] en el orden de `ids` (p. ej. resultados de búsqueda)
+    o de todo el catálogo si ids es None.
+    """
+    html = tarjetas()
+    if ids is None:
+        ids = html.keys()
+    return [{"id": pk, "html": html[pk]} for pk in ids if pk in html]
+
+
+def detalle_curso(curso_id):
+    """
+    Datos del curso + HTML de la descripción y las asignaturas (ver_curso).
+    Devuelve None si el curso no existe (también se cachea).
+    """
+    def construir():
+        curso = Curso.objects.filter(pk=curso_id).values(*CAMPOS_CURSO).first()
+        if curso is None:
+            # Se guarda un valor "falso" distinto de None para cachear el 404
+            return {}
+        asignaturas = list(
+            Asignatura.objects.filter(curso_id=curso_id)
+            .order_by("id").values("id", "nombre", "descripcion")
+        )
+        return {
+            "curso": curso,
+            "html": render_to_string("cursos/_detalle_curso.html", {
+                "curso": curso,
+                "asignaturas": asignaturas,
+            }),
+        }
+    return _obtener(f"curso:{curso_id}", construir) or None
+
+
+def contadores_inscritos(ids=None):
+    """{curso_id: total_inscritos} leído directo de la tabla (una consulta)."""
+    qs = Curso.objects.all()
+    if ids is not None:
+        qs = qs.filter(pk__in=ids)
+    return dict(qs.values_list("id", "total_inscritos"))
@@ -0,0 +1,141 @@
+"""
+GET condicional (ETag / Last-Modified) para listar_cursos y ver_curso.
+
+Se usan con django.views.decorators.http.condition: antes de ejecutar la
+vista se calcula un estado barato (un MAX(actualizado) y, en ver_curso,
+la inscripción del usuario) y si coincide con lo que el navegador ya tiene
+se responde 304 Not Modified sin renderizar nada.
+
+- La página es distinta para cada usuario: el ETag incluye su id y las
+  vistas responden con Vary: Cookie y Cache-Control: private.
+- Los borrados no dejan un "actualizado" nuevo: en el listado se combina
+  con la versión del catálogo (gestorcursos/catalogo.py) y al borrar una
+  asignatura se toca Curso.actualizado (gestorcursos/signals.py).
+- Si hay mensajes pendientes (messages framework) no se responde 304,
+  para que el mensaje se muestre.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import DateTimeField, Max, OuterRef, Subquery, Value
+
+from gestorcursos import catalogo
+from gestorcursos.models import Curso, Inscripcion
+
+
+def _hay_mensajes(request):
+    almacenamiento = getattr(request, "_messages", None)
+    return almacenamiento is not None and len(almacenamiento) > 0
+
+
+def _etag(*partes):
+    return hashlib.md5(":".join(str(p) for p in partes).encode(), usedforsecurity=False).hexdigest()
+
+
+def _desde_version(version):
+    # La versión del catálogo es time.time_ns() del último cambio
+    return datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+
+# =============================================================
+#                      LISTADO DE CURSOS
+# =============================================================
+
+def _estado_listado(request):
+    if not hasattr(request, "_estado_condicional"):
+        if _hay_mensajes(request):
+            request._estado_condicional = (None, None)
+        else:
+            version = catalogo.version()
+            ultimo = Curso.objects.aggregate(ultimo=Max("actualizado"))["ultimo"]
+            modificado = _desde_version(version)
+            if ultimo and ultimo > modificado:
+                modificado = ultimo
+            request._estado_condicional = (
+                _etag("cursos", request.user.pk, version, ultimo),
+                modificado,
+            )
+    return request._estado_condicional
+
+
+def etag_listado(request, *args, **kwargs):
+    return _estado_listado(request)[0]
+
+
+def modificado_listado(request, *args, **kwargs):
+    return _estado_listado(request)[1]
+
+
+# =============================================================
+#                 DETALLE DE CURSO (ver_curso)
+# =============================================================
+
+def _estado_curso(request, curso_id):
+    if not hasattr(request, "_estado_condicional"):
+        request._estado_condicional = (None, None)
+        if not _hay_mensajes(request):
+            # Curso + última asignatura + inscripción del estudiante: UNA
+            # consulta. El estudiante sale de la sesión, como en las vistas.
+            estudiante_id = getattr(request, "estudiante_id", None)
+            inscripcion = (
+                Inscripcion.objects
+                .filter(curso=OuterRef("pk"), estudiante_id=estudiante_id)
+                .values("actualizado")[:1]
+            ) if estudiante_id is not None else None
+            fila = (
+                Curso.objects.filter(pk=curso_id)
+                .annotate(
+                    ultima_asignatura=Max("asignaturas__actualizado"),
+                    mi_inscripcion=(
+                        Subquery(inscripcion) if inscripcion is not None
+                        else Value(None, output_field=DateTimeField())
+                    ),
+                )
+                .values("actualizado", "ultima_asignatura", "mi_inscripcion")
+                .first()
+            )
+            # Curso inexistente: sin estado, la vista responde 404
+            if fila is not None:
+                modificado = max(f for f in fila.values() if f is not None)
+                request._estado_condicional = (
+                    _etag(
+                        "curso", curso_id, request.user.pk,
+                        fila["actualizado"], fila["ultima_asignatura"], fila["mi_inscripcion"],
+                    ),
+                    modificado,
+                )
+    return request._estado_condicional
+
+
+def etag_curso(request, curso_id, *args, **kwargs):
+    return _estado_curso(request, curso_id)[0]
+
+
+def modificado_curso(request, curso_id, *args, **kwargs):
+    return _estado_curso(request, curso_id)[1]
+
+
+# =============================================================
+#                       VISTAS ASYNC
+# =============================================================
+
+def precalcular(etag_func):
+    """
+    Para vistas async: @condition llama a etag_func dentro del event loop,
+    donde el ORM no se puede usar. Puesto por fuera de @condition, ejecuta
+    etag_func antes en un hilo; el estado queda memorizado en el request y
+    @condition lo lee sin consultar.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def _wrapped(request, *args, **kwargs):
+            await sync_to_async(etag_func)(request, *args, **kwargs)
+            return await view_func(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
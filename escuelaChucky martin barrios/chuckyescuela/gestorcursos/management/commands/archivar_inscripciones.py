@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from gestorcursos import archivado
+from gestorcursos.models import Periodo
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve las inscripciones de los periodos cerrados a la tabla de "
+        "historial (gestorcursos/archivado.py), por lotes y en transacciones "
+        "cortas: se puede correr con el sitio en uso y, si se corta, volver "
+        "a correrlo sigue donde quedó. Sin nombres, archiva todos los "
+        "periodos cerrados que aún no lo estén."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("periodos", nargs="*",
+                            help="Nombres de los periodos a archivar (default: todos los pendientes).")
+        parser.add_argument("--lote", type=int, default=archivado.LOTE,
+                            help=f"Inscripciones por transacción (default: {archivado.LOTE}).")
+        parser.add_argument("--pausa", type=float, default=0.0,
+                            help="Segundos de espera entre lotes, para no cargar el sitio (default: 0).")
+        parser.add_argument("--simular", action="store_true",
+                            help="Solo contar lo que se movería, sin escribir.")
+
+    def handle(self, *args, **options):
+        if options["periodos"]:
+            periodos = list(Periodo.objects.filter(nombre__in=options["periodos"]))
+            faltan = set(options["periodos"]) - {p.nombre for p in periodos}
+            if faltan:
+                raise CommandError(f"No existen los periodos: {', '.join(sorted(faltan))}.")
+            abiertos = [p.nombre for p in periodos if not (p.cerrado and p.terminado())]
+            if abiertos:
+                raise CommandError(f"Periodos sin cerrar o que aún no terminan: {', '.join(abiertos)}.")
+        else:
+            periodos = list(Periodo.objects.filter(
+                cerrado=True, archivado__isnull=True, fin__lt=timezone.localdate(),
+            ))
+
+        if not periodos:
+            self.stdout.write("No hay periodos por archivar.")
+            return
+
+        for periodo in periodos:
+            if options["simular"]:
+                self.stdout.write(f"{periodo}: {archivado.pendientes(periodo).count()} inscripciones por archivar.")
+                continue
+
+            inicio = time.perf_counter()
+            movidas = archivado.archivar(periodo, lote=options["lote"], pausa=options["pausa"])
+            self.stdout.write(self.style.SUCCESS(
+                f"{periodo}: {movidas} inscripciones archivadas en {time.perf_counter() - inicio:.1f} s."
+            ))
@@ -0,0 +1,150 @@
+import re
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from gestorcursos.models import Asignatura, Curso, Inscripcion
+from gestorusers.models import Estudiante
+
+
+# Recorrido completo de una tabla según el motor:
+#   SQLite       "SCAN tabla" o "SCAN tabla USING INDEX i" (recorre la tabla
+#                en el orden del índice); "USING COVERING INDEX" lee solo el índice
+#   MySQL        columna type = ALL
+#   PostgreSQL   "Seq Scan on tabla"
+_SCAN_SQLITE = re.compile(r"\bSCAN (\w+)(?! USING COVERING INDEX)(?:\s|$)")
+_SCAN_POSTGRES = re.compile(r"Seq Scan on (\w+)")
+
+POR_PAGINA = 50
+
+
+def tablas_recorridas(plan, vendor, limitada=False):
+    """
+    Tablas que el plan recorre completas. En SQLite, una consulta `limitada`
+    (con LIMIT y sin WHERE) cuyo SCAN ya viene en el orden pedido se corta
+    al llegar al límite; si necesita "USE TEMP B-TREE" para ordenar o
+    agrupar, lee todo antes. Con WHERE no se exime: si el filtro calza con
+    pocas filas, el SCAN las busca por toda la tabla.
+    """
+    if vendor == "sqlite":
+        if limitada and "USE TEMP B-TREE" not in plan:
+            return set()
+        return set(_SCAN_SQLITE.findall(plan))
+    if vendor == "postgresql":
+        return set(_SCAN_POSTGRES.findall(plan))
+    if vendor == "mysql":
+        # Formato tradicional: id select_type table partitions type ...
+        tablas = set()
+        for fila in plan.splitlines():
+            columnas = fila.split()
+            if len(columnas) > 4 and columnas[4] == "ALL":
+                tablas.add(columnas[2])
+        return tablas
+    return set()
+
+
+def consultas_principales(datos):
+    """
+    (vista, consulta, QuerySet) con las consultas que hacen las vistas,
+    con valores reales de la base. Los listados completos del catálogo
+    (listar_cursos, que sale de la caché) leen toda la tabla a propósito
+    y no se auditan.
+    """
+    inscripciones = Inscripcion.objects.select_related("estudiante__user", "curso")
+    orden = ("-fecha_inscripcion", "-id")
+    hace_un_mes = timezone.make_aware(datetime.combine(timezone.localdate() - timedelta(days=30), time.min))
+
+    return [
+        ("login", "usuario con perfil y estudiante",
+         User.objects.select_related("perfilusuario", "estudiante").filter(username=datos["username"])),
+        ("admin_inscripciones", "primera página",
+         inscripciones.order_by(*orden)[:POR_PAGINA + 1]),
+        ("admin_inscripciones", "filtro por curso",
+         inscripciones.filter(curso_id=datos["curso"]).order_by(*orden)[:POR_PAGINA + 1]),
+        ("admin_inscripciones", "filtro por nivel",
+         inscripciones.filter(curso__nivel=datos["nivel_curso"]).order_by(*orden)[:POR_PAGINA + 1]),
+        ("admin_inscripciones", "rango de fechas",
+         inscripciones.filter(fecha_inscripcion__gte=hace_un_mes).order_by(*orden)[:POR_PAGINA + 1]),
+        ("admin_inscripciones", "niveles para el filtro",
+         Curso.todos.exclude(nivel__isnull=True).exclude(nivel="")
+         .order_by("nivel").values_list("nivel", flat=True).distinct()),
+        ("admin_listar_estudiantes", "primera página",
+         Estudiante.objects.select_related("user").with_enrollment_stats().order_by("-id")[:POR_PAGINA + 1]),
+        ("admin_listar_cursos", "primera página",
+         Curso.objects.order_by("-id")[:POR_PAGINA + 1]),
+        ("panel_estudiante", "cursos del estudiante (si no está en caché)",
+         Inscripcion.objects.filter(estudiante_id=datos["estudiante"])
+         .order_by("fecha_inscripcion", "id").values_list("curso__nombre", "curso__nivel")),
+        # Las versiones async (VISTAS_ASYNC) hacen las mismas consultas
+        ("mis_cursos", "cursos inscritos",
+         Inscripcion.objects.filter(estudiante_id=datos["estudiante"]).values_list("curso_id", flat=True)),
+        ("ver_curso", "¿está inscrito?",
+         Inscripcion.objects.filter(estudiante_id=datos["estudiante"], curso_id=datos["curso"])),
+        ("ver_curso", "asignaturas del curso",
+         Asignatura.objects.filter(curso_id=datos["curso"]).order_by("id")),
+        ("admin_inscripcion_masiva", "estudiantes de un nivel",
+         Estudiante.objects.filter(nivel=datos["nivel_estudiante"]).order_by("id").values_list("id", flat=True)),
+        ("admin_inscripcion_masiva", "niveles de estudiantes",
+         Estudiante.objects.exclude(nivel__isnull=True).exclude(nivel="")
+         .order_by("nivel").values_list("nivel", flat=True).distinct()),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Corre EXPLAIN de las consultas principales de cada vista contra la "
+        "base actual y falla si alguna recorre completa una tabla grande "
+        "(sin usar índice). Conviene correrlo sobre datos de tamaño real, "
+        "p. ej. después de generar_escuela."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--filas-minimas", type=int, default=1000,
+                            help="Desde cuántas filas una tabla cuenta como grande (default: 1000).")
+
+    def handle(self, *args, **options):
+        estudiante = Estudiante.objects.exclude(nivel__isnull=True).select_related("user").first()
+        curso = Curso.objects.exclude(nivel__isnull=True).first()
+        if estudiante is None or curso is None:
+            raise CommandError("Base sin datos: corra antes python manage.py generar_escuela.")
+        datos = {
+            "username": estudiante.user.username,
+            "estudiante": estudiante.id,
+            "nivel_estudiante": estudiante.nivel,
+            "curso": curso.id,
+            "nivel_curso": curso.nivel,
+        }
+
+        modelos = {modelo._meta.db_table: modelo for modelo in apps.get_models()}
+        filas = {}
+
+        def es_grande(tabla):
+            if tabla not in filas:
+                modelo = modelos.get(tabla)
+                filas[tabla] = modelo._base_manager.count() if modelo else 0
+            return filas[tabla] >= options["filas_minimas"]
+
+        fallas = []
+        for vista, descripcion, queryset in consultas_principales(datos):
+            plan = queryset.explain()
+            limitada = queryset.query.high_mark is not None and not queryset.query.where
+            grandes = sorted(
+                t for t in tablas_recorridas(plan, connection.vendor, limitada) if es_grande(t)
+            )
+
+            if grandes:
+                fallas.append((vista, descripcion))
+                detalle = ", ".join(f"{t} ({filas[t]} filas)" for t in grandes)
+                self.stdout.write(self.style.ERROR(f"SCAN  {vista} — {descripcion}: {detalle}"))
+            else:
+                self.stdout.write(f"OK    {vista} — {descripcion}")
+            if grandes or options["verbosity"] > 1:
+                self.stdout.write("      " + plan.replace("\n", "\n      "))
+
+        if fallas:
+            raise CommandError(f"{len(fallas)} consultas recorren completa una tabla grande.")
+        self.stdout.write(self.style.SUCCESS("Ninguna consulta recorre completa una tabla grande."))
@@ -0,0 +1,281 @@
+import asyncio
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from gestorcursos.models import Curso, Inscripcion
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+# modo → VISTAS_ASYNC (las URLs eligen la versión de cada vista al importarse)
+MODOS = {"wsgi": "0", "asgi": "1"}
+
+VISTAS = ("ver_curso", "mis_cursos", "panel_estudiante")
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga de ver_curso, mis_cursos y panel_estudiante: p50/p99 "
+        "con N clientes concurrentes por el camino WSGI (hilos sobre "
+        "WSGIHandler, como gunicorn --threads) y por el ASGI (tareas sobre "
+        "ASGIHandler en un event loop, como un worker de uvicorn). Cada modo "
+        "corre en un proceso aparte con chuckyescuela.settings_produccion."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--motor", choices=("sqlite", "mysql"), default="sqlite",
+                            help="DB_MOTOR del perfil de producción (default: sqlite).")
+        parser.add_argument("--nombre", help="DB_NOMBRE (base ya migrada).")
+        parser.add_argument("--clientes", type=int, default=16,
+                            help="Clientes concurrentes (default: 16).")
+        parser.add_argument("--peticiones", type=int, default=60,
+                            help="Peticiones por cliente, rotando las tres vistas (default: 60).")
+        parser.add_argument("--medir", action="store_true", help="(interno) corre un solo modo.")
+
+    def handle(self, *args, **options):
+        if options["medir"]:
+            self.stdout.write(json.dumps(self._medir(options["clientes"], options["peticiones"])))
+            return
+
+        self.stdout.write(
+            f"{options['clientes']} clientes × {options['peticiones']} peticiones por modo"
+        )
+        self.stdout.write(
+            f"{'modo':6} {'vista':18} {'pet/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errores':>8}"
+        )
+        for modo, vistas_async in MODOS.items():
+            resultado = self._lanzar(vistas_async, options)
+            for vista, datos in resultado["vistas"].items():
+                self.stdout.write(
+                    f"{modo:6} {vista:18} {'':>8} {datos['p50_ms']:8.2f} {datos['p99_ms']:8.2f}"
+                )
+            self.stdout.write(
+                f"{modo:6} {'TOTAL':18} {resultado['peticiones_s']:8.1f} "
+                f"{resultado['p50_ms']:8.2f} {resultado['p99_ms']:8.2f} {resultado['errores']:8}"
+            )
+
+    # ---------------------------------------------------------
+    def _lanzar(self, vistas_async, options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "chuckyescuela.settings_produccion",
+            "DJANGO_ALLOWED_HOSTS": "testserver",
+            "ESTATICOS_MANIFEST": "0",
+            # El perfil exige caché compartida; el benchmark es un solo proceso
+            "CACHE_MODO": os.environ.get("CACHE_MODO", "archivo"),
+            "CACHE_UBICACION": os.environ.get(
+                "CACHE_UBICACION", os.path.join(tempfile.gettempdir(), "chuckyescuela-bench-cache")
+            ),
+            "VISTAS_ASYNC": vistas_async,
+            "DB_MOTOR": options["motor"],
+            # Mismo pool en ambos modos, con cupo para todos los clientes
+            "DB_POOL": "1",
+            "DB_POOL_MAX": str(options["clientes"] + 4),
+        }
+        if options["nombre"]:
+            env["DB_NOMBRE"] = options["nombre"]
+
+        salida = subprocess.run(
+            [
+                sys.executable, str(settings.BASE_DIR / "manage.py"), "bench_asgi", "--medir",
+                "--clientes", str(options["clientes"]),
+                "--peticiones", str(options["peticiones"]),
+            ],
+            env=env, check=True, capture_output=True, text=True,
+        )
+        return json.loads(salida.stdout.strip().splitlines()[-1])
+
+    def _datos(self):
+        pid = os.getpid()
+        creados = []
+        cursos = list(Curso.objects.order_by("id").values_list("id", flat=True)[:5])
+        while len(cursos) < 5:
+            curso = Curso.objects.create(nombre=f"Curso bench ASGI {len(cursos)}")
+            creados.append(curso.pk)
+            cursos.append(curso.pk)
+
+        correo = f"bench-asgi-{pid}@chucky.cl"
+        user = User.objects.create(username=correo, email=correo)
+        PerfilUsuario.objects.create(user=user, rol="estudiante")
+        estudiante = Estudiante.objects.create(user=user, rut=f"bench-asgi-{pid}")
+        for curso_id in cursos[:3]:
+            Inscripcion.objects.create(estudiante=estudiante, curso_id=curso_id)
+
+        cliente = Client()
+        cliente.force_login(user)
+        sesion = cliente.session.session_key
+        cookie = f"{settings.SESSION_COOKIE_NAME}={sesion}"
+
+        def limpiar():
+            Session.objects.filter(session_key=sesion).delete()
+            user.delete()
+            Curso.objects.filter(pk__in=creados).delete()
+
+        rutas = [
+            ("ver_curso", reverse("ver_curso", args=[cursos[0]])),
+            ("mis_cursos", reverse("mis_cursos")),
+            ("panel_estudiante", reverse("panel_estudiante")),
+        ]
+        return cookie, rutas, limpiar
+
+    def _medir(self, clientes, peticiones):
+        cookie, rutas, limpiar = self._datos()
+        connection.close()
+        try:
+            if settings.VISTAS_ASYNC:
+                tiempos, errores, duracion = asyncio.run(
+                    self._cargar_asgi(cookie, rutas, clientes, peticiones)
+                )
+            else:
+                tiempos, errores, duracion = self._cargar_wsgi(cookie, rutas, clientes, peticiones)
+        finally:
+            limpiar()
+
+        todos = [t for lista in tiempos.values() for t in lista]
+        return {
+            "peticiones_s": len(todos) / duracion,
+            "p50_ms": statistics.median(todos) * 1000,
+            "p99_ms": _percentil(todos, 99),
+            "errores": errores,
+            "vistas": {
+                vista: {
+                    "p50_ms": statistics.median(lista) * 1000,
+                    "p99_ms": _percentil(lista, 99),
+                }
+                for vista, lista in tiempos.items()
+            },
+        }
+
+    # ---------------------------------------------------------
+    #   WSGI: un hilo por cliente llamando a WSGIHandler
+    # ---------------------------------------------------------
+    def _cargar_wsgi(self, cookie, rutas, clientes, peticiones):
+        aplicacion = get_wsgi_application()
+        tiempos = {vista: [] for vista, _ in rutas}
+        errores = [0]
+        lock = threading.Lock()
+
+        def pedir(ruta):
+            estado = []
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": ruta,
+                "SCRIPT_NAME": "",
+                "QUERY_STRING": "",
+                "SERVER_NAME": "testserver",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_HOST": "testserver",
+                "HTTP_COOKIE": cookie,
+                "wsgi.version": (1, 0),
+                "wsgi.url_scheme": "http",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": sys.stderr,
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": True,
+                "wsgi.run_once": False,
+            }
+            cuerpo = aplicacion(environ, lambda status, headers, exc_info=None: estado.append(status))
+            try:
+                b"".join(cuerpo)
+            finally:
+                # close() dispara request_finished: Django devuelve la conexión
+                cuerpo.close()
+            return estado[0].startswith("200")
+
+        def cliente(n):
+            propios = {vista: [] for vista, _ in rutas}
+            fallidas = 0
+            for i in range(peticiones):
+                vista, ruta = rutas[(n + i) % len(rutas)]
+                inicio = time.perf_counter()
+                if not pedir(ruta):
+                    fallidas += 1
+                propios[vista].append(time.perf_counter() - inicio)
+            with lock:
+                for vista, lista in propios.items():
+                    tiempos[vista].extend(lista)
+                errores[0] += fallidas
+
+        inicio = time.perf_counter()
+        hilos = [threading.Thread(target=cliente, args=(n,)) for n in range(clientes)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        return tiempos, errores[0], time.perf_counter() - inicio
+
+    # ---------------------------------------------------------
+    #   ASGI: una tarea por cliente llamando a ASGIHandler
+    # ---------------------------------------------------------
+    async def _cargar_asgi(self, cookie, rutas, clientes, peticiones):
+        aplicacion = get_asgi_application()
+        tiempos = {vista: [] for vista, _ in rutas}
+        errores = 0
+
+        async def pedir(ruta):
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": ruta,
+                "raw_path": ruta.encode(),
+                "root_path": "",
+                "query_string": b"",
+                "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            }
+            recibido = False
+            estado = []
+
+            async def receive():
+                nonlocal recibido
+                if not recibido:
+                    recibido = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # El cliente no se desconecta: Django cancela esta espera al responder
+                await asyncio.Event().wait()
+
+            async def send(mensaje):
+                if mensaje["type"] == "http.response.start":
+                    estado.append(mensaje["status"])
+
+            await aplicacion(scope, receive, send)
+            return estado[0] == 200
+
+        async def cliente(n):
+            nonlocal errores
+            for i in range(peticiones):
+                vista, ruta = rutas[(n + i) % len(rutas)]
+                inicio = time.perf_counter()
+                if not await pedir(ruta):
+                    errores += 1
+                tiempos[vista].append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(n) for n in range(clientes)))
+        return tiempos, errores, time.perf_counter() - inicio
@@ -0,0 +1,89 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from gestorcursos import busqueda
+from gestorcursos.models import Curso
+
+
+class _Rollback(Exception):
+    pass
+
+
+MATERIAS = [
+    "Matemáticas", "Física", "Química", "Biología", "Historia", "Geografía",
+    "Lenguaje", "Inglés", "Música", "Educación Física", "Tecnología",
+    "Filosofía", "Artes Visuales", "Programación", "Economía", "Álgebra",
+]
+TEMAS = [
+    "introducción", "avanzado", "taller", "laboratorio", "electivo",
+    "nivelación", "comprensión lectora", "cálculo", "ecuaciones", "óptica",
+    "genética", "revolución", "cartografía", "redacción", "estadística",
+]
+NIVELES = [f"{n}° Básico" for n in range(1, 9)] + [f"{n}° Medio" for n in range(1, 5)]
+
+CONSULTAS = ["matematica", "fisica optica", "algebra", "quimica laboratorio", "ingles", "estadistica medio"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la búsqueda de cursos (índice de texto completo vs LIKE) sobre "
+        "N cursos generados dentro de una transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cursos", type=int, default=100_000,
+                            help="Cursos a generar (default: 100.000).")
+        parser.add_argument("--repeticiones", type=int, default=20,
+                            help="Veces que se ejecuta cada consulta (default: 20).")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._medir(options["cursos"], options["repeticiones"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _medir(self, total, repeticiones):
+        azar = random.Random(42)
+        self.stdout.write(f"Generando {total} cursos...")
+        Curso.objects.bulk_create(
+            (
+                Curso(
+                    nombre=f"{azar.choice(MATERIAS)} {azar.choice(TEMAS)} {i}",
+                    descripcion=" ".join(azar.sample(TEMAS, 4)),
+                    nivel=azar.choice(NIVELES),
+                )
+                for i in range(total)
+            ),
+            batch_size=5000,
+        )
+        # bulk_create no dispara señales: se reconstruye el índice
+        inicio = time.perf_counter()
+        filas = busqueda.reconstruir()
+        self.stdout.write(f"Índice reconstruido: {filas} filas en {time.perf_counter() - inicio:.1f} s")
+
+        for texto in CONSULTAS:
+            indice = self._cronometrar(lambda: busqueda.buscar(texto, limite=50), repeticiones)
+
+            palabras = texto.split()
+            like = Curso.objects.all()
+            for palabra in palabras:
+                like = like.filter(Q(nombre__icontains=palabra) | Q(descripcion__icontains=palabra))
+            scan = self._cronometrar(lambda: list(like.values_list("pk", flat=True)[:50]), repeticiones)
+
+            self.stdout.write(
+                f"  {texto!r:24} índice: {indice[0] * 1000:7.2f} ms ({indice[1]:3} res.) | "
+                f"LIKE: {scan[0] * 1000:8.2f} ms ({scan[1]:3} res.)"
+            )
+
+    def _cronometrar(self, consulta, repeticiones):
+        resultado = consulta()
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            consulta()
+        return (time.perf_counter() - inicio) / repeticiones, len(resultado)
@@ -0,0 +1,82 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gestorcursos import cohortes
+from gestorcursos.models import Curso
+from gestorusers.models import Estudiante
+
+
+class _Rollback(Exception):
+    pass
+
+
+NIVEL = "Cohorte bench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la inscripción masiva de una cohorte (gestorcursos/cohortes.py): "
+        "N estudiantes de un nivel en M cursos, generados dentro de una "
+        "transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--estudiantes", type=int, default=10_000,
+                            help="Estudiantes del nivel (default: 10.000).")
+        parser.add_argument("--cursos", type=int, default=20,
+                            help="Cursos en los que se inscriben (default: 20).")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._medir(options["estudiantes"], options["cursos"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _medir(self, total, total_cursos):
+        self.stdout.write(f"Generando {total} estudiantes y {total_cursos} cursos...")
+        User.objects.bulk_create(
+            (User(username=f"cohorte-{i}@bench.cl") for i in range(total)),
+            batch_size=5000,
+        )
+        usuarios = User.objects.filter(username__endswith="@bench.cl").values_list("id", flat=True)
+        Estudiante.objects.bulk_create(
+            (
+                Estudiante(user_id=user_id, rut=f"cohorte-{n}", nivel=NIVEL)
+                for n, user_id in enumerate(usuarios.iterator())
+            ),
+            batch_size=5000,
+        )
+        curso_ids = [
+            Curso.objects.create(nombre=f"Curso cohorte {i}").pk for i in range(total_cursos)
+        ]
+
+        inicio = time.perf_counter()
+        estudiante_ids, _ = cohortes.seleccionar(nivel=NIVEL)
+        self._linea("seleccionar", inicio, f"{len(estudiante_ids)} estudiantes")
+
+        inicio = time.perf_counter()
+        resumen = cohortes.simular(estudiante_ids, curso_ids)
+        self._linea("simular", inicio, f"{resumen['nuevas']} nuevas")
+
+        inicio = time.perf_counter()
+        resumen = cohortes.inscribir(estudiante_ids, curso_ids)
+        self._linea("inscribir", inicio, f"{resumen['nuevas']} creadas")
+
+        # Repetirla no crea nada: todos los pares chocan con unique_together
+        inicio = time.perf_counter()
+        resumen = cohortes.inscribir(estudiante_ids, curso_ids)
+        self._linea("inscribir (repetida)", inicio,
+                    f"{resumen['nuevas']} creadas, {resumen['ya_inscritas']} ya existían")
+
+        total_inscritos = sum(
+            Curso.objects.filter(pk__in=curso_ids).values_list("total_inscritos", flat=True)
+        )
+        self.stdout.write(f"Curso.total_inscritos suma {total_inscritos}")
+
+    def _linea(self, paso, inicio, detalle):
+        self.stdout.write(f"  {paso:22} {time.perf_counter() - inicio:7.2f} s  {detalle}")
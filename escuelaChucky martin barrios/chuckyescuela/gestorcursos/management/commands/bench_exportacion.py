@@ -0,0 +1,95 @@
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from chuckyescuela.exportacion import filas_por_lotes, generar_csv
+from gestorcursos.models import Curso, Inscripcion
+from gestorusers.models import Estudiante
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide tiempo y memoria pico de la exportación CSV de inscripciones. "
+        "Crea N inscripciones de prueba dentro de una transacción que se "
+        "revierte al terminar (la base de datos queda intacta)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--filas", type=int, default=1_000_000,
+                            help="Inscripciones a generar (default: 1.000.000).")
+        parser.add_argument("--chunk-size", type=int, default=2000,
+                            help="Filas por consulta al exportar (default: 2000).")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._medir(options["filas"], options["chunk_size"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _medir(self, total, chunk_size):
+        # Matriz cursos × estudiantes para respetar unique_together
+        lado = max(1, int(total ** 0.5))
+        self.stdout.write(f"Generando {total} inscripciones ({lado} estudiantes)...")
+
+        User.objects.bulk_create(
+            User(username=f"bench{i}@chucky.cl", email=f"bench{i}@chucky.cl",
+                 first_name="Bench", last_name=str(i))
+            for i in range(lado)
+        )
+        usuarios = User.objects.filter(username__startswith="bench").values_list("id", flat=True)
+        Estudiante.objects.bulk_create(
+            Estudiante(user_id=uid, rut=f"bench-{uid}", nivel="1° Medio")
+            for uid in usuarios
+        )
+        estudiantes = list(Estudiante.objects.filter(rut__startswith="bench-").values_list("id", flat=True))
+        Curso.objects.bulk_create(
+            Curso(nombre=f"Curso bench {i}", nivel="1° Medio")
+            for i in range((total + lado - 1) // lado)
+        )
+        cursos = list(Curso.objects.filter(nombre__startswith="Curso bench").values_list("id", flat=True))
+
+        def inscripciones():
+            n = 0
+            for curso_id in cursos:
+                for estudiante_id in estudiantes:
+                    if n == total:
+                        return
+                    n += 1
+                    yield Inscripcion(curso_id=curso_id, estudiante_id=estudiante_id)
+
+        Inscripcion.objects.bulk_create(inscripciones(), batch_size=5000)
+
+        # ---- Exportación (la parte medida) ----
+        filas = filas_por_lotes(
+            Inscripcion.objects.all(),
+            ("estudiante__user__first_name", "estudiante__user__last_name",
+             "estudiante__user__email", "estudiante__rut",
+             "curso__nombre", "curso__nivel", "fecha_inscripcion"),
+            chunk_size=chunk_size,
+        )
+
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        lineas = 0
+        bytes_csv = 0
+        for linea in generar_csv(["a"] * 7, filas):
+            lineas += 1
+            bytes_csv += len(linea.encode())
+        duracion = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Filas exportadas: {lineas - 1} | CSV: {bytes_csv / 1_048_576:.1f} MB | "
+            f"Tiempo: {duracion:.1f} s ({(lineas - 1) / duracion:,.0f} filas/s) | "
+            f"Memoria pico: {pico / 1_048_576:.1f} MB (chunk_size={chunk_size})"
+        ))
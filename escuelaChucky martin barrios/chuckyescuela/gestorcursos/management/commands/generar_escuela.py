@@ -0,0 +1,226 @@
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from gestorcursos import busqueda, catalogo
+from gestorcursos.models import Asignatura, Curso, Inscripcion
+from gestorreportes import rollups
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+# Todos los usuarios generados comparten este dominio (ver prueba_carga)
+DOMINIO = "escuela.test"
+PASSWORD = "Chucky123*"
+
+NOMBRES = [
+    "Sofía", "Martín", "Isidora", "Benjamín", "Florencia", "Vicente", "Agustina",
+    "Matías", "Emilia", "Tomás", "Josefa", "Joaquín", "Antonia", "Lucas",
+    "Catalina", "Maximiliano", "Trinidad", "Cristóbal", "Amanda", "Diego",
+]
+APELLIDOS = [
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+    "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes",
+    "Hernández", "Torres", "Araya", "Flores", "Espinoza", "Valenzuela",
+]
+MATERIAS = [
+    "Matemáticas", "Física", "Química", "Biología", "Historia", "Geografía",
+    "Lenguaje", "Inglés", "Música", "Educación Física", "Tecnología",
+    "Filosofía", "Artes Visuales", "Programación", "Economía", "Álgebra",
+]
+TEMAS = [
+    "introducción", "avanzado", "taller", "laboratorio", "electivo",
+    "nivelación", "comprensión lectora", "cálculo", "ecuaciones", "óptica",
+    "genética", "revolución", "cartografía", "redacción", "estadística",
+]
+NIVELES = [f"{n}° Básico" for n in range(1, 9)] + [f"{n}° Medio" for n in range(1, 5)]
+
+
+def _rut(numero):
+    """RUT con dígito verificador válido (módulo 11)."""
+    suma, factor = 0, 2
+    for digito in reversed(str(numero)):
+        suma += int(digito) * factor
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    dv = "0" if resto == 11 else "K" if resto == 10 else str(resto)
+    return f"{numero}-{dv}"
+
+
+def _ruts_libres(cantidad):
+    """
+    `cantidad` RUTs que no usa ningún estudiante (con --forzar la base ya
+    tiene RUTs reales): a partir del mayor número registrado, leído con o
+    sin puntos, y nunca bajo 10 millones.
+    """
+    inicial = 10_000_000
+    for rut in Estudiante.objects.values_list("rut", flat=True).iterator():
+        cuerpo = rut.rsplit("-", 1)[0].replace(".", "").strip()
+        if cuerpo.isdigit():
+            inicial = max(inicial, int(cuerpo) + 1)
+    return [_rut(inicial + n) for n in range(cantidad)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera una escuela sintética y determinista (misma semilla = mismos "
+        "datos): usuarios de los tres roles, cursos con asignaturas e "
+        "inscripciones, todo con bulk_create. Pensado para una base vacía "
+        "(p. ej. DB_NOMBRE=/tmp/carga.sqlite3 con el perfil de producción) y "
+        "para medirla después con prueba_carga. Contraseña de todos: "
+        f"{PASSWORD}; correos *@{DOMINIO}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--estudiantes", type=int, default=5000,
+                            help="Estudiantes (default: 5.000).")
+        parser.add_argument("--docentes", type=int, default=100,
+                            help="Docentes (default: 100).")
+        parser.add_argument("--administradores", type=int, default=5,
+                            help="Administradores (default: 5).")
+        parser.add_argument("--cursos", type=int, default=300,
+                            help="Cursos (default: 300).")
+        parser.add_argument("--asignaturas", type=int, default=4,
+                            help="Asignaturas por curso (default: 4).")
+        parser.add_argument("--inscripciones", type=int, default=30_000,
+                            help="Inscripciones en total (default: 30.000).")
+        parser.add_argument("--semilla", type=int, default=42,
+                            help="Semilla del generador (default: 42).")
+        parser.add_argument("--forzar", action="store_true",
+                            help="Generar aunque la base ya tenga cursos o usuarios sintéticos.")
+
+    def handle(self, *args, **options):
+        ya_generada = User.objects.filter(username__endswith=f"@{DOMINIO}").exists()
+        if (ya_generada or Curso.objects.exists()) and not options["forzar"]:
+            raise CommandError(
+                "La base ya tiene datos: use una base vacía o --forzar para agregar encima."
+            )
+        if options["inscripciones"] > options["estudiantes"] * options["cursos"]:
+            raise CommandError("Hay más inscripciones que combinaciones estudiante × curso.")
+
+        azar = random.Random(options["semilla"])
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            usuarios = self._usuarios(azar, options)
+            cursos = self._cursos(azar, options)
+            inscripciones = self._inscripciones(azar, usuarios, cursos, options["inscripciones"])
+
+        # bulk_create no dispara señales: contadores, búsqueda, reportes y caché
+        Curso.objects.recontar_inscripciones()
+        busqueda.reconstruir()
+        rollups.reconstruir()
+        catalogo.invalidar()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Escuela generada en {time.perf_counter() - inicio:.1f} s — "
+            f"{len(usuarios['estudiante'])} estudiantes, {len(usuarios['docente'])} docentes, "
+            f"{len(usuarios['administrador'])} administradores, {len(cursos)} cursos, "
+            f"{len(cursos) * options['asignaturas']} asignaturas, {inscripciones} inscripciones."
+        ))
+
+    # ---------------------------------------------------------
+    def _usuarios(self, azar, options):
+        # Todos comparten la contraseña: se hashea una sola vez
+        hash_ = make_password(PASSWORD)
+        cantidades = {
+            "estudiante": options["estudiantes"],
+            "docente": options["docentes"],
+            "administrador": options["administradores"],
+        }
+        inicial = User.objects.filter(username__endswith=f"@{DOMINIO}").count()
+
+        nuevos = []
+        for rol, cantidad in cantidades.items():
+            for _ in range(cantidad):
+                correo = f"{rol}{inicial + len(nuevos) + 1:06d}@{DOMINIO}"
+                nuevos.append((rol, correo))
+
+        User.objects.bulk_create(
+            (
+                User(
+                    username=correo, email=correo, password=hash_,
+                    first_name=azar.choice(NOMBRES), last_name=azar.choice(APELLIDOS),
+                )
+                for _, correo in nuevos
+            ),
+            batch_size=2000,
+        )
+        # bulk_create no devuelve los id en MySQL: se recuperan en una consulta
+        ids = dict(
+            User.objects.filter(username__endswith=f"@{DOMINIO}").values_list("username", "id")
+        )
+        PerfilUsuario.objects.bulk_create(
+            (PerfilUsuario(user_id=ids[correo], rol=rol) for rol, correo in nuevos),
+            batch_size=2000,
+        )
+
+        estudiantes = [correo for rol, correo in nuevos if rol == "estudiante"]
+        Estudiante.objects.bulk_create(
+            (
+                Estudiante(user_id=ids[correo], rut=rut, nivel=azar.choice(NIVELES))
+                for correo, rut in zip(estudiantes, _ruts_libres(len(estudiantes)))
+            ),
+            batch_size=2000,
+        )
+
+        return {
+            rol: [correo for r, correo in nuevos if r == rol]
+            for rol in cantidades
+        }
+
+    def _cursos(self, azar, options):
+        inicial = Curso.objects.count()
+        Curso.objects.bulk_create(
+            (
+                Curso(
+                    nombre=f"{azar.choice(MATERIAS)} {azar.choice(TEMAS)} {inicial + i + 1}",
+                    descripcion=" ".join(azar.sample(TEMAS, 5)).capitalize() + ".",
+                    nivel=azar.choice(NIVELES),
+                )
+                for i in range(options["cursos"])
+            ),
+            batch_size=2000,
+        )
+        cursos = list(Curso.objects.order_by("-id").values_list("id", "nivel")[:options["cursos"]])
+        cursos.reverse()
+
+        Asignatura.objects.bulk_create(
+            (
+                Asignatura(
+                    nombre=f"{azar.choice(MATERIAS)}: {azar.choice(TEMAS)}",
+                    descripcion=" ".join(azar.sample(TEMAS, 4)).capitalize() + ".",
+                    curso_id=curso_id,
+                )
+                for curso_id, _ in cursos
+                for _ in range(options["asignaturas"])
+            ),
+            batch_size=2000,
+        )
+        return cursos
+
+    def _inscripciones(self, azar, usuarios, cursos, total):
+        estudiantes = list(
+            Estudiante.objects.filter(user__username__in=usuarios["estudiante"])
+            .order_by("id").values_list("id", "nivel")
+        )
+        por_nivel = {}
+        for curso_id, nivel in cursos:
+            por_nivel.setdefault(nivel, []).append(curso_id)
+        todos = [curso_id for curso_id, _ in cursos]
+
+        # Cada estudiante toma ~total/N cursos, la mayoría de su nivel
+        pares = set()
+        while len(pares) < total:
+            estudiante_id, nivel = azar.choice(estudiantes)
+            propios = por_nivel.get(nivel)
+            curso_id = azar.choice(propios if propios and azar.random() < 0.8 else todos)
+            pares.add((estudiante_id, curso_id))
+
+        Inscripcion.objects.bulk_create(
+            (Inscripcion(estudiante_id=e, curso_id=c) for e, c in sorted(pares)),
+            batch_size=2000,
+        )
+        return len(pares)
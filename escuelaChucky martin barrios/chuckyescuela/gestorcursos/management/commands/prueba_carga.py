@@ -0,0 +1,216 @@
+import json
+import random
+import statistics
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from chuckyescuela.db import consultas
+from gestorcursos.management.commands.generar_escuela import DOMINIO, PASSWORD
+from gestorcursos.models import Curso
+from gestorusers.models import PerfilUsuario
+
+
+# Cada cliente virtual repite sesiones: inicia sesión con un usuario al
+# azar del rol y recorre sus páginas. rol → (peso en el tráfico, recorrido)
+SESIONES = {
+    "estudiante": (0.85, [
+        "panel_estudiante", "mis_cursos", "ver_curso", "ver_curso",
+        "inscribir_en_curso", "mis_cursos",
+    ]),
+    "docente": (0.10, [
+        "panel_usuario", "listar_cursos", "ver_curso", "listar_asignaturas",
+    ]),
+    "administrador": (0.05, [
+        "panel_admin", "admin_listar_estudiantes", "admin_inscripciones",
+        "listar_cursos", "admin_reportes",
+    ]),
+}
+
+# URLs que reciben un curso al azar
+CON_CURSO = {"ver_curso", "inscribir_en_curso"}
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga local sobre una escuela generada con generar_escuela: "
+        "N clientes concurrentes repiten sesiones realistas (login, paneles, "
+        "mis cursos, ver curso, inscribirse, listados de administración) y se "
+        "reporta el rendimiento y p50/p95/p99 por nombre de URL. Con --salida "
+        "queda un JSON de línea base; --comparar muestra la diferencia contra "
+        "una anterior. OJO: escribe (inscripciones y sesiones nuevas): para "
+        "comparar versiones, genere la escuela de nuevo antes de cada corrida."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clientes", type=int, default=8,
+                            help="Clientes concurrentes (default: 8).")
+        parser.add_argument("--peticiones", type=int, default=200,
+                            help="Peticiones por cliente (default: 200).")
+        parser.add_argument("--semilla", type=int, default=42,
+                            help="Semilla del recorrido de cada cliente (default: 42).")
+        parser.add_argument("--salida", help="Archivo donde guardar el resultado en JSON.")
+        parser.add_argument("--comparar", help="JSON de una corrida anterior para comparar.")
+
+    def handle(self, *args, **options):
+        usuarios = {
+            rol: list(
+                PerfilUsuario.objects.filter(rol=rol, user__username__endswith=f"@{DOMINIO}")
+                .order_by("user_id").values_list("user__username", flat=True)
+            )
+            for rol in SESIONES
+        }
+        cursos = list(Curso.objects.order_by("id").values_list("id", flat=True))
+        if not usuarios["estudiante"] or not cursos:
+            raise CommandError("No hay escuela sintética: corra antes python manage.py generar_escuela.")
+        connection.close()
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            resultado = self._cargar(usuarios, cursos, options)
+
+        self._imprimir(resultado)
+        if options["salida"]:
+            with open(options["salida"], "w", encoding="utf-8") as archivo:
+                json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Resultado guardado en {options['salida']}")
+        if options["comparar"]:
+            with open(options["comparar"], encoding="utf-8") as archivo:
+                self._comparar(json.load(archivo), resultado)
+
+    # ---------------------------------------------------------
+    def _cargar(self, usuarios, cursos, options):
+        tiempos = {}
+        errores = {}
+        n_consultas = {}
+        lock = threading.Lock()
+        roles = [rol for rol in SESIONES if usuarios[rol]]
+        pesos = [SESIONES[rol][0] for rol in roles]
+
+        def pedir(cliente, nombre, propios, metodo="get", **datos):
+            args = [datos.pop("curso")] if "curso" in datos else []
+            inicio = time.perf_counter()
+            with consultas.medir() as medicion:
+                response = getattr(cliente, metodo)(reverse(nombre, args=args), datos)
+            propios.append((nombre, time.perf_counter() - inicio, medicion.consultas, response.status_code))
+            # Lo mismo que hace el handler de Django al terminar la petición
+            close_old_connections()
+            return response
+
+        def trabajar(n):
+            azar = random.Random(options["semilla"] + n)
+            propios = []
+            while len(propios) < options["peticiones"]:
+                rol = azar.choices(roles, pesos)[0]
+                cliente = Client()
+                response = pedir(
+                    cliente, "login", propios, metodo="post",
+                    correo=azar.choice(usuarios[rol]), password=PASSWORD,
+                )
+                if response.status_code != 302 or response.url == reverse("login"):
+                    # Credenciales rechazadas: cuenta como error y se prueba otra sesión
+                    propios[-1] = (*propios[-1][:3], 401)
+                    continue
+                for nombre in SESIONES[rol][1]:
+                    if nombre in CON_CURSO:
+                        pedir(cliente, nombre, propios, curso=azar.choice(cursos))
+                    else:
+                        pedir(cliente, nombre, propios)
+
+            with lock:
+                for nombre, segundos, cantidad, estado in propios:
+                    tiempos.setdefault(nombre, []).append(segundos)
+                    n_consultas.setdefault(nombre, []).append(cantidad)
+                    errores[nombre] = errores.get(nombre, 0) + (estado >= 400)
+
+        inicio = time.perf_counter()
+        hilos = [threading.Thread(target=trabajar, args=(n,)) for n in range(options["clientes"])]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        duracion = time.perf_counter() - inicio
+
+        todos = [t for lista in tiempos.values() for t in lista]
+        return {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "configuracion": {
+                "settings": settings.SETTINGS_MODULE,
+                "motor": connection.vendor,
+                "vistas_async": settings.VISTAS_ASYNC,
+                "clientes": options["clientes"],
+                "peticiones_por_cliente": options["peticiones"],
+                "semilla": options["semilla"],
+            },
+            "total": {
+                "peticiones": len(todos),
+                "errores": sum(errores.values()),
+                "segundos": round(duracion, 2),
+                "peticiones_s": round(len(todos) / duracion, 1),
+                "p50_ms": round(statistics.median(todos) * 1000, 2),
+                "p95_ms": round(_percentil(todos, 95), 2),
+                "p99_ms": round(_percentil(todos, 99), 2),
+            },
+            "urls": {
+                nombre: {
+                    "peticiones": len(lista),
+                    "errores": errores[nombre],
+                    "p50_ms": round(statistics.median(lista) * 1000, 2),
+                    "p95_ms": round(_percentil(lista, 95), 2),
+                    "p99_ms": round(_percentil(lista, 99), 2),
+                    "consultas": round(statistics.mean(n_consultas[nombre]), 1),
+                }
+                for nombre, lista in sorted(tiempos.items())
+            },
+        }
+
+    def _imprimir(self, resultado):
+        total = resultado["total"]
+        self.stdout.write(
+            f"{total['peticiones']} peticiones en {total['segundos']} s "
+            f"({total['peticiones_s']} pet/s), {total['errores']} errores"
+        )
+        self.stdout.write(
+            f"{'url':26} {'n':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'consultas':>9}"
+        )
+        for nombre, datos in [*resultado["urls"].items(), ("TOTAL", {**total, "consultas": ""})]:
+            self.stdout.write(
+                f"{nombre:26} {datos['peticiones']:6} {datos['errores']:4} {datos['p50_ms']:8.2f} "
+                f"{datos['p95_ms']:8.2f} {datos['p99_ms']:8.2f} {datos['consultas']:>9}"
+            )
+
+    def _comparar(self, base, actual):
+        self.stdout.write(f"\nComparación con la corrida del {base['fecha']} (Δ % respecto a la base)")
+        self.stdout.write(f"{'url':26} {'p50':>8} {'p95':>8} {'p99':>8} {'consultas':>10}")
+
+        def delta(antes, ahora):
+            return f"{(ahora - antes) / antes * 100:+7.1f}%" if antes else f"{'—':>8}"
+
+        filas = [*sorted(set(base["urls"]) | set(actual["urls"])), "TOTAL"]
+        for nombre in filas:
+            antes = base["total"] if nombre == "TOTAL" else base["urls"].get(nombre)
+            ahora = actual["total"] if nombre == "TOTAL" else actual["urls"].get(nombre)
+            if not antes or not ahora:
+                self.stdout.write(f"{nombre:26} {'solo en la base' if antes else 'nueva'}")
+                continue
+            cambio_consultas = (
+                f"{ahora['consultas'] - antes['consultas']:+10.1f}" if "consultas" in antes else ""
+            )
+            self.stdout.write(
+                f"{nombre:26} {delta(antes['p50_ms'], ahora['p50_ms'])} "
+                f"{delta(antes['p95_ms'], ahora['p95_ms'])} {delta(antes['p99_ms'], ahora['p99_ms'])} "
+                f"{cambio_consultas}"
+            )
+        self.stdout.write(
+            f"Rendimiento: {base['total']['peticiones_s']} → {actual['total']['peticiones_s']} pet/s"
+        )
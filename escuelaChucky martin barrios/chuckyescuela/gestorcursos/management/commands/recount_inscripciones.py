@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from gestorcursos.models import Curso
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula Curso.total_inscritos desde la tabla Inscripcion, "
+        "por lotes, corrigiendo solo los cursos con el contador desfasado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Cantidad de cursos revisados por transacción (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        ids = list(Curso.objects.order_by("pk").values_list("pk", flat=True))
+
+        revisados = 0
+        corregidos = 0
+
+        for inicio in range(0, len(ids), batch_size):
+            lote = ids[inicio:inicio + batch_size]
+
+            with transaction.atomic():
+                desfasados = list(
+                    Curso.objects
+                    .filter(pk__in=lote)
+                    .annotate(real=Count("inscripcion"))
+                    .exclude(total_inscritos=F("real"))
+                    .values_list("pk", flat=True)
+                )
+                if desfasados:
+                    Curso.objects.filter(pk__in=desfasados).recontar_inscripciones()
+
+            revisados += len(lote)
+            corregidos += len(desfasados)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Cursos revisados: {revisados} — contadores corregidos: {corregidos}."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from gestorcursos import busqueda
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el índice de búsqueda de cursos y asignaturas "
+        "(necesario tras cargas con bulk_create o QuerySet.update)."
+    )
+
+    def handle(self, *args, **options):
+        total = busqueda.reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"Índice de búsqueda reconstruido: {total} filas."))
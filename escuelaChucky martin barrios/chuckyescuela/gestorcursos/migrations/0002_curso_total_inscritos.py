@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def inicializar_total_inscritos(apps, schema_editor):
+    Curso = apps.get_model("gestorcursos", "Curso")
+    Inscripcion = apps.get_model("gestorcursos", "Inscripcion")
+    conteo = (
+        Inscripcion.objects
+        .filter(curso=OuterRef("pk"))
+        .order_by()
+        .values("curso")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Curso.objects.using(schema_editor.connection.alias).update(total_inscritos=Coalesce(Subquery(conteo), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curso',
+            name='total_inscritos',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(inicializar_total_inscritos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0002_curso_total_inscritos'),
+        ('gestorusers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['fecha_inscripcion', 'id'], name='insc_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['curso', 'fecha_inscripcion', 'id'], name='insc_curso_fecha_id_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+
+# Tabla de índice para gestorcursos/busqueda.py (sin modelo: la consultan
+# MATCH / bm25 directamente). Columnas: tipo ("curso" | "asignatura"),
+# objeto_id, curso_id, titulo, cuerpo, nivel.
+
+SQLITE = """
+CREATE VIRTUAL TABLE gestorcursos_busqueda USING fts5(
+    tipo UNINDEXED,
+    objeto_id UNINDEXED,
+    curso_id UNINDEXED,
+    titulo,
+    cuerpo,
+    nivel,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+MYSQL = """
+CREATE TABLE gestorcursos_busqueda (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    tipo VARCHAR(20) NOT NULL,
+    objeto_id BIGINT NOT NULL,
+    curso_id BIGINT NOT NULL,
+    titulo VARCHAR(100) NOT NULL,
+    cuerpo TEXT NOT NULL,
+    nivel VARCHAR(50) NOT NULL,
+    UNIQUE KEY busqueda_tipo_objeto_uniq (tipo, objeto_id),
+    KEY busqueda_curso_idx (curso_id),
+    FULLTEXT KEY busqueda_titulo_ft (titulo),
+    FULLTEXT KEY busqueda_todo_ft (titulo, cuerpo, nivel)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+POBLAR = [
+    "INSERT INTO gestorcursos_busqueda (tipo, objeto_id, curso_id, titulo, cuerpo, nivel) "
+    "SELECT 'curso', id, id, nombre, COALESCE(descripcion, ''), COALESCE(nivel, '') "
+    "FROM gestorcursos_curso",
+    "INSERT INTO gestorcursos_busqueda (tipo, objeto_id, curso_id, titulo, cuerpo, nivel) "
+    "SELECT 'asignatura', id, curso_id, nombre, COALESCE(descripcion, ''), '' "
+    "FROM gestorcursos_asignatura",
+]
+
+
+def crear_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE)
+    elif vendor == "mysql":
+        schema_editor.execute(MYSQL)
+    else:
+        # Otros motores: busqueda.py usa LIKE y no necesita la tabla
+        return
+    for sql in POBLAR:
+        schema_editor.execute(sql)
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "mysql"):
+        schema_editor.execute("DROP TABLE gestorcursos_busqueda")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0003_inscripcion_indices_paginacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
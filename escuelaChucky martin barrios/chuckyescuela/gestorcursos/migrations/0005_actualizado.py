@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:52
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def inscripciones_desde_fecha(apps, schema_editor):
+    # Las inscripciones existentes no han cambiado desde que se crearon
+    Inscripcion = apps.get_model("gestorcursos", "Inscripcion")
+    Inscripcion.objects.using(schema_editor.connection.alias).update(actualizado=F("fecha_inscripcion"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0004_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asignatura',
+            name='actualizado',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='curso',
+            name='actualizado',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='inscripcion',
+            name='actualizado',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(inscripciones_desde_fecha, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0005_actualizado'),
+        ('gestorusers', '0002_indices_rol_nivel'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['nivel', 'nombre'], name='curso_nivel_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscripcion',
+            index=models.Index(fields=['estudiante', 'fecha_inscripcion'], name='insc_estudiante_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0006_indices_nivel_estudiante'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curso',
+            name='eliminando',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
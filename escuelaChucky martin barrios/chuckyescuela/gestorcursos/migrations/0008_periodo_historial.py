@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0007_curso_eliminando'),
+        ('gestorusers', '0002_indices_rol_nivel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Periodo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50, unique=True)),
+                ('inicio', models.DateField()),
+                ('fin', models.DateField()),
+                ('cerrado', models.BooleanField(default=False)),
+                ('archivado', models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                'ordering': ['inicio'],
+            },
+        ),
+        migrations.CreateModel(
+            name='InscripcionHistorica',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('fecha_inscripcion', models.DateTimeField()),
+                ('curso', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gestorcursos.curso')),
+                ('estudiante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gestorusers.estudiante')),
+                ('periodo', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='gestorcursos.periodo')),
+            ],
+        ),
+    ]
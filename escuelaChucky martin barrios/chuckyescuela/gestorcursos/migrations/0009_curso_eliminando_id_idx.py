@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestorcursos', '0008_periodo_historial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['eliminando', 'id'], name='curso_eliminando_id_idx'),
+        ),
+    ]
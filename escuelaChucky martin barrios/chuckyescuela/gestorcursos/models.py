@@ -1,10 +1,50 @@
-from django.db import models
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, router, transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
 from gestorusers.models import Estudiante
 
 
 # =============================================================
 #                          CURSO
 # =============================================================
+class CursoQuerySet(models.QuerySet):
+
+    def recontar_inscripciones(self):
+        """
+        Recalcula total_inscritos desde la tabla Inscripcion para los
+        cursos del queryset, con un único UPDATE ... SET = (SELECT COUNT).
+        Devuelve la cantidad de cursos actualizados.
+        """
+        conteo = (
+            Inscripcion.objects
+            .filter(curso=OuterRef("pk"))
+            .order_by()
+            .values("curso")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return self.update(
+            total_inscritos=Coalesce(Subquery(conteo), Value(0)),
+            actualizado=Now(),
+        )
+
+
+class CursoManager(models.Manager.from_queryset(CursoQuerySet)):
+    """
+    Manager por defecto: oculta los cursos que se están eliminando en
+    segundo plano (gestortareas). Curso.todos los incluye.
+    """
+
+    def get_queryset(self):
+        # Value(False): "eliminando = false" en todos los motores (con False
+        # a secas SQLite escribe "NOT eliminando" y no usa el índice)
+        return super().get_queryset().filter(eliminando=Value(False))
+
+
 class Curso(models.Model):
     nombre = models.CharField(max_length=100)
     descripcion = models.TextField(blank=True, null=True)
@@ -13,6 +53,28 @@ class Curso(models.Model):
         blank=True,     # ✔ El formulario puede enviarlo vacío
         null=True       # ✔ MySQL ahora permite NULL correctamente
     )
+    # ✔ Contador desnormalizado de inscripciones.
+    #   Se mantiene con UPDATE ... F() desde gestorcursos/signals.py
+    #   y se repara con: python manage.py recount_inscripciones
+    total_inscritos = models.PositiveIntegerField(default=0, editable=False)
+    # ✔ Última modificación (también al cambiar total_inscritos).
+    #   Indexado: el GET condicional del catálogo pide MAX(actualizado)
+    actualizado = models.DateTimeField(auto_now=True, db_index=True)
+    # ✔ Eliminación encolada (gestortareas): el curso deja de verse al
+    #   instante y el worker borra sus inscripciones por lotes
+    eliminando = models.BooleanField(default=False, editable=False)
+
+    # El primero es el manager por defecto (get_object_or_404, formularios, admin)
+    objects = CursoManager()
+    todos = CursoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # ✔ Filtro por nivel (inscripciones, reportes) y lista de niveles
+            models.Index(fields=["nivel", "nombre"], name="curso_nivel_nombre_idx"),
+            # ✔ Listado de administración (paginado por -id, sin los que se eliminan)
+            models.Index(fields=["eliminando", "id"], name="curso_eliminando_id_idx"),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -29,6 +91,7 @@ class Asignatura(models.Model):
         on_delete=models.CASCADE,
         related_name="asignaturas"  # ✔ Para acceder como curso.asignaturas.all()
     )
+    actualizado = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.nombre} — {self.curso.nombre}"
@@ -37,13 +100,106 @@ class Asignatura(models.Model):
 # =============================================================
 #                   INSCRIPCIÓN DE ESTUDIANTES
 # =============================================================
+class InscripcionQuerySet(models.QuerySet):
+
+    def inscribir(self, estudiante_id, curso_id):
+        """
+        Inscribe al estudiante en el curso. Devuelve True si la inscripción
+        es nueva y False si ya existía (doble clic, reintento): idempotente.
+
+        No pregunta antes si existe: hace el INSERT y deja que unique_together
+        decida (IntegrityError dentro de la misma transacción). Así dos
+        peticiones simultáneas nunca duplican ni fallan, y las señales del
+        contador y los reportes corren solo para la inscripción nueva.
+        Lanza Curso.DoesNotExist si el curso no existe.
+        """
+        try:
+            with transaction.atomic(using=router.db_for_write(self.model)):
+                self.create(estudiante_id=estudiante_id, curso_id=curso_id)
+        except IntegrityError:
+            if self.filter(estudiante_id=estudiante_id, curso_id=curso_id).exists():
+                return False
+            # No era un duplicado: clave foránea a un curso (o estudiante) inexistente
+            if not Curso.objects.filter(pk=curso_id).exists():
+                raise Curso.DoesNotExist(f"No existe el curso {curso_id}.")
+            raise
+        return True
+
+
 class Inscripcion(models.Model):
     estudiante = models.ForeignKey(Estudiante, on_delete=models.CASCADE)
     curso = models.ForeignKey(Curso, on_delete=models.CASCADE)
     fecha_inscripcion = models.DateTimeField(auto_now_add=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    objects = InscripcionQuerySet.as_manager()
 
     class Meta:
         unique_together = ('estudiante', 'curso')  # ✔ Evita duplicados
+        indexes = [
+            # ✔ Paginación por cursor del listado global de inscripciones
+            models.Index(fields=["fecha_inscripcion", "id"], name="insc_fecha_id_idx"),
+            # ✔ Mismo listado filtrado por curso
+            models.Index(fields=["curso", "fecha_inscripcion", "id"], name="insc_curso_fecha_id_idx"),
+            # ✔ Cursos de un estudiante y su primera/última inscripción
+            models.Index(fields=["estudiante", "fecha_inscripcion"], name="insc_estudiante_fecha_idx"),
+        ]
 
     def __str__(self):
         return f"{self.estudiante.user.first_name} inscrito en {self.curso.nombre}"
+
+
+# =============================================================
+#            PERIODOS E HISTORIAL DE INSCRIPCIONES
+# =============================================================
+class Periodo(models.Model):
+    """
+    Periodo académico (semestre, año...). Una vez cerrado, sus inscripciones
+    se mueven a InscripcionHistorica: python manage.py archivar_inscripciones
+    """
+    nombre = models.CharField(max_length=50, unique=True)
+    inicio = models.DateField()
+    fin = models.DateField()  # ✔ Incluido
+    cerrado = models.BooleanField(default=False)
+    # ✔ Cuándo terminó de archivarse (None: pendiente o a medias)
+    archivado = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ["inicio"]
+
+    def clean(self):
+        if self.inicio and self.fin and self.fin < self.inicio:
+            raise ValidationError({"fin": "El periodo no puede terminar antes de empezar."})
+        if self.cerrado and self.fin and not self.terminado():
+            raise ValidationError({"cerrado": "Solo se puede cerrar un periodo que ya terminó."})
+
+    def terminado(self):
+        """True si `fin` ya pasó: sus inscripciones no pueden seguir cambiando."""
+        return self.fin < timezone.localdate()
+
+    def rango(self):
+        """[inicio 00:00, fin+1 00:00) con hora local, para usar el índice de fecha_inscripcion."""
+        return (
+            timezone.make_aware(datetime.combine(self.inicio, time.min)),
+            timezone.make_aware(datetime.combine(self.fin + timedelta(days=1), time.min)),
+        )
+
+    def __str__(self):
+        return self.nombre
+
+
+class InscripcionHistorica(models.Model):
+    """
+    Inscripción de un periodo cerrado, fuera de la tabla Inscripcion
+    (gestorcursos/archivado.py). Conserva el id original y solo lo que usan
+    los reportes: sin `actualizado` ni unique_together (en un periodo nuevo
+    se puede volver a tomar el mismo curso).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    estudiante = models.ForeignKey(Estudiante, on_delete=models.CASCADE)
+    curso = models.ForeignKey(Curso, on_delete=models.CASCADE)
+    periodo = models.ForeignKey(Periodo, on_delete=models.PROTECT)
+    fecha_inscripcion = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.estudiante_id} en {self.curso_id} ({self.periodo_id})"
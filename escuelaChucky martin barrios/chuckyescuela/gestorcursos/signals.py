@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from gestorcursos import busqueda, catalogo
+from gestorcursos.models import Asignatura, Curso, Inscripcion
+
+
+# =============================================================
+#      CONTADOR Curso.total_inscritos (UPDATE atómico con F())
+# =============================================================
+#
+# post_delete también se dispara por cada Inscripcion borrada en cascada
+# (al eliminar un Estudiante o su User), así el contador queda exacto.
+# Ojo: bulk_create / QuerySet.update no disparan señales; quien los use
+# debe llamar a Curso.objects.filter(...).recontar_inscripciones().
+
+@receiver(post_save, sender=Inscripcion)
+def inscripcion_creada(sender, instance, created, **kwargs):
+    if created:
+        Curso.objects.filter(pk=instance.curso_id).update(
+            total_inscritos=F("total_inscritos") + 1,
+            actualizado=Now(),
+        )
+
+
+@receiver(post_delete, sender=Inscripcion)
+def inscripcion_eliminada(sender, instance, **kwargs):
+    Curso.objects.filter(pk=instance.curso_id, total_inscritos__gt=0).update(
+        total_inscritos=F("total_inscritos") - 1,
+        actualizado=Now(),
+    )
+
+
+# =============================================================
+#        ÍNDICE DE BÚSQUEDA (gestorcursos/busqueda.py)
+# =============================================================
+
+@receiver(post_save, sender=Curso)
+def curso_guardado(sender, instance, **kwargs):
+    busqueda.indexar_curso(instance)
+
+
+@receiver(post_delete, sender=Curso)
+def curso_eliminado(sender, instance, **kwargs):
+    busqueda.quitar_curso(instance.pk)
+
+
+@receiver(post_save, sender=Asignatura)
+def asignatura_guardada(sender, instance, **kwargs):
+    busqueda.indexar_asignatura(instance)
+
+
+@receiver(post_delete, sender=Asignatura)
+def asignatura_eliminada(sender, instance, **kwargs):
+    busqueda.quitar(busqueda.ASIGNATURA, instance.pk)
+    # El curso "cambia" aunque ya no exista la fila de la asignatura
+    # (ver_curso calcula su Last-Modified con Curso.actualizado)
+    Curso.objects.filter(pk=instance.curso_id).update(actualizado=Now())
+
+
+# =============================================================
+#        CACHÉ DEL CATÁLOGO (gestorcursos/catalogo.py)
+# =============================================================
+
+@receiver(post_save, sender=Curso)
+@receiver(post_delete, sender=Curso)
+@receiver(post_save, sender=Asignatura)
+@receiver(post_delete, sender=Asignatura)
+def catalogo_modificado(sender, **kwargs):
+    # Se invalida ahora y otra vez al confirmar la transacción: si otra
+    # petición reconstruyó la caché con los datos aún sin confirmar,
+    # esa entrada queda descartada.
+    catalogo.invalidar()
+    transaction.on_commit(catalogo.invalidar)
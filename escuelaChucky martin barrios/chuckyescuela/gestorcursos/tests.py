@@ -1,3 +1,1177 @@
-from django.test import TestCase
+import copy
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+import types
+from contextlib import contextmanager
+from datetime import date, datetime
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, resolve, reverse
+from django.utils import timezone
+
+from chuckyescuela.db import consultas, replicas
+from chuckyescuela.pruebas import PresupuestoConsultasMixin
+from gestorcursos import api, archivado, busqueda, cohortes, urls, views
+from gestorcursos.management.commands.auditar_explain import tablas_recorridas
+from gestorcursos.management.commands.generar_escuela import _rut
+from gestorcursos.models import Asignatura, Curso, Inscripcion, InscripcionHistorica, Periodo
+from gestorreportes import rollups
+from gestorreportes.models import ReporteCurso, ReporteDia, ReporteNivel
+from gestortareas import eliminacion
+from gestorusers import panel
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+# =============================================================
+#        RÉPLICAS DE LECTURA — dos bases SQLite locales
+# =============================================================
+
+@contextmanager
+def _replica_sqlite(alias):
+    """
+    Registra `alias` como una base SQLite temporal y migrada mientras dure
+    el bloque. Solo para la clase que la usa: registrarla al importar el
+    módulo cambiaría la configuración de bases de todos los tests.
+    """
+    with tempfile.TemporaryDirectory() as carpeta:
+        connections.settings[alias] = {
+            **connections.settings["default"],
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.path.join(carpeta, f"{alias}.sqlite3"),
+            "OPTIONS": {},
+        }
+        try:
+            call_command("migrate", database=alias, verbosity=0, interactive=False)
+            yield
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+
+@override_settings(REPLICAS_LECTURA=["replica"])
+class ReplicasLecturaTests(TestCase):
+    # "replica" se suma en setUpClass: el runner no la conoce y no le crea
+    # base de test (la crea _replica_sqlite)
+
+    @classmethod
+    def setUpClass(cls):
+        replica = _replica_sqlite("replica")
+        replica.__enter__()
+        cls.addClassCleanup(replica.__exit__, None, None, None)
+        cls.databases = {"default", "replica"}
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.curso = Curso.objects.create(nombre="Curso replicado")
+        cls.user = User.objects.create_user(
+            username="replica@chucky.cl", email="replica@chucky.cl", password="Chucky123*"
+        )
+        PerfilUsuario.objects.create(user=cls.user, rol="estudiante")
+        cls.estudiante = Estudiante.objects.create(user=cls.user, rut="1-9")
+
+        # La réplica tiene lo mismo que el primario al momento de "replicar"
+        for objeto in (cls.curso, cls.user, cls.estudiante):
+            type(objeto).objects.using("replica").bulk_create([copy.copy(objeto)])
+
+    def setUp(self):
+        replicas._caidas.clear()
+        self.client.force_login(self.user)
+
+    def test_fuera_de_una_peticion_se_usa_el_primario(self):
+        self.assertEqual(router.db_for_read(Curso), "default")
+        self.assertEqual(router.db_for_write(Curso), "default")
+
+    def test_listado_lee_de_la_replica(self):
+        with CaptureQueriesContext(connections["replica"]) as en_replica:
+            response = self.client.get(reverse("listar_cursos"))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(en_replica.captured_queries), 0)
+        self.assertNotIn(replicas.REPLICA_COOKIE, response.cookies)
+
+    def test_tras_inscribirse_mis_cursos_lee_del_primario(self):
+        response = self.client.get(reverse("inscribir_en_curso", args=[self.curso.id]))
+        self.assertRedirects(response, reverse("mis_cursos"), fetch_redirect_response=False)
+        self.assertIn(replicas.REPLICA_COOKIE, response.cookies)
+        self.assertTrue(Inscripcion.objects.filter(estudiante=self.estudiante).exists())
+
+        # La réplica aún no tiene la inscripción, pero la cookie fija al primario
+        with CaptureQueriesContext(connections["replica"]) as en_replica:
+            response = self.client.get(reverse("mis_cursos"))
+        self.assertEqual(len(en_replica.captured_queries), 0)
+        self.assertEqual(response.context["cursos_inscritos_ids"], {self.curso.id})
+
+        # Vencida la fijación se vuelve a leer de la réplica (todavía atrasada)
+        del self.client.cookies[replicas.REPLICA_COOKIE]
+        response = self.client.get(reverse("mis_cursos"))
+        self.assertEqual(response.context["cursos_inscritos_ids"], set())
+
+    def test_replica_caida_lee_del_primario(self):
+        # Solo en el primario: si se lee de ahí, aparece
+        Inscripcion.objects.create(estudiante=self.estudiante, curso=self.curso)
+        caida = OperationalError("unable to open database file")
+
+        with mock.patch.object(connections["replica"], "ensure_connection", side_effect=caida):
+            with self.assertLogs("chuckyescuela.db.replicas", "WARNING"):
+                response = self.client.get(reverse("mis_cursos"))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["cursos_inscritos_ids"], {self.curso.id})
+            self.assertEqual(replicas.estado_replicas(), {"replica": False})
+
+            # Marcada caída: la siguiente petición ni siquiera intenta conectar
+            self.client.get(reverse("mis_cursos"))
+            self.assertEqual(connections["replica"].ensure_connection.call_count, 1)
+
+
+# =============================================================
+#         INSCRIPCIÓN IDEMPOTENTE (inscribir_en_curso)
+# =============================================================
+
+def _usuario(correo, rol):
+    user = User.objects.create_user(username=correo, email=correo, password="Chucky123*")
+    PerfilUsuario.objects.create(user=user, rol=rol)
+    return user
+
+
+class InscribirEnCursoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.curso = Curso.objects.create(nombre="Física")
+        cls.user = _usuario("inscribir@chucky.cl", "estudiante")
+        cls.estudiante = Estudiante.objects.create(user=cls.user, rut="2-7")
+
+    def setUp(self):
+        self.client.login(username="inscribir@chucky.cl", password="Chucky123*")
+        self.url = reverse("inscribir_en_curso", args=[self.curso.id])
+
+    def inscribir(self):
+        response = self.client.get(self.url, follow=True)
+        self.assertEqual(response.redirect_chain, [(reverse("mis_cursos"), 302)])
+        return [str(m) for m in response.context["messages"]]
+
+    def test_repetir_la_inscripcion_da_la_misma_respuesta(self):
+        self.assertEqual(self.inscribir(), ["Te has inscrito correctamente en Física."])
+        self.assertEqual(self.inscribir(), ["Te has inscrito correctamente en Física."])
+
+        self.assertEqual(Inscripcion.objects.filter(estudiante=self.estudiante).count(), 1)
+        self.curso.refresh_from_db()
+        self.assertEqual(self.curso.total_inscritos, 1)
+
+    def test_inscribir_devuelve_si_la_inscripcion_es_nueva(self):
+        self.assertIs(Inscripcion.objects.inscribir(self.estudiante.id, self.curso.id), True)
+        self.assertIs(Inscripcion.objects.inscribir(self.estudiante.id, self.curso.id), False)
+
+    def test_curso_inexistente(self):
+        response = self.client.get(reverse("inscribir_en_curso", args=[self.curso.id + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_solo_estudiantes(self):
+        _usuario("docente@chucky.cl", "docente")
+        self.client.login(username="docente@chucky.cl", password="Chucky123*")
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse("mis_cursos"), fetch_redirect_response=False)
+        self.assertFalse(Inscripcion.objects.exists())
+
+
+@contextmanager
+def _sqlite_en_archivo(conexion):
+    """
+    Cambia la base de test SQLite en memoria por un archivo temporal migrado:
+    los hilos abren sus propias conexiones y en memoria cada una vería una
+    base distinta. Al salir se vuelve a la base en memoria, intacta.
+    """
+    nombre, en_memoria = conexion.settings_dict["NAME"], conexion.connection
+    with tempfile.TemporaryDirectory() as carpeta:
+        # settings_dict es el mismo dict con que los hilos crean su conexión;
+        # la base en memoria sigue viva mientras se guarde `en_memoria`
+        conexion.connection = None
+        conexion.settings_dict["NAME"] = os.path.join(carpeta, "hilos.sqlite3")
+        try:
+            call_command("migrate", database=conexion.alias, verbosity=0, interactive=False)
+            yield
+        finally:
+            conexion.close()
+            conexion.settings_dict["NAME"] = nombre
+            conexion.connection = en_memoria
+
+
+class InscripcionesSimultaneasTests(TransactionTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            base = _sqlite_en_archivo(connection)
+            base.__enter__()
+            cls.addClassCleanup(base.__exit__, None, None, None)
+        super().setUpClass()
+
+    def test_cientos_de_inscripciones_al_mismo_curso(self):
+        curso = Curso.objects.create(nombre="Curso concurrido")
+        estudiantes = [
+            Estudiante.objects.create(
+                user=User.objects.create(username=f"concurrente{n}@chucky.cl"), rut=f"c-{n}"
+            )
+            for n in range(60)
+        ]
+        # Cada estudiante lo intenta 4 veces a la vez (doble clic, reintentos)
+        intentos = [e.id for e in estudiantes for _ in range(4)]
+        barrera = threading.Barrier(len(intentos))
+        resultados, errores = [], []
+
+        def inscribir(estudiante_id):
+            try:
+                barrera.wait()
+                resultados.append(Inscripcion.objects.inscribir(estudiante_id, curso.id))
+            except Exception as e:
+                errores.append(e)
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=inscribir, args=(i,)) for i in intentos]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertEqual(resultados.count(True), len(estudiantes))
+        self.assertEqual(resultados.count(False), len(intentos) - len(estudiantes))
+        self.assertEqual(Inscripcion.objects.filter(curso=curso).count(), len(estudiantes))
+        curso.refresh_from_db()
+        self.assertEqual(curso.total_inscritos, len(estudiantes))
+        self.assertEqual(
+            ReporteCurso.objects.get(curso=curso).total_inscripciones, len(estudiantes)
+        )
+
+
+# =============================================================
+#         CONSULTAS POR PETICIÓN (ConsultasMiddleware)
+# =============================================================
+
+class ConsultasMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [Curso.objects.create(nombre=f"Curso {i}") for i in range(6)]
+
+    def responder(self, vista):
+        middleware = consultas.ConsultasMiddleware(vista)
+        return middleware(RequestFactory().get("/prueba/"))
+
+    @override_settings(CONSULTAS_CABECERA=True)
+    def test_cabeceras_con_cantidad_y_tiempo(self):
+        def vista(request):
+            list(Curso.objects.all())
+            Curso.objects.count()
+            return HttpResponse()
+
+        response = self.responder(vista)
+        self.assertEqual(response["X-Consultas"], "2")
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="2 consultas"$')
+        self.assertNotIn("X-Consultas-Repetidas", response)
+
+    @override_settings(CONSULTAS_CABECERA=False)
+    def test_sin_cabeceras_fuera_de_debug(self):
+        response = self.responder(lambda request: HttpResponse())
+        self.assertNotIn("X-Consultas", response)
+
+    @override_settings(CONSULTAS_CABECERA=True, CONSULTAS_REPETIDAS=5)
+    def test_avisa_consultas_repetidas(self):
+        def vista(request):
+            # Una consulta por curso: el N+1 clásico
+            for curso_id in Curso.objects.values_list("id", flat=True):
+                Curso.objects.get(pk=curso_id)
+            return HttpResponse()
+
+        with self.assertLogs("chuckyescuela.db.consultas", "WARNING") as logs:
+            response = self.responder(vista)
+        self.assertEqual(response["X-Consultas-Repetidas"], "1")
+        self.assertIn("la misma consulta 6 veces", logs.output[0])
+
+    def test_forma_ignora_valores_y_largo_de_listas(self):
+        self.assertEqual(
+            consultas.forma('SELECT * FROM "t" WHERE "id" IN (%s, %s) AND "n" = \'x\' LIMIT 21'),
+            consultas.forma('SELECT * FROM "t" WHERE "id" IN (%s) AND "n" = \'y\' LIMIT 1'),
+        )
+
+
+# =============================================================
+#       PRESUPUESTO DE CONSULTAS — cada URL de gestorcursos
+# =============================================================
+
+# nombre → (rol con el que se visita, objeto del argumento, máximo)
+PRESUPUESTOS = {
+    "listar_cursos": ("administrador", None, 5),
+    "agregar_curso": ("administrador", None, 2),
+    "editar_curso": ("administrador", "curso", 3),
+    "eliminar_curso": ("administrador", "curso_a_eliminar", 8),
+    "admin_listar_cursos": ("administrador", None, 3),
+    "admin_inscripciones": ("administrador", None, 5),
+    "admin_exportar_inscripciones": ("administrador", None, 3),
+    "admin_inscripcion_masiva": ("administrador", None, 4),
+    "admin_catalogo_estadisticas": ("administrador", None, 2),
+    "listar_asignaturas": ("estudiante", None, 3),
+    "mis_cursos": ("estudiante", None, 5),
+    "inscribir_en_curso": ("estudiante", "curso_libre", 12),
+    "ver_curso": ("estudiante", "curso", 6),
+}
+
+# Las que cambian datos solo aceptan POST
+SOLO_POST = {"eliminar_curso"}
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+    modulo_urls = urls
+    presupuestos = PRESUPUESTOS
+    solo_post = SOLO_POST
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.curso = cls.cursos[0]
+        cls.curso_libre = cls.cursos[20]
+        cls.curso_a_eliminar = cls.cursos[5]
+
+
+# =============================================================
+#                     AUDITORÍA DE EXPLAIN
+# =============================================================
+
+class AuditarExplainTests(TestCase):
+
+    def test_scan_sqlite(self):
+        plan = (
+            "3 0 0 SCAN gestorusers_estudiante\n"
+            "5 0 0 SEARCH auth_user USING INTEGER PRIMARY KEY (rowid=?)\n"
+            "9 0 0 SCAN gestorcursos_curso USING COVERING INDEX curso_nivel_nombre_idx"
+        )
+        self.assertEqual(tablas_recorridas(plan, "sqlite"), {"gestorusers_estudiante"})
+
+    def test_scan_sqlite_con_limit(self):
+        # En el orden pedido: se corta en el LIMIT
+        plan = "4 0 0 SCAN gestorcursos_curso"
+        self.assertEqual(tablas_recorridas(plan, "sqlite", limitada=True), set())
+
+        # Ordenar en un B-tree temporal obliga a leer todo
+        plan = (
+            "11 0 0 SCAN gestorusers_estudiante USING INDEX sqlite_autoindex_x\n"
+            "98 0 0 USE TEMP B-TREE FOR ORDER BY"
+        )
+        self.assertEqual(tablas_recorridas(plan, "sqlite", limitada=True), {"gestorusers_estudiante"})
+
+    def test_scan_con_limit_y_filtro(self):
+        # Con WHERE el LIMIT no exime: si calzan pocas filas, el SCAN las
+        # busca por toda la tabla
+        Curso.objects.create(nombre="Álgebra", descripcion="x")
+        filtrada = Curso.todos.filter(descripcion="y").order_by("id")[:5]
+
+        with mock.patch(
+            "gestorcursos.management.commands.auditar_explain.consultas_principales",
+            return_value=[("listar", "por descripción", filtrada)],
+        ), self.assertRaises(CommandError):
+            call_command("auditar_explain", "--filas-minimas=0", stdout=io.StringIO())
+
+    def test_scan_postgresql_y_mysql(self):
+        plan = "Limit  (cost=0.00..1.51 rows=51)\n  ->  Seq Scan on gestorcursos_curso"
+        self.assertEqual(tablas_recorridas(plan, "postgresql"), {"gestorcursos_curso"})
+
+        plan = (
+            "1 SIMPLE gestorusers_estudiante None ALL None None None None 5000 10.0 Using where\n"
+            "1 SIMPLE auth_user None eq_ref PRIMARY PRIMARY 4 x.user_id 1 100.0 None"
+        )
+        self.assertEqual(tablas_recorridas(plan, "mysql"), {"gestorusers_estudiante"})
+
+    def test_base_vacia(self):
+        with self.assertRaises(CommandError):
+            call_command("auditar_explain", stdout=io.StringIO())
+
+    def test_consultas_principales_usan_indices(self):
+        user = User.objects.create_user("auditar@chucky.cl", password="x")
+        Estudiante.objects.create(user=user, rut="1-9", nivel="1° Medio")
+        Curso.objects.create(nombre="Álgebra", nivel="1° Medio")
+
+        salida = io.StringIO()
+        call_command("auditar_explain", "--filas-minimas=0", stdout=salida)
+        self.assertIn("Ninguna consulta", salida.getvalue())
+
+
+# =============================================================
+#                  API JSON (gestorcursos/api.py)
+# =============================================================
+
+class APITests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [
+            Curso.objects.create(nombre=f"Curso {i}", nivel="1° Medio" if i % 2 else "2° Medio")
+            for i in range(6)
+        ]
+        Asignatura.objects.create(nombre="Óptica", curso=cls.cursos[0])
+        cls.estudiantes = []
+        for n in range(12):
+            user = _usuario(f"api{n}@chucky.cl", "estudiante")
+            estudiante = Estudiante.objects.create(user=user, rut=f"{n}-K", nivel="1° Medio")
+            for curso in cls.cursos[:3]:
+                Inscripcion.objects.create(estudiante=estudiante, curso=curso)
+            cls.estudiantes.append(estudiante)
+        cls.admin = _usuario("api-admin@chucky.cl", "administrador")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def pedir(self, url, **extra):
+        response = self.client.get(url, **extra)
+        contenido = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, json.loads(contenido) if contenido else None
+
+    def test_solo_administradores(self):
+        self.client.logout()
+        self.assertEqual(self.client.get("/api/v1/cursos/").status_code, 401)
+
+        self.client.force_login(self.estudiantes[0].user)
+        response, datos = self.pedir("/api/v1/cursos/")
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("error", datos)
+
+    def test_campos_y_filtros(self):
+        _, datos = self.pedir("/api/v1/cursos/?nivel=1° Medio&campos=nombre")
+        self.assertEqual(
+            datos["resultados"],
+            [{"id": c.id, "nombre": c.nombre} for c in self.cursos if c.nivel == "1° Medio"],
+        )
+
+        _, datos = self.pedir(f"/api/v1/inscripciones/?curso={self.cursos[0].id}&campos=estudiante_rut")
+        self.assertEqual(len(datos["resultados"]), 12)
+        self.assertEqual(set(datos["resultados"][0]), {"id", "estudiante_rut"})
+
+        response, _ = self.pedir("/api/v1/cursos/?campos=nombre,clave")
+        self.assertEqual(response.status_code, 400)
+        response, _ = self.pedir("/api/v1/asignaturas/?curso=uno")
+        self.assertEqual(response.status_code, 400)
+
+    def test_detalle(self):
+        response, datos = self.pedir(f"/api/v1/estudiantes/{self.estudiantes[0].id}/?campos=rut,correo")
+        self.assertEqual(datos, {"id": self.estudiantes[0].id, "rut": "0-K", "correo": "api0@chucky.cl"})
+        response, _ = self.pedir("/api/v1/cursos/999999/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_recorre_todo_sin_repetir(self):
+        ids = []
+        url = "/api/v1/inscripciones/?por_pagina=5&campos=id"
+        while url:
+            _, datos = self.pedir(url)
+            ids += [fila["id"] for fila in datos["resultados"]]
+            url = datos["siguiente"] and "/api/v1/inscripciones/" + datos["siguiente"]
+        self.assertEqual(sorted(ids, reverse=True), list(
+            Inscripcion.objects.order_by("-id").values_list("id", flat=True)
+        ))
+
+    def test_etag(self):
+        response, _ = self.pedir("/api/v1/cursos/")
+        etag = response["ETag"]
+        self.assertEqual(self.client.get("/api/v1/cursos/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.cursos[0].nombre = "Álgebra"
+        self.cursos[0].save()
+        response, datos = self.pedir("/api/v1/cursos/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(datos["resultados"][0]["nombre"], "Álgebra")
+
+    def test_paginas_grandes_en_streaming(self):
+        response, datos = self.pedir("/api/v1/inscripciones/?por_pagina=10")
+        self.assertFalse(response.streaming)
+
+        with mock.patch.object(api, "STREAMING_DESDE", 5):
+            response, datos_streaming = self.pedir("/api/v1/inscripciones/?por_pagina=10")
+        self.assertTrue(response.streaming)
+        self.assertEqual(datos_streaming, datos)
+
+    def test_consultas_no_dependen_del_tamano_de_pagina(self):
+        for url in (
+            "/api/v1/cursos/", "/api/v1/asignaturas/", "/api/v1/estudiantes/",
+            "/api/v1/inscripciones/?campos=curso_nombre,estudiante_rut",
+            f"/api/v1/cursos/{self.cursos[0].id}/",
+        ):
+            with self.subTest(url):
+                with consultas.medir() as medicion:
+                    response, _ = self.pedir(url + ("&" if "?" in url else "?") + "por_pagina=200")
+                self.assertEqual(response.status_code, 200)
+                # Sesión + usuario + la página
+                self.assertLessEqual(medicion.consultas, 3)
+
+
+# =============================================================
+#        ARCHIVADO DE PERIODOS CERRADOS (archivado.py)
+# =============================================================
+
+class ArchivadoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [Curso.objects.create(nombre=f"Curso {i}", nivel="3° Medio") for i in range(2)]
+        cls.estudiantes = []
+        for n in range(6):
+            estudiante = Estudiante.objects.create(user=_usuario(f"archivo{n}@chucky.cl", "estudiante"), rut=f"{n}-A")
+            for curso in cls.cursos:
+                Inscripcion.objects.create(estudiante=estudiante, curso=curso)
+            cls.estudiantes.append(estudiante)
+
+        # Cuatro inscripciones al primer curso son del primer semestre de 2024
+        cls.periodo = Periodo.objects.create(nombre="2024-1", inicio=date(2024, 3, 1), fin=date(2024, 7, 31), cerrado=True)
+        Periodo.objects.create(nombre="2026-2", inicio=date(2026, 8, 1), fin=date(2026, 12, 31))
+        Inscripcion.objects.filter(curso=cls.cursos[0], estudiante__in=cls.estudiantes[:4]).update(
+            fecha_inscripcion=timezone.make_aware(datetime(2024, 4, 10, 9, 30))
+        )
+        # update() no dispara señales: reportes con las fechas nuevas
+        rollups.reconstruir()
+
+    def setUp(self):
+        cache.clear()
+
+    def reportes(self):
+        return (
+            sorted(ReporteCurso.objects.values_list("curso_id", "total_inscripciones")),
+            sorted(ReporteNivel.objects.values_list("nivel", "total_inscripciones")),
+            sorted(ReporteDia.objects.values_list("fecha", "total_inscripciones")),
+        )
+
+    def test_mueve_por_lotes(self):
+        antes = self.reportes()
+        ids = set(archivado.pendientes(self.periodo).values_list("id", flat=True))
+        self.assertEqual(panel.resumen(self.estudiantes[0].id)["total_cursos"], 2)
+
+        self.assertEqual(archivado.archivar(self.periodo, lote=3), 4)
+
+        self.assertEqual(set(InscripcionHistorica.objects.filter(periodo=self.periodo).values_list("id", flat=True)), ids)
+        self.assertFalse(Inscripcion.objects.filter(id__in=ids).exists())
+        self.assertEqual(Inscripcion.objects.count(), 8)
+        self.cursos[0].refresh_from_db()
+        self.assertEqual(self.cursos[0].total_inscritos, 2)
+        self.assertEqual(panel.resumen(self.estudiantes[0].id)["total_cursos"], 1)
+        self.periodo.refresh_from_db()
+        self.assertIsNotNone(self.periodo.archivado)
+
+        # Los reportes no cambian y cuadran con un recálculo que une el historial
+        self.assertEqual(self.reportes(), antes)
+        rollups.reconstruir()
+        self.assertEqual(self.reportes(), antes)
+
+        # En un periodo nuevo se puede volver a tomar el curso
+        self.assertIs(Inscripcion.objects.inscribir(self.estudiantes[0].id, self.cursos[0].id), True)
+
+    def test_se_puede_cortar_y_seguir(self):
+        copiar = archivado._copiar
+        llamadas = []
+
+        def corte_en_el_segundo_lote(*args):
+            llamadas.append(args)
+            if len(llamadas) == 2:
+                raise RuntimeError("conexión perdida")
+            return copiar(*args)
+
+        with mock.patch.object(archivado, "_copiar", corte_en_el_segundo_lote):
+            with self.assertRaises(RuntimeError):
+                archivado.archivar(self.periodo, lote=2)
+
+        # El primer lote quedó movido entero; el segundo, intacto
+        self.assertEqual(InscripcionHistorica.objects.count(), 2)
+        self.assertEqual(Inscripcion.objects.count() + InscripcionHistorica.objects.count(), 12)
+        self.periodo.refresh_from_db()
+        self.assertIsNone(self.periodo.archivado)
+
+        self.assertEqual(archivado.archivar(self.periodo, lote=2), 2)
+        self.assertEqual(InscripcionHistorica.objects.count(), 4)
+
+    def test_lote_incompleto_se_deshace_y_se_relee(self):
+        # Otro proceso borró una fila del lote entre el SELECT y el DELETE
+        borrar = archivado._borrar
+        intentos = []
+
+        def borra_de_menos(cursor, ids):
+            intentos.append(ids)
+            return len(ids) - 1 if len(intentos) == 1 else borrar(cursor, ids)
+
+        with mock.patch.object(archivado, "_borrar", borra_de_menos):
+            self.assertEqual(archivado.archivar(self.periodo), 4)
+
+        self.assertEqual(intentos[0], intentos[1])
+        self.assertEqual(InscripcionHistorica.objects.count(), 4)
+        self.assertEqual(Inscripcion.objects.count(), 8)
+
+    def test_solo_periodos_terminados(self):
+        en_curso = Periodo(nombre="2026", inicio=date(2026, 3, 1), fin=timezone.localdate(), cerrado=True)
+        with self.assertRaises(ValidationError):
+            en_curso.full_clean()
+        en_curso.save()
+
+        with self.assertRaises(ValueError):
+            archivado.archivar(en_curso)
+        with self.assertRaises(CommandError):
+            call_command("archivar_inscripciones", "2026", stdout=io.StringIO())
+        call_command("archivar_inscripciones", stdout=io.StringIO())
+        self.assertFalse(InscripcionHistorica.objects.filter(periodo=en_curso).exists())
+
+    def test_comando(self):
+        salida = io.StringIO()
+        call_command("archivar_inscripciones", "--simular", stdout=salida)
+        self.assertIn("2024-1: 4 inscripciones por archivar", salida.getvalue())
+        self.assertFalse(InscripcionHistorica.objects.exists())
+
+        with self.assertRaises(CommandError):
+            call_command("archivar_inscripciones", "2026-2", stdout=io.StringIO())
+
+        call_command("archivar_inscripciones", "--lote=3", stdout=io.StringIO())
+        self.assertEqual(InscripcionHistorica.objects.count(), 4)
+
+        salida = io.StringIO()
+        call_command("archivar_inscripciones", stdout=salida)
+        self.assertIn("No hay periodos por archivar", salida.getvalue())
+
+    def test_exportar_con_historial(self):
+        archivado.archivar(self.periodo)
+        self.client.force_login(_usuario("archivo-admin@chucky.cl", "administrador"))
+        url = reverse("admin_exportar_inscripciones")
+
+        lineas = b"".join(self.client.get(url).streaming_content).decode().splitlines()
+        self.assertEqual(len(lineas), 1 + 8)
+
+        lineas = b"".join(self.client.get(url + "?historial=1").streaming_content).decode().splitlines()
+        self.assertEqual(len(lineas), 1 + 12)
+        self.assertTrue(lineas[0].endswith("Periodo"))
+        self.assertEqual(sum(linea.endswith(",2024-1") for linea in lineas), 4)
+
+
+# =============================================================
+#        BÚSQUEDA DE TEXTO COMPLETO (gestorcursos/busqueda.py)
+# =============================================================
+
+class BusquedaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quimica = Curso.objects.create(nombre="Química Orgánica", nivel="3° Medio")
+        cls.laboratorio = Curso.objects.create(
+            nombre="Laboratorio", descripcion="Prácticas de química general", nivel="3° Medio"
+        )
+        cls.historia = Curso.objects.create(nombre="Historia", descripcion="Revolución industrial")
+        cls.enlaces = Asignatura.objects.create(nombre="Enlaces químicos", curso=cls.quimica)
+
+    def test_sin_acentos_ni_mayusculas(self):
+        for texto in ("quimica", "QUÍMICA", "Quimica organica", "quím"):
+            with self.subTest(texto=texto):
+                self.assertEqual(busqueda.buscar(texto)[0], self.quimica.id)
+        self.assertEqual(busqueda.buscar("ENLACES QUIMICOS", busqueda.ASIGNATURA), [self.enlaces.id])
+        self.assertEqual(busqueda.buscar("revolucion"), [self.historia.id])
+        self.assertEqual(busqueda.buscar("geometría"), [])
+        self.assertEqual(busqueda.buscar("  ¿? "), [])
+
+    def test_el_nombre_pesa_mas_que_la_descripcion(self):
+        # Ambos dicen "química": primero el que la tiene en el nombre
+        self.assertEqual(busqueda.buscar("química"), [self.quimica.id, self.laboratorio.id])
+
+        self.laboratorio.nombre = "Química de laboratorio"
+        self.laboratorio.descripcion = ""
+        self.laboratorio.save()
+        self.quimica.nombre = "Orgánica"
+        self.quimica.save()
+        self.assertEqual(busqueda.buscar("química"), [self.laboratorio.id])
+
+    def test_renombrar_actualiza_el_indice(self):
+        self.quimica.nombre = "Biología"
+        self.quimica.save()
+        self.assertNotIn(self.quimica.id, busqueda.buscar("orgánica"))
+        self.assertEqual(busqueda.buscar("biologia"), [self.quimica.id])
+
+        self.enlaces.nombre = "Reacciones"
+        self.enlaces.save()
+        self.assertEqual(busqueda.buscar("enlaces", busqueda.ASIGNATURA), [])
+        self.assertEqual(busqueda.buscar("reacciones", busqueda.ASIGNATURA), [self.enlaces.id])
+
+    def test_borrar_quita_del_indice(self):
+        self.enlaces.delete()
+        self.assertEqual(busqueda.buscar("enlaces", busqueda.ASIGNATURA), [])
+
+        Asignatura.objects.create(nombre="Estequiometría", curso=self.quimica)
+        self.quimica.delete()
+        self.assertEqual(busqueda.buscar("orgánica"), [])
+        self.assertEqual(busqueda.buscar("estequiometria", busqueda.ASIGNATURA), [])
+
+    def test_curso_en_eliminacion_no_aparece(self):
+        eliminacion.encolar_curso(self.quimica)
+
+        self.assertEqual(busqueda.buscar("química"), [self.laboratorio.id])
+        self.assertEqual(busqueda.buscar("enlaces", busqueda.ASIGNATURA), [])
+
+        # Tampoco vuelve al reconstruir el índice completo
+        busqueda.reconstruir()
+        self.assertEqual(busqueda.buscar("química"), [self.laboratorio.id])
+        self.assertEqual(busqueda.buscar("enlaces", busqueda.ASIGNATURA), [])
+
+    def test_reconstruir_da_lo_mismo_que_las_senales(self):
+        consultas = ["química", "laboratorio", "historia", "medio"]
+        antes = [busqueda.buscar(texto) for texto in consultas]
+        busqueda.reconstruir()
+        self.assertEqual([busqueda.buscar(texto) for texto in consultas], antes)
+
+
+# =============================================================
+#       GET CONDICIONAL (gestorcursos/condicional.py) — 304
+# =============================================================
+
+class GetCondicionalTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.curso = Curso.objects.create(nombre="Geometría", nivel="1° Medio")
+        cls.asignatura = Asignatura.objects.create(nombre="Triángulos", curso=cls.curso)
+        cls.user = _usuario("condicional@chucky.cl", "estudiante")
+        cls.estudiante = Estudiante.objects.create(user=cls.user, rut="7-C")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def pedir(self, url, **cabeceras):
+        return self.client.get(url, headers=cabeceras)
+
+    def test_304_con_if_none_match_y_if_modified_since(self):
+        for url in (reverse("listar_cursos"), reverse("ver_curso", args=[self.curso.id])):
+            with self.subTest(url=url):
+                response = self.pedir(url)
+                self.assertEqual(response.status_code, 200)
+                etag, modificado = response["ETag"], response["Last-Modified"]
+
+                self.assertEqual(self.pedir(url, if_none_match=etag).status_code, 304)
+                self.assertEqual(self.pedir(url, if_modified_since=modificado).status_code, 304)
+                self.assertEqual(self.pedir(url, if_none_match='"otro"').status_code, 200)
+                self.assertEqual(
+                    self.pedir(url, if_modified_since="Mon, 01 Jan 2001 00:00:00 GMT").status_code, 200
+                )
+
+    def test_etag_cambia_al_editar_curso_o_asignatura(self):
+        urls_ = (reverse("listar_cursos"), reverse("ver_curso", args=[self.curso.id]))
+        etags = {url: self.pedir(url)["ETag"] for url in urls_}
+
+        self.curso.descripcion = "Ángulos y áreas"
+        self.curso.save()
+        for url in urls_:
+            with self.subTest("curso", url=url):
+                response = self.pedir(url, if_none_match=etags[url])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etags[url])
+                etags[url] = response["ETag"]
+
+        self.asignatura.nombre = "Polígonos"
+        self.asignatura.save()
+        response = self.pedir(urls_[1], if_none_match=etags[urls_[1]])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Polígonos")
+
+        # Una asignatura borrada tampoco deja el detalle viejo
+        etag = response["ETag"]
+        self.asignatura.delete()
+        response = self.pedir(urls_[1], if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Polígonos")
+
+    def test_etag_cambia_al_inscribirse(self):
+        url = reverse("ver_curso", args=[self.curso.id])
+        etag = self.pedir(url)["ETag"]
+        Inscripcion.objects.create(estudiante=self.estudiante, curso=self.curso)
+        self.assertEqual(self.pedir(url, if_none_match=etag).status_code, 200)
+
+    def test_sin_304_con_mensajes_pendientes(self):
+        urls_ = (reverse("listar_cursos"), reverse("ver_curso", args=[self.curso.id]))
+        etags = {url: self.pedir(url)["ETag"] for url in urls_}
+
+        # Un estudiante en una página de administración: queda un mensaje
+        self.client.get(reverse("admin_inscripciones"))
+        for url in urls_:
+            with self.subTest(url=url):
+                response = self.pedir(url, if_none_match=etags[url])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("ETag", response)
+
+        # Ya mostrado (mis_cursos muestra los mensajes), vuelve el 304
+        self.assertContains(self.client.get(reverse("mis_cursos")), "No tiene permisos")
+        for url in urls_:
+            with self.subTest("mostrado", url=url):
+                self.assertEqual(self.pedir(url, if_none_match=etags[url]).status_code, 304)
+
+
+# =============================================================
+#        INSCRIPCIÓN MASIVA POR COHORTE (cohortes.py)
+# =============================================================
+
+class CohortesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [Curso.objects.create(nombre=f"Cohorte {i}", nivel="4° Medio") for i in range(3)]
+        cls.estudiantes = [
+            Estudiante.objects.create(
+                user=User.objects.create(username=f"cohorte{n}@chucky.cl"), rut=f"{n}-C",
+                nivel="4° Medio" if n < 4 else "3° Medio",
+            )
+            for n in range(6)
+        ]
+
+    def reportes(self):
+        return (
+            sorted(ReporteCurso.objects.exclude(total_inscripciones=0).values_list("curso_id", "total_inscripciones")),
+            sorted(ReporteNivel.objects.exclude(total_inscripciones=0).values_list("nivel", "total_inscripciones")),
+            sorted(ReporteDia.objects.exclude(total_inscripciones=0).values_list("fecha", "total_inscripciones")),
+        )
+
+    def test_leer_ruts(self):
+        casos = {
+            # CSV con encabezado: solo la columna "rut", sin filas vacías
+            "nombre;RUT;nivel\nAna;1-C;4° Medio\n\nLuis; 2-C ;4° Medio\nSolo\n": ["1-C", "2-C"],
+            "rut,nombre\r\n1-C,Ana\r\n3-C,Eva\r\n": ["1-C", "3-C"],
+            "nombre\trut\nAna\t1-C\n": ["1-C"],
+            # Pegado a mano: uno por línea o separados por coma / punto y coma
+            "rut\n1-C\n2-C\n": ["1-C", "2-C"],
+            " 1-C, 2-C;3-C\n\n4-C ": ["1-C", "2-C", "3-C", "4-C"],
+            "": [],
+        }
+        for contenido, esperados in casos.items():
+            with self.subTest(contenido=contenido):
+                self.assertEqual(cohortes.leer_ruts(contenido), esperados)
+
+        # Archivo subido: UTF-8 con BOM (Excel) o latin-1
+        self.assertEqual(cohortes.leer_ruts("\ufeffRut;Nombre\n1-C;Ñuñoa\n".encode("utf-8")), ["1-C"])
+        self.assertEqual(cohortes.leer_ruts("nombre;rut\nÑuñoa;2-C\n".encode("latin-1")), ["2-C"])
+
+    def test_seleccionar(self):
+        ids = [e.id for e in self.estudiantes]
+        self.assertEqual(cohortes.seleccionar(nivel="4° Medio"), (ids[:4], []))
+        self.assertEqual(cohortes.seleccionar(nivel="1° Medio"), ([], []))
+
+        # RUTs repetidos cuentan una vez; los desconocidos, en el orden recibido
+        encontrados, faltantes = cohortes.seleccionar(ruts=["5-C", "9-X", "1-C", "5-C", "0-C", "8-X"])
+        self.assertEqual(encontrados, sorted([ids[5], ids[1], ids[0]]))
+        self.assertEqual(faltantes, ["9-X", "8-X"])
+
+    def test_simular_no_escribe_y_coincide_con_inscribir(self):
+        estudiante_ids = [e.id for e in self.estudiantes[:4]]
+        curso_ids = [c.id for c in self.cursos]
+        Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.cursos[0])
+        Inscripcion.objects.create(estudiante=self.estudiantes[1], curso=self.cursos[2])
+        Inscripcion.objects.create(estudiante=self.estudiantes[5], curso=self.cursos[2])  # fuera de la cohorte
+
+        with CaptureQueriesContext(connection) as ctx:
+            simulado = cohortes.simular(estudiante_ids, curso_ids)
+        # Un solo SELECT COUNT (un lote)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertTrue(ctx.captured_queries[0]["sql"].startswith("SELECT COUNT"))
+        self.assertEqual(simulado, {"estudiantes": 4, "cursos": 3, "pares": 12, "nuevas": 10, "ya_inscritas": 2})
+        self.assertEqual(Inscripcion.objects.count(), 3)
+        self.assertEqual(cohortes.simular(estudiante_ids, [])["nuevas"], 0)
+
+        self.assertEqual(cohortes.inscribir(estudiante_ids, curso_ids), simulado)
+        self.assertEqual(cohortes.simular(estudiante_ids, curso_ids)["nuevas"], 0)
+
+    def test_inscribir_no_cuenta_dos_veces_las_de_otra_peticion(self):
+        estudiante_ids = [e.id for e in self.estudiantes[:4]]
+        curso_ids = [c.id for c in self.cursos[:2]]
+        lotes = cohortes._lotes
+
+        def otra_peticion_entre_lotes(ids, tamano=2):
+            for i, lote in enumerate(lotes(ids, tamano)):
+                if i == 1:
+                    # Inscripción normal (con señales) mientras corre la cohorte
+                    Inscripcion.objects.create(estudiante=self.estudiantes[5], curso=self.cursos[0])
+                yield lote
+
+        with self.captureOnCommitCallbacks(execute=True), \
+                mock.patch.object(cohortes, "_lotes", otra_peticion_entre_lotes):
+            resultado = cohortes.inscribir(estudiante_ids, curso_ids, batch_size=3)
+
+        self.assertEqual(resultado["nuevas"], 8)
+        self.assertEqual(
+            sorted(Curso.objects.filter(pk__in=curso_ids).values_list("total_inscritos", flat=True)), [4, 5],
+        )
+        incrementales = self.reportes()
+        self.assertEqual(dict(incrementales[0]), {self.cursos[0].id: 5, self.cursos[1].id: 4})
+        rollups.reconstruir()
+        self.assertEqual(incrementales, self.reportes())
+
+        # Repetirla no inscribe ni suma nada
+        self.assertEqual(cohortes.inscribir(estudiante_ids, curso_ids)["nuevas"], 0)
+        self.assertEqual(self.reportes(), incrementales)
+
+
+# =============================================================
+#     CONTADOR Curso.total_inscritos y recount_inscripciones
+# =============================================================
+
+class ContadorInscritosTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [Curso.objects.create(nombre=f"Contador {i}") for i in range(3)]
+        cls.estudiantes = [
+            Estudiante.objects.create(user=User.objects.create(username=f"contador{n}@chucky.cl"), rut=f"{n}-N")
+            for n in range(3)
+        ]
+        for estudiante in cls.estudiantes:
+            for curso in cls.cursos[:2]:
+                Inscripcion.objects.create(estudiante=estudiante, curso=curso)
+
+    def totales(self):
+        return list(Curso.objects.order_by("pk").values_list("total_inscritos", flat=True))
+
+    def test_recount_repara_el_contador(self):
+        self.assertEqual(self.totales(), [3, 3, 0])
+
+        # update() no dispara señales: contadores rotos a propósito
+        Curso.objects.filter(pk=self.cursos[0].pk).update(total_inscritos=99)
+        Curso.objects.filter(pk=self.cursos[2].pk).update(total_inscritos=7)
+
+        salida = io.StringIO()
+        call_command("recount_inscripciones", batch_size=2, stdout=salida)
+        self.assertEqual(self.totales(), [3, 3, 0])
+        self.assertIn("Cursos revisados: 3 — contadores corregidos: 2.", salida.getvalue())
+
+        # Sin nada desfasado no corrige (ni escribe) nada
+        salida = io.StringIO()
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("recount_inscripciones", stdout=salida)
+        self.assertIn("contadores corregidos: 0.", salida.getvalue())
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")])
+
+    def test_borrado_en_cascada_descuenta(self):
+        # Estudiante → sus inscripciones (post_delete por cada una)
+        self.estudiantes[0].delete()
+        self.assertEqual(self.totales(), [2, 2, 0])
+
+        # User → Estudiante → inscripciones
+        User.objects.filter(pk=self.estudiantes[1].user_id).delete()
+        self.assertEqual(self.totales(), [1, 1, 0])
+
+        Inscripcion.objects.filter(curso=self.cursos[0]).get().delete()
+        self.assertEqual(self.totales(), [0, 1, 0])
+
+    def test_nunca_baja_de_cero(self):
+        Curso.objects.filter(pk=self.cursos[0].pk).update(total_inscritos=0)
+        Inscripcion.objects.filter(curso=self.cursos[0]).delete()
+        self.assertEqual(self.totales(), [0, 3, 0])
+
+
+# =============================================================
+#     VISTAS ASYNC (VISTAS_ASYNC) — mismo resultado que las síncronas
+# =============================================================
+
+def _urlconf(vistas_async):
+    """
+    URLconf del proyecto con una copia de gestorcursos.urls cargada con
+    VISTAS_ASYNC fijo (el módulo real elige las vistas al importarse).
+    """
+    with override_settings(VISTAS_ASYNC=vistas_async):
+        spec = importlib.util.find_spec("gestorcursos.urls")
+        cursos = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(cursos)
+    raiz = importlib.import_module(settings.ROOT_URLCONF)
+    urlconf = types.ModuleType(f"urls_vistas_async_{int(vistas_async)}")
+    urlconf.urlpatterns = [path("cursos/", include(cursos)), *raiz.urlpatterns]
+    return urlconf
+
+
+class VistasAsyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [Curso.objects.create(nombre=f"Async {i}", nivel="1° Medio") for i in range(3)]
+        cls.estudiante = Estudiante.objects.create(user=_usuario("async@chucky.cl", "estudiante"), rut="1-Y")
+        for curso in cls.cursos[:2]:
+            Inscripcion.objects.create(estudiante=cls.estudiante, curso=curso)
+        # Otro estudiante en el tercer curso: no debe aparecer como inscrito
+        otro = Estudiante.objects.create(user=User.objects.create(username="otro-async@chucky.cl"), rut="2-Y")
+        Inscripcion.objects.create(estudiante=otro, curso=cls.cursos[2])
+        cls.docente = _usuario("docente-async@chucky.cl", "docente")
+
+    def setUp(self):
+        self.urls = {False: _urlconf(False), True: _urlconf(True)}
+
+    def test_el_switch_elige_la_version_async(self):
+        for vistas_async, (ver, mis) in {
+            False: (views.ver_curso, views.mis_cursos),
+            True: (views.ver_curso_async, views.mis_cursos_async),
+        }.items():
+            with self.subTest(vistas_async=vistas_async):
+                urlconf = self.urls[vistas_async]
+                self.assertIs(resolve(f"/cursos/ver/{self.cursos[0].id}/", urlconf).func, ver)
+                self.assertIs(resolve("/cursos/mis-cursos/", urlconf).func, mis)
+
+    async def pedir(self, vistas_async, user, url):
+        cliente = self.async_client_class() if vistas_async else self.client_class()
+        with self.settings(ROOT_URLCONF=self.urls[vistas_async]):
+            if vistas_async:
+                await cliente.aforce_login(user)
+                response = await cliente.get(url)
+            else:
+                await sync_to_async(cliente.force_login)(user)
+                response = await sync_to_async(cliente.get)(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    async def test_mismo_resultado_que_las_sincronas(self):
+        for user in (self.estudiante.user, self.docente):
+            for curso in self.cursos:
+                with self.subTest(user=user.username, curso=curso.nombre):
+                    url = f"/cursos/ver/{curso.id}/"
+                    sincrona = await self.pedir(False, user, url)
+                    asincrona = await self.pedir(True, user, url)
+                    self.assertEqual(asincrona.context["inscrito"], sincrona.context["inscrito"])
+                    self.assertEqual(
+                        asincrona.context["inscrito"], user == self.estudiante.user and curso != self.cursos[2],
+                    )
+
+            with self.subTest(user=user.username, vista="mis_cursos"):
+                sincrona = await self.pedir(False, user, "/cursos/mis-cursos/?q=Async")
+                asincrona = await self.pedir(True, user, "/cursos/mis-cursos/?q=Async")
+                self.assertEqual(asincrona.context["cursos_inscritos_ids"], sincrona.context["cursos_inscritos_ids"])
+                self.assertEqual(
+                    [c["id"] for c in asincrona.context["cursos"]], [c["id"] for c in sincrona.context["cursos"]],
+                )
+                esperados = {c.id for c in self.cursos[:2]} if user == self.estudiante.user else set()
+                self.assertEqual(asincrona.context["cursos_inscritos_ids"], esperados)
+
+    async def test_async_sin_consultar_el_estudiante(self):
+        # El estudiante sale de la sesión: ninguna consulta a Estudiante ni User
+        await self.async_client.aforce_login(self.estudiante.user)
+        with self.settings(ROOT_URLCONF=self.urls[True]):
+            await self.async_client.get("/cursos/mis-cursos/")  # resuelve el rol en sesión
+            with consultas.medir() as medicion:
+                response = await self.async_client.get(f"/cursos/ver/{self.cursos[0].id}/")
+        self.assertTrue(response.context["inscrito"])
+        self.assertTrue(medicion.consultas)
+        self.assertFalse([sql for sql in medicion.formas if "gestorusers_estudiante" in sql])
+
+
+# =============================================================
+#     ESCUELA SINTÉTICA (generar_escuela) y prueba_carga
+# =============================================================
+
+ESCUELA_CHICA = {
+    "estudiantes": 12, "docentes": 2, "administradores": 1,
+    "cursos": 5, "asignaturas": 2, "inscripciones": 20,
+}
+
+
+def _generar(semilla=7, **opciones):
+    salida = io.StringIO()
+    call_command("generar_escuela", semilla=semilla, stdout=salida, **{**ESCUELA_CHICA, **opciones})
+    return salida.getvalue()
+
+
+def _foto_escuela():
+    """La escuela por claves naturales (los id cambian entre corridas)."""
+    return {
+        "usuarios": sorted(User.objects.values_list("username", "first_name", "last_name", "perfilusuario__rol")),
+        "estudiantes": sorted(Estudiante.objects.values_list("user__username", "rut", "nivel")),
+        "cursos": sorted(Curso.objects.values_list("nombre", "descripcion", "nivel", "total_inscritos")),
+        "asignaturas": sorted(Asignatura.objects.values_list("curso__nombre", "nombre", "descripcion")),
+        "inscripciones": sorted(Inscripcion.objects.values_list("estudiante__user__username", "curso__nombre")),
+        "reportes": sorted(ReporteCurso.objects.values_list("curso__nombre", "total_inscripciones")),
+    }
+
+
+class GenerarEscuelaTests(TestCase):
+
+    def test_misma_semilla_mismos_datos(self):
+        _generar()
+        primera = _foto_escuela()
+
+        Curso.objects.all().delete()
+        User.objects.all().delete()
+        _generar()
+        self.assertEqual(_foto_escuela(), primera)
+
+        self.assertEqual(len(primera["usuarios"]), 15)
+        self.assertEqual(len(primera["estudiantes"]), 12)
+        self.assertEqual(len(primera["cursos"]), 5)
+        self.assertEqual(len(primera["asignaturas"]), 10)
+        self.assertEqual(len(primera["inscripciones"]), 20)
+        self.assertEqual(sum(c[3] for c in primera["cursos"]), 20)
+
+        # Otra semilla, otra escuela
+        Curso.objects.all().delete()
+        User.objects.all().delete()
+        _generar(semilla=8)
+        self.assertNotEqual(_foto_escuela()["inscripciones"], primera["inscripciones"])
+
+    def test_no_pisa_una_base_con_datos(self):
+        _generar()
+        with self.assertRaises(CommandError):
+            _generar()
+        with self.assertRaises(CommandError):
+            _generar(inscripciones=12 * 5 + 1, forzar=True)
+
+    def test_forzar_no_repite_ruts(self):
+        # RUTs reales, con y sin puntos, por encima de donde empieza el generador
+        for n, rut in enumerate(("10.000.001-9", _rut(10_000_002), "20.555.123-K", "7-P")):
+            Estudiante.objects.create(user=User.objects.create(username=f"real{n}@chucky.cl"), rut=rut)
+
+        _generar(forzar=True)
+        _generar(forzar=True)
+
+        ruts = list(Estudiante.objects.values_list("rut", flat=True))
+        self.assertEqual(len(ruts), 4 + 24)
+        self.assertEqual(len(set(ruts)), len(ruts))
+        self.assertIn(_rut(20_555_124), ruts)
+
+
+class PruebaCargaTests(TransactionTestCase):
+    """prueba_carga usa hilos con su propia conexión: base en archivo."""
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            base = _sqlite_en_archivo(connection)
+            base.__enter__()
+            cls.addClassCleanup(base.__exit__, None, None, None)
+        super().setUpClass()
+
+    def test_sin_escuela(self):
+        with self.assertRaises(CommandError):
+            call_command("prueba_carga", stdout=io.StringIO())
+
+    def test_corrida_y_comparacion(self):
+        _generar()
+        with tempfile.TemporaryDirectory() as carpeta:
+            base = os.path.join(carpeta, "base.json")
+            call_command("prueba_carga", clientes=2, peticiones=8, salida=base, stdout=io.StringIO())
+            with open(base, encoding="utf-8") as archivo:
+                resultado = json.load(archivo)
+
+            salida = io.StringIO()
+            call_command("prueba_carga", clientes=1, peticiones=4, comparar=base, stdout=salida)
+
+        self.assertEqual(resultado["total"]["errores"], 0)
+        self.assertGreaterEqual(resultado["total"]["peticiones"], 16)
+        self.assertIn("login", resultado["urls"])
+        self.assertEqual(
+            resultado["configuracion"]["clientes"], 2,
+        )
+        self.assertEqual(
+            sum(u["peticiones"] for u in resultado["urls"].values()), resultado["total"]["peticiones"],
+        )
+        self.assertIn("Comparación con la corrida del", salida.getvalue())
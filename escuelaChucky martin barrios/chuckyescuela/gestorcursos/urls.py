@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -29,6 +30,27 @@ urlpatterns = [
         name="admin_inscripciones"
     ),
 
+    # Exportar inscripciones a CSV (streaming, respeta los filtros)
+    path(
+        "admin/inscripciones/exportar/",
+        views.admin_exportar_inscripciones,
+        name="admin_exportar_inscripciones"
+    ),
+
+    # Inscripción masiva de una cohorte (nivel o lista de RUTs)
+    path(
+        "admin/inscripciones/masiva/",
+        views.admin_inscripcion_masiva,
+        name="admin_inscripcion_masiva"
+    ),
+
+    # Aciertos / fallos de la caché del catálogo (JSON)
+    path(
+        "admin/catalogo/estadisticas/",
+        views.admin_catalogo_estadisticas,
+        name="admin_catalogo_estadisticas"
+    ),
+
     # =============================================================
     #                         ASIGNATURAS (Placeholder)
     # =============================================================
@@ -37,7 +59,12 @@ urlpatterns = [
     # =============================================================
     #                 MIS CURSOS (VISTA EV3 - ESTUDIANTE)
     # =============================================================
-    path("mis-cursos/", views.mis_cursos, name="mis_cursos"),
+    # Con VISTAS_ASYNC (despliegue ASGI) se sirve la versión async
+    path(
+        "mis-cursos/",
+        views.mis_cursos_async if settings.VISTAS_ASYNC else views.mis_cursos,
+        name="mis_cursos"
+    ),
 
     # =============================================================
     #              ⭐ NUEVO — INSCRIBIRSE EN CURSO
@@ -53,7 +80,7 @@ urlpatterns = [
     # =============================================================
     path(
         "ver/<int:curso_id>/",
-        views.ver_curso,
+        views.ver_curso_async if settings.VISTAS_ASYNC else views.ver_curso,
         name="ver_curso"
     ),
 ]
@@ -1,9 +1,26 @@
+import asyncio
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-
-from .models import Curso, Asignatura, Inscripcion
-from gestorusers.models import Estudiante, PerfilUsuario  # Necesario para roles
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.views.decorators.vary import vary_on_cookie
+
+from chuckyescuela.db.replicas import usar_replica
+from chuckyescuela.exportacion import filas_por_lotes, respuesta_csv
+from chuckyescuela.paginacion import paginar
+from . import busqueda, catalogo, cohortes, condicional
+from .models import Curso, Asignatura, Inscripcion, InscripcionHistorica
+from gestortareas import eliminacion
+from gestorusers.decorators import role_required
+from gestorusers.models import Estudiante
 
 
 # =============================================================
@@ -11,14 +28,34 @@ from gestorusers.models import Estudiante, PerfilUsuario  # Necesario para roles
 # =============================================================
 
 @login_required
+@usar_replica
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
+@condition(etag_func=condicional.etag_listado, last_modified_func=condicional.modificado_listado)
 def listar_cursos(request):
     """
     Listado general de cursos.
     Accesible para cualquier usuario logueado (estudiante, usuario normal, admin).
+    Con ?q= se filtra por el índice de búsqueda (orden por relevancia).
+    Responde 304 si el catálogo no cambió (ver gestorcursos/condicional.py).
     """
-    cursos = Curso.objects.all()
+    q = request.GET.get("q", "").strip()
+
+    # Datos del catálogo desde la caché; el contador de inscritos se lee
+    # aparte porque cambia con cada inscripción (sin tocar la versión)
+    cursos = catalogo.cursos()
+    if q:
+        por_id = {curso["id"]: curso for curso in cursos}
+        cursos = [por_id[pk] for pk in busqueda.buscar(q) if pk in por_id]
+    contadores = catalogo.contadores_inscritos([curso["id"] for curso in cursos] if q else None)
+    cursos = [
+        dict(curso, total_inscritos=contadores.get(curso["id"], 0))
+        for curso in cursos
+    ]
+
     return render(request, "cursos/cursos_listar.html", {
-        "cursos": cursos
+        "cursos": cursos,
+        "q": q,
     })
 
 
@@ -78,13 +115,19 @@ def editar_curso(request, id):
 
 
 @login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder a esta sección.")
+@require_POST
 def eliminar_curso(request, id):
     """
-    Eliminar un curso.
+    Eliminar un curso (solo por POST: formulario con CSRF en los listados).
+    Deja de verse al instante; sus inscripciones y asignaturas las borra
+    el worker por lotes (gestortareas, python manage.py run_worker).
     """
     curso = get_object_or_404(Curso, id=id)
-    curso.delete()
-    messages.success(request, "Curso eliminado correctamente.")
+    eliminacion.encolar_curso(curso)
+    messages.success(
+        request, f"Curso «{curso.nombre}» eliminado. Sus inscripciones se borran en segundo plano."
+    )
     return redirect("admin_listar_cursos")
 
 
@@ -93,31 +136,39 @@ def eliminar_curso(request, id):
 # =============================================================
 
 @login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder a esta sección.")
 def admin_listar_cursos(request):
     """
     Listado de cursos para el panel del ADMINISTRADOR.
     Solo accesible para rol 'administrador'.
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
+    # Paginación por cursor (mismo paginador que inscripciones)
+    pagina = paginar(request, Curso.objects.all(), ("-id",))
 
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder a esta sección.")
+    # 👉 IMPORTANTE:
+    # Este template es el del MÓDULO ADMIN que está bajo
+    # gestorusers/templates/usuarios/admin/cursos_listar.html
+    return render(request, "usuarios/admin/cursos_listar.html", {
+        "cursos": pagina.object_list,
+        "pagina": pagina,
+    })
 
-        # 🔒 Redirección según rol (igual que en gestorusers.views)
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:  # docente / usuario normal
-            return redirect("panel_usuario")
 
-    cursos = Curso.objects.all().order_by("-id")
+# =============================================================
+#          ADMIN — ESTADÍSTICAS DE LA CACHÉ DEL CATÁLOGO
+# =============================================================
 
-    # 👉 IMPORTANTE:
-    # Este template es el del MÓDULO ADMIN que dijiste que está bajo
-    # gestorusers/templates/admin/cursos_listar.html  →  "admin/cursos_listar.html"
-    return render(request, "admin/cursos_listar.html", {
-        "cursos": cursos
-    })
+@login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder a esta sección.")
+def admin_catalogo_estadisticas(request):
+    """
+    Aciertos / fallos de la caché del catálogo (JSON).
+    Con ?reiniciar=1 se ponen los contadores en cero.
+    """
+    if request.GET.get("reiniciar") == "1":
+        catalogo.reiniciar_estadisticas()
+    return JsonResponse(catalogo.estadisticas())
 
 
 # =============================================================
@@ -126,10 +177,14 @@ def admin_listar_cursos(request):
 
 @login_required
 def listar_asignaturas(request):
-    asignaturas = Asignatura.objects.all()
+    q = request.GET.get("q", "").strip()
+    asignaturas = Asignatura.objects.select_related("curso")
+    if q:
+        asignaturas = busqueda.filtrar(asignaturas, q)
 
     return render(request, "cursos/asignaturas_listar.html", {
-        "asignaturas": asignaturas
+        "asignaturas": asignaturas,
+        "q": q,
     })
 
 
@@ -141,28 +196,27 @@ def listar_asignaturas(request):
 def inscribir_en_curso(request, curso_id):
     """
     Solo estudiantes se pueden inscribir en cursos.
+    Idempotente: repetir la inscripción (doble clic, reintento) da la misma
+    respuesta. El estudiante sale de la sesión (request.estudiante_id) y el
+    curso de la caché del catálogo: la única consulta es el INSERT.
     """
 
-    try:
-        estudiante = Estudiante.objects.get(user=request.user)
-    except Estudiante.DoesNotExist:
+    estudiante_id = getattr(request, "estudiante_id", None)
+    if estudiante_id is None:
         messages.error(request, "Solo los estudiantes pueden inscribirse en cursos.")
         return redirect("mis_cursos")
 
-    curso = get_object_or_404(Curso, id=curso_id)
+    detalle = catalogo.detalle_curso(curso_id)
+    if detalle is None:
+        raise Http404("Curso no encontrado.")
 
-    # Evitar inscripción duplicada
-    existe = Inscripcion.objects.filter(estudiante=estudiante, curso=curso).exists()
-    if existe:
-        messages.warning(request, "Ya estás inscrito en este curso.")
-        return redirect("mis_cursos")
-
-    Inscripcion.objects.create(
-        estudiante=estudiante,
-        curso=curso
-    )
+    try:
+        Inscripcion.objects.inscribir(estudiante_id, curso_id)
+    except Curso.DoesNotExist:
+        # Borrado justo ahora (la caché aún no se enteraba)
+        raise Http404("Curso no encontrado.")
 
-    messages.success(request, f"Te has inscrito correctamente en {curso.nombre}.")
+    messages.success(request, f"Te has inscrito correctamente en {detalle['curso']['nombre']}.")
     return redirect("mis_cursos")
 
 
@@ -171,35 +225,33 @@ def inscribir_en_curso(request, curso_id):
 # =============================================================
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
+@condition(etag_func=condicional.etag_curso, last_modified_func=condicional.modificado_curso)
 def ver_curso(request, curso_id):
     """
     Ver detalle de un curso:
     - Información del curso
     - Asignaturas relacionadas
     - Si el estudiante está inscrito o no
+    Responde 304 si nada de lo anterior cambió (ver gestorcursos/condicional.py).
     """
 
-    curso = get_object_or_404(Curso, id=curso_id)
+    # Curso + asignaturas ya renderizadas, desde la caché del catálogo
+    detalle = catalogo.detalle_curso(curso_id)
+    if detalle is None:
+        raise Http404("Curso no encontrado.")
 
-    # Cargar asignaturas relacionadas
-    asignaturas = Asignatura.objects.filter(curso=curso)
-
-    # Verificar si el usuario es estudiante
-    try:
-        estudiante = Estudiante.objects.get(user=request.user)
-    except Estudiante.DoesNotExist:
-        estudiante = None
-
-    # Verificar si está inscrito
-    inscrito = False
-    if estudiante:
-        inscrito = Inscripcion.objects.filter(
-            estudiante=estudiante, curso=curso
-        ).exists()
+    # Verificar si está inscrito (el estudiante sale de la sesión,
+    # request.estudiante_id, sin consultarlo)
+    estudiante_id = getattr(request, "estudiante_id", None)
+    inscrito = estudiante_id is not None and Inscripcion.objects.filter(
+        estudiante_id=estudiante_id, curso_id=curso_id
+    ).exists()
 
     return render(request, "cursos/ver_curso.html", {
-        "curso": curso,
-        "asignaturas": asignaturas,
+        "curso": detalle["curso"],
+        "detalle_html": detalle["html"],
         "inscrito": inscrito
     })
 
@@ -209,27 +261,34 @@ def ver_curso(request, curso_id):
 # =============================================================
 
 @login_required
+@usar_replica
 def mis_cursos(request):
     """
     Vista de cursos propia del estudiante:
     muestra en qué cursos está inscrito.
+    Lee de una réplica salvo justo después de inscribirse (ver
+    chuckyescuela/db/replicas.py): ahí lee del primario.
     """
 
-    try:
-        estudiante = Estudiante.objects.get(user=request.user)
-    except Estudiante.DoesNotExist:
-        estudiante = None
-
-    if estudiante:
-        inscripciones = Inscripcion.objects.filter(estudiante=estudiante)
+    # Estudiante desde la sesión (request.estudiante_id), sin consultarlo
+    estudiante_id = getattr(request, "estudiante_id", None)
+    if estudiante_id is not None:
+        inscripciones = Inscripcion.objects.filter(estudiante_id=estudiante_id)
     else:
         inscripciones = []
 
-    cursos = Curso.objects.all()
+    # Tarjetas del catálogo desde la caché + estado personal encima
+    q = request.GET.get("q", "").strip()
+    cursos = catalogo.lista_tarjetas(busqueda.buscar(q) if q else None)
+    cursos_inscritos_ids = (
+        set(inscripciones.values_list("curso_id", flat=True)) if estudiante_id is not None else set()
+    )
 
     return render(request, "cursos/mis_cursos.html", {
         "cursos": cursos,
         "inscripciones": inscripciones,
+        "cursos_inscritos_ids": cursos_inscritos_ids,
+        "q": q,
     })
 
 
@@ -238,31 +297,248 @@ def mis_cursos(request):
 # =============================================================
 
 @login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder a esta sección.")
+@usar_replica
 def admin_inscripciones(request):
     """
     Listado global de inscripciones (Estudiante ↔ Curso)
     Solo accesible para administradores.
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
+    # Inscripciones con sus relaciones (filtradas por GET)
+    inscripciones, filtros = _filtrar_inscripciones(
+        request,
+        Inscripcion.objects.select_related("estudiante__user", "curso"),
+    )
+
+    # Paginación por cursor sobre (fecha_inscripcion, id): la página N
+    # cuesta lo mismo que la primera (índices en Inscripcion.Meta)
+    pagina = paginar(request, inscripciones, ("-fecha_inscripcion", "-id"))
+
+    return render(request, "cursos/admin/inscripciones_listar.html", {
+        "inscripciones": pagina.object_list,
+        "pagina": pagina,
+        "filtros": filtros,
+        "cursos": Curso.objects.order_by("nombre").values("id", "nombre"),
+        # Curso.todos: solo el índice curso_nivel_nombre_idx, sin mirar
+        # "eliminando" (un nivel de más en el filtro un rato no molesta)
+        "niveles": (
+            Curso.todos.exclude(nivel__isnull=True).exclude(nivel="")
+            .order_by("nivel").values_list("nivel", flat=True).distinct()
+        ),
+    })
+
+
+@login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder a esta sección.")
+def admin_exportar_inscripciones(request):
+    """
+    Descarga CSV de las inscripciones (con los mismos filtros del listado).
+    Se envía en streaming: memoria constante sin importar la cantidad de filas.
+    Con ?historial=1 incluye también las de periodos archivados
+    (InscripcionHistorica), con el nombre del periodo en una columna más.
+    """
+
+    campos = (
+        "estudiante__user__first_name",
+        "estudiante__user__last_name",
+        "estudiante__user__email",
+        "estudiante__rut",
+        "curso__nombre",
+        "curso__nivel",
+        "fecha_inscripcion",
+    )
+    encabezados = ["Nombre", "Apellido", "Correo", "RUT", "Curso", "Nivel", "Fecha inscripción"]
+
+    inscripciones, _ = _filtrar_inscripciones(request, Inscripcion.objects.all())
+    filas = filas_por_lotes(inscripciones, campos)
+
+    if request.GET.get("historial"):
+        # Primero lo archivado y después lo vigente (sin periodo)
+        historicas, _ = _filtrar_inscripciones(request, InscripcionHistorica.objects.all())
+        filas = chain(
+            filas_por_lotes(historicas, (*campos, "periodo__nombre")),
+            ((*fila, "") for fila in filas),
+        )
+        encabezados.append("Periodo")
+
+    return respuesta_csv(
+        "inscripciones.csv",
+        encabezados,
+        (
+            (*fila[:6], timezone.localtime(fila[6]).strftime("%d/%m/%Y %H:%M"), *fila[7:])
+            for fila in filas
+        ),
+    )
+
+
+@login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder a esta sección.")
+def admin_inscripcion_masiva(request):
+    """
+    Inscribe una cohorte completa (todos los estudiantes de un nivel, o una
+    lista de RUTs) en uno o más cursos. Con "solo simular" muestra los
+    conteos sin escribir nada (ver gestorcursos/cohortes.py).
+    """
+
+    resultado = None
+    ruts_no_encontrados = []
+    seleccion = {"nivel": "", "ruts": "", "cursos": set()}
 
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder a esta sección.")
+    if request.method == "POST":
+        seleccion = {
+            "nivel": request.POST.get("nivel", "").strip(),
+            "ruts": request.POST.get("ruts", "").strip(),
+            "cursos": {c for c in request.POST.getlist("cursos") if c.isdigit()},
+        }
+        curso_ids = sorted(
+            Curso.objects.filter(pk__in=seleccion["cursos"]).values_list("id", flat=True)
+        )
+        archivo = request.FILES.get("archivo")
 
-        # 🔒 Igual que arriba: redirigir según rol
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
+        if not curso_ids:
+            messages.error(request, "Selecciona al menos un curso.")
+        elif not (archivo or seleccion["ruts"] or seleccion["nivel"]):
+            messages.error(request, "Indica un nivel o una lista de RUTs.")
         else:
-            return redirect("panel_usuario")
-
-    # Cargamos todas las inscripciones con sus relaciones
-    inscripciones = (
-        Inscripcion.objects
-        .select_related("estudiante__user", "curso")
-        .all()
-        .order_by("-id")
+            if archivo or seleccion["ruts"]:
+                contenido = archivo.read() if archivo else seleccion["ruts"]
+                estudiante_ids, ruts_no_encontrados = cohortes.seleccionar(
+                    ruts=cohortes.leer_ruts(contenido)
+                )
+            else:
+                estudiante_ids, _ = cohortes.seleccionar(nivel=seleccion["nivel"])
+
+            if request.POST.get("solo_simular"):
+                resultado = cohortes.simular(estudiante_ids, curso_ids)
+                messages.info(
+                    request,
+                    f"Simulación: se crearían {resultado['nuevas']} inscripciones "
+                    f"({resultado['ya_inscritas']} ya existen).",
+                )
+            else:
+                resultado = cohortes.inscribir(estudiante_ids, curso_ids)
+                messages.success(
+                    request,
+                    f"{resultado['nuevas']} inscripciones creadas "
+                    f"({resultado['ya_inscritas']} ya existían).",
+                )
+            if ruts_no_encontrados:
+                messages.warning(
+                    request, f"{len(ruts_no_encontrados)} RUTs no corresponden a ningún estudiante."
+                )
+
+    return render(request, "cursos/admin/inscripcion_masiva.html", {
+        "resultado": resultado,
+        "ruts_no_encontrados": ruts_no_encontrados,
+        "seleccion": seleccion,
+        "cursos": Curso.objects.order_by("nombre").values("id", "nombre", "nivel"),
+        "niveles": (
+            Estudiante.objects.exclude(nivel__isnull=True).exclude(nivel="")
+            .order_by("nivel").values_list("nivel", flat=True).distinct()
+        ),
+    })
+
+
+def _filtrar_inscripciones(request, inscripciones):
+    """Aplica los filtros GET (curso, nivel, desde, hasta) del listado de inscripciones."""
+
+    filtros = {
+        "curso": request.GET.get("curso", ""),
+        "nivel": request.GET.get("nivel", ""),
+        "desde": request.GET.get("desde", ""),
+        "hasta": request.GET.get("hasta", ""),
+    }
+
+    if filtros["curso"].isdigit():
+        inscripciones = inscripciones.filter(curso_id=filtros["curso"])
+
+    if filtros["nivel"]:
+        inscripciones = inscripciones.filter(curso__nivel=filtros["nivel"])
+
+    # Rango de fechas como [desde 00:00, hasta+1 00:00) para usar el índice
+    # sobre fecha_inscripcion (un __date haría la consulta no indexable)
+    desde = parse_date(filtros["desde"]) if filtros["desde"] else None
+    if desde:
+        inscripciones = inscripciones.filter(
+            fecha_inscripcion__gte=timezone.make_aware(datetime.combine(desde, time.min))
+        )
+
+    hasta = parse_date(filtros["hasta"]) if filtros["hasta"] else None
+    if hasta:
+        inscripciones = inscripciones.filter(
+            fecha_inscripcion__lt=timezone.make_aware(
+                datetime.combine(hasta + timedelta(days=1), time.min)
+            )
+        )
+
+    return inscripciones, filtros
+
+
+# =============================================================
+#          VERSIONES ASYNC (ASGI) — ver chuckyescuela/asgi.py
+# =============================================================
+#
+# Mismo resultado que ver_curso / mis_cursos, con el ORM async. Las
+# consultas que no dependen entre sí se piden juntas (asyncio.gather).
+# Igual que las síncronas, el estudiante sale de la sesión
+# (request.estudiante_id, PerfilUsuarioMiddleware) sin consultarlo. El
+# render va en un hilo porque las plantillas pueden tocar objetos perezosos.
+
+async def _conjunto(queryset):
+    return {valor async for valor in queryset}
+
+
+async def _inscrito(estudiante_id, curso_id):
+    if estudiante_id is None:
+        return False
+    return await Inscripcion.objects.filter(estudiante_id=estudiante_id, curso_id=curso_id).aexists()
+
+
+async def _cursos_inscritos(estudiante_id):
+    if estudiante_id is None:
+        return set()
+    return await _conjunto(
+        Inscripcion.objects.filter(estudiante_id=estudiante_id).values_list("curso_id", flat=True)
     )
 
-    return render(request, "cursos/admin/inscripciones_listar.html", {
-        "inscripciones": inscripciones
+
+def _tarjetas_catalogo(q):
+    return catalogo.lista_tarjetas(busqueda.buscar(q) if q else None)
+
+
+@login_required
+@condicional.precalcular(condicional.etag_curso)
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
+@condition(etag_func=condicional.etag_curso, last_modified_func=condicional.modificado_curso)
+async def ver_curso_async(request, curso_id):
+    detalle, inscrito = await asyncio.gather(
+        sync_to_async(catalogo.detalle_curso)(curso_id),
+        _inscrito(getattr(request, "estudiante_id", None), curso_id),
+    )
+    if detalle is None:
+        raise Http404("Curso no encontrado.")
+
+    return await sync_to_async(render)(request, "cursos/ver_curso.html", {
+        "curso": detalle["curso"],
+        "detalle_html": detalle["html"],
+        "inscrito": inscrito,
+    })
+
+
+@login_required
+@usar_replica
+async def mis_cursos_async(request):
+    q = request.GET.get("q", "").strip()
+
+    cursos, cursos_inscritos_ids = await asyncio.gather(
+        sync_to_async(_tarjetas_catalogo)(q),
+        _cursos_inscritos(getattr(request, "estudiante_id", None)),
+    )
+
+    return await sync_to_async(render)(request, "cursos/mis_cursos.html", {
+        "cursos": cursos,
+        "cursos_inscritos_ids": cursos_inscritos_ids,
+        "q": q,
     })
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import ReporteCurso, ReporteNivel, ReporteDia, ReporteRol
+
+
+# Tablas de reportes: solo lectura en el admin (se mantienen por señales)
+@admin.register(ReporteCurso, ReporteNivel, ReporteDia, ReporteRol)
+class ReporteAdmin(admin.ModelAdmin):
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
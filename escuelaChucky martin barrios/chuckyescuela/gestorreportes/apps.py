@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class GestorreportesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'gestorreportes'
+
+    def ready(self):
+        # Registra los receptores que mantienen las tablas de reportes
+        from gestorreportes import signals  # noqa: F401
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('gestorcursos', '0003_inscripcion_indices_paginacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReporteDia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(unique=True)),
+                ('total_inscripciones', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReporteEstado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ultima_reconstruccion', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReporteNivel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nivel', models.CharField(max_length=50, unique=True)),
+                ('total_inscripciones', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReporteRol',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rol', models.CharField(max_length=20, unique=True)),
+                ('total_usuarios', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReporteCurso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_inscripciones', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField()),
+                ('curso', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reporte', to='gestorcursos.curso')),
+            ],
+        ),
+    ]
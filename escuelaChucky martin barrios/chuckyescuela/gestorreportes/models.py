@@ -0,0 +1,58 @@
+from django.db import models
+from gestorcursos.models import Curso
+
+
+# =============================================================
+#        TABLAS DE REPORTES (agregados precalculados)
+# =============================================================
+#
+# Se mantienen al día de forma incremental desde gestorreportes/signals.py
+# y se pueden reconstruir completas con:
+#     python manage.py reconstruir_reportes
+# La vista admin_reportes lee SOLO de estas tablas.
+
+
+class ReporteCurso(models.Model):
+    curso = models.OneToOneField(Curso, on_delete=models.CASCADE, related_name="reporte")
+    total_inscripciones = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.curso_id}: {self.total_inscripciones}"
+
+
+class ReporteNivel(models.Model):
+    # "" = cursos sin nivel asignado
+    nivel = models.CharField(max_length=50, unique=True)
+    total_inscripciones = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.nivel or 'Sin nivel'}: {self.total_inscripciones}"
+
+
+class ReporteDia(models.Model):
+    # Día (hora local) de fecha_inscripcion
+    fecha = models.DateField(unique=True)
+    total_inscripciones = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.fecha}: {self.total_inscripciones}"
+
+
+class ReporteRol(models.Model):
+    rol = models.CharField(max_length=20, unique=True)
+    total_usuarios = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.rol}: {self.total_usuarios}"
+
+
+class ReporteEstado(models.Model):
+    """Fila única (id=1) con la fecha de la última reconstrucción completa."""
+    ultima_reconstruccion = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Reconstruido: {self.ultima_reconstruccion}"
@@ -0,0 +1,275 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from gestorcursos.models import Curso, Inscripcion, InscripcionHistorica
+from gestorreportes.models import (
+    ReporteCurso, ReporteDia, ReporteEstado, ReporteNivel, ReporteRol,
+)
+from gestorusers.models import PerfilUsuario
+
+
+# =============================================================
+#                 ACTUALIZACIÓN INCREMENTAL
+# =============================================================
+
+def _sumar(modelo, campo, delta, **clave):
+    """
+    Suma `delta` al contador `campo` de la fila identificada por `clave`
+    con un UPDATE atómico (F()). Si la fila no existe y delta > 0, la crea.
+    """
+    if delta == 0:
+        return
+    ahora = timezone.now()
+    filas = modelo.objects.filter(**clave)
+    if delta < 0:
+        # Nunca bajar de cero (PositiveIntegerField)
+        filas = filas.filter(**{f"{campo}__gte": -delta})
+
+    if filas.update(**{campo: F(campo) + delta, "actualizado": ahora}) or delta < 0:
+        return
+
+    _, creada = modelo.objects.get_or_create(
+        defaults={campo: delta, "actualizado": ahora}, **clave
+    )
+    if not creada:
+        modelo.objects.filter(**clave).update(**{campo: F(campo) + delta, "actualizado": ahora})
+
+
+def registrar_inscripcion(inscripcion, delta):
+    """
+    Suma (+1) o resta (-1) una inscripción en los reportes por curso, nivel y día.
+
+    Los UPDATE se aplican al confirmar la transacción (on_commit), fuera de
+    ella: la fila del día y la del nivel son las mismas para todas las
+    inscripciones, y dentro de la transacción cada inscribir_en_curso
+    concurrente esperaría su bloqueo hasta que la anterior confirmara.
+    Si la transacción se revierte, no se aplican.
+    """
+    curso_id = inscripcion.curso_id
+    fecha = timezone.localdate(inscripcion.fecha_inscripcion)
+    # Al borrar, el curso puede desaparecer en la misma transacción (cascada):
+    # su nivel se lee ahora (lectura sin bloqueo). Al inscribir, al confirmar.
+    nivel = _nivel_de_curso(curso_id) if delta < 0 else None
+    transaction.on_commit(lambda: _aplicar_inscripcion(curso_id, fecha, nivel, delta))
+
+
+def _nivel_de_curso(curso_id):
+    # Curso.todos: también el de un curso que se está eliminando
+    return (
+        Curso.todos.filter(pk=curso_id)
+        .values_list("nivel", flat=True).first()
+    ) or ""
+
+
+def _aplicar_inscripcion(curso_id, fecha, nivel, delta):
+    if nivel is None:
+        nivel = _nivel_de_curso(curso_id)
+    with transaction.atomic():
+        _sumar(ReporteCurso, "total_inscripciones", delta, curso_id=curso_id)
+        _sumar(ReporteNivel, "total_inscripciones", delta, nivel=nivel)
+        _sumar(ReporteDia, "total_inscripciones", delta, fecha=fecha)
+
+
+def registrar_inscripciones(por_curso, fecha=None):
+    """
+    Versión masiva de registrar_inscripcion para bulk_create (que no dispara
+    señales). por_curso = {curso_id: inscripciones nuevas}, todas del día
+    `fecha` (default: hoy). Un UPDATE por curso y por nivel, no por fila.
+    """
+    por_curso = {curso_id: n for curso_id, n in por_curso.items() if n}
+    if not por_curso:
+        return
+    niveles = dict(Curso.todos.filter(pk__in=list(por_curso)).values_list("id", "nivel"))
+
+    por_nivel = {}
+    for curso_id, n in por_curso.items():
+        _sumar(ReporteCurso, "total_inscripciones", n, curso_id=curso_id)
+        nivel = niveles.get(curso_id) or ""
+        por_nivel[nivel] = por_nivel.get(nivel, 0) + n
+    for nivel, n in por_nivel.items():
+        _sumar(ReporteNivel, "total_inscripciones", n, nivel=nivel)
+    _sumar(
+        ReporteDia, "total_inscripciones", sum(por_curso.values()),
+        fecha=fecha or timezone.localdate(),
+    )
+
+
+def descontar_inscripciones(filas):
+    """
+    Resta inscripciones borradas sin señales (eliminación por lotes en
+    gestortareas). filas = [(curso_id, fecha_inscripcion)]: un UPDATE por
+    curso, por nivel y por día, no por fila.
+    """
+    por_curso, por_dia = {}, {}
+    for curso_id, fecha in filas:
+        por_curso[curso_id] = por_curso.get(curso_id, 0) + 1
+        dia = timezone.localdate(fecha)
+        por_dia[dia] = por_dia.get(dia, 0) + 1
+    if not por_curso:
+        return
+    niveles = dict(Curso.todos.filter(pk__in=list(por_curso)).values_list("id", "nivel"))
+
+    por_nivel = {}
+    for curso_id, n in por_curso.items():
+        _sumar(ReporteCurso, "total_inscripciones", -n, curso_id=curso_id)
+        nivel = niveles.get(curso_id) or ""
+        por_nivel[nivel] = por_nivel.get(nivel, 0) + n
+    for nivel, n in por_nivel.items():
+        _sumar(ReporteNivel, "total_inscripciones", -n, nivel=nivel)
+    for dia, n in por_dia.items():
+        _sumar(ReporteDia, "total_inscripciones", -n, fecha=dia)
+
+
+def registrar_curso(curso):
+    """Todo curso tiene su fila (así se listan también los cursos sin inscritos)."""
+    ReporteCurso.objects.get_or_create(
+        curso_id=curso.pk, defaults={"actualizado": timezone.now()}
+    )
+
+
+def mover_nivel_de_curso(curso_id, nivel_anterior, nivel_nuevo):
+    """Al cambiar el nivel de un curso, sus inscripciones pasan al nivel nuevo."""
+    total = (
+        ReporteCurso.objects.filter(curso_id=curso_id)
+        .values_list("total_inscripciones", flat=True).first()
+    ) or 0
+    _sumar(ReporteNivel, "total_inscripciones", -total, nivel=nivel_anterior or "")
+    _sumar(ReporteNivel, "total_inscripciones", total, nivel=nivel_nuevo or "")
+
+
+def registrar_rol(rol, delta):
+    _sumar(ReporteRol, "total_usuarios", delta, rol=rol)
+
+
+# =============================================================
+#                  RECONSTRUCCIÓN COMPLETA
+# =============================================================
+
+def reconstruir(batch_size=1000):
+    """
+    Recalcula todas las tablas de reportes desde Inscripcion/Curso/PerfilUsuario
+    con consultas agregadas. Devuelve un dict con la cantidad de filas por tabla.
+    Cuenta también InscripcionHistorica: archivar un periodo no cambia los reportes.
+    """
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        ReporteCurso.objects.all().delete()
+        ReporteNivel.objects.all().delete()
+        ReporteDia.objects.all().delete()
+        ReporteRol.objects.all().delete()
+
+        por_curso_id = _contar_por("curso_id")
+        por_curso = ReporteCurso.objects.bulk_create(
+            (
+                ReporteCurso(curso_id=curso_id, total_inscripciones=por_curso_id.get(curso_id, 0), actualizado=ahora)
+                for curso_id in Curso.todos.order_by().values_list("id", flat=True).iterator()
+            ),
+            batch_size=batch_size,
+        )
+
+        por_nivel = ReporteNivel.objects.bulk_create(
+            ReporteNivel(nivel=nivel or "", total_inscripciones=total, actualizado=ahora)
+            for nivel, total in _agrupar_niveles()
+        )
+
+        por_dia = ReporteDia.objects.bulk_create(
+            (
+                ReporteDia(fecha=fecha, total_inscripciones=total, actualizado=ahora)
+                for fecha, total in _contar_por("fecha", fecha=TruncDate("fecha_inscripcion")).items()
+            ),
+            batch_size=batch_size,
+        )
+
+        por_rol = ReporteRol.objects.bulk_create(
+            ReporteRol(rol=fila["rol"], total_usuarios=fila["total"], actualizado=ahora)
+            for fila in PerfilUsuario.objects.order_by().values("rol").annotate(total=Count("id"))
+        )
+
+        ReporteEstado.objects.update_or_create(id=1, defaults={"ultima_reconstruccion": ahora})
+
+    return {
+        "cursos": len(por_curso),
+        "niveles": len(por_nivel),
+        "dias": len(por_dia),
+        "roles": len(por_rol),
+    }
+
+
+def _contar_por(campo, **anotaciones):
+    """{valor de `campo`: inscripciones}, sumando la tabla vigente y el historial."""
+    totales = {}
+    for modelo in (Inscripcion, InscripcionHistorica):
+        filas = (
+            modelo.objects.annotate(**anotaciones)
+            .order_by().values(campo).annotate(total=Count("id"))
+            .values_list(campo, "total")
+        )
+        for valor, total in filas:
+            totales[valor] = totales.get(valor, 0) + total
+    return totales
+
+
+def _agrupar_niveles():
+    # NULL y "" son ambos "sin nivel": se juntan en una sola fila
+    totales = {}
+    for nivel, total in _contar_por("curso__nivel").items():
+        totales[nivel or ""] = totales.get(nivel or "", 0) + total
+    return totales.items()
+
+
+# =============================================================
+#              LECTURA (usada por admin_reportes)
+# =============================================================
+
+def resumen(dias=30, semanas=12, limite=20):
+    """Arma el contexto del módulo de reportes leyendo SOLO las tablas de reportes."""
+    hoy = timezone.localdate()
+    nombres_rol = dict(PerfilUsuario.ROLES)
+
+    por_rol = [
+        {"rol": nombres_rol.get(r.rol, r.rol), "total": r.total_usuarios}
+        for r in ReporteRol.objects.order_by("rol")
+    ]
+
+    cursos_sin_inscritos = ReporteCurso.objects.filter(total_inscripciones=0, curso__eliminando=False)
+
+    actualizaciones = [
+        modelo.objects.aggregate(m=Max("actualizado"))["m"]
+        for modelo in (ReporteCurso, ReporteNivel, ReporteDia, ReporteRol)
+    ]
+    estado = ReporteEstado.objects.filter(id=1).first()
+
+    return {
+        "total_inscripciones": (
+            ReporteNivel.objects.aggregate(t=Sum("total_inscripciones"))["t"] or 0
+        ),
+        "por_rol": por_rol,
+        "total_usuarios": sum(r["total"] for r in por_rol),
+        "por_nivel": (
+            ReporteNivel.objects.filter(total_inscripciones__gt=0)
+            .order_by("-total_inscripciones", "nivel")
+        ),
+        "top_cursos": (
+            ReporteCurso.objects.select_related("curso")
+            .filter(total_inscripciones__gt=0, curso__eliminando=False)
+            .order_by("-total_inscripciones")[:limite]
+        ),
+        "cursos_sin_inscritos": cursos_sin_inscritos.select_related("curso").order_by("curso__nombre")[:limite],
+        "total_cursos_sin_inscritos": cursos_sin_inscritos.count(),
+        "por_dia": ReporteDia.objects.filter(
+            fecha__gt=hoy - timedelta(days=dias)
+        ).order_by("-fecha"),
+        "por_semana": (
+            ReporteDia.objects.filter(fecha__gt=hoy - timedelta(weeks=semanas))
+            .annotate(semana=TruncWeek("fecha"))
+            .order_by("-semana").values("semana")
+            .annotate(total=Sum("total_inscripciones"))
+        ),
+        "ultima_actualizacion": max((a for a in actualizaciones if a), default=None),
+        "ultima_reconstruccion": estado.ultima_reconstruccion if estado else None,
+    }
@@ -0,0 +1,76 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from gestorcursos.models import Curso, Inscripcion
+from gestorreportes import rollups
+from gestorusers.models import PerfilUsuario
+
+
+# =============================================================
+#           INSCRIPCIONES → reportes por curso / nivel / día
+# =============================================================
+
+@receiver(post_save, sender=Inscripcion)
+def inscripcion_creada(sender, instance, created, **kwargs):
+    if created:
+        rollups.registrar_inscripcion(instance, +1)
+
+
+@receiver(post_delete, sender=Inscripcion)
+def inscripcion_eliminada(sender, instance, **kwargs):
+    # También llega por cascada (borrado de Curso, Estudiante o User)
+    rollups.registrar_inscripcion(instance, -1)
+
+
+# =============================================================
+#          CURSOS → fila propia + cambio de nivel
+# =============================================================
+
+@receiver(pre_save, sender=Curso)
+def recordar_nivel_anterior(sender, instance, **kwargs):
+    if instance.pk:
+        instance._nivel_anterior = (
+            Curso.objects.filter(pk=instance.pk)
+            .values_list("nivel", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Curso)
+def curso_guardado(sender, instance, created, **kwargs):
+    if created:
+        rollups.registrar_curso(instance)
+        return
+
+    anterior = getattr(instance, "_nivel_anterior", None) or ""
+    if anterior != (instance.nivel or ""):
+        rollups.mover_nivel_de_curso(instance.pk, anterior, instance.nivel)
+
+
+# =============================================================
+#               PERFILES → usuarios por rol
+# =============================================================
+
+@receiver(pre_save, sender=PerfilUsuario)
+def recordar_rol_anterior(sender, instance, **kwargs):
+    if instance.pk:
+        instance._rol_anterior = (
+            PerfilUsuario.objects.filter(pk=instance.pk)
+            .values_list("rol", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=PerfilUsuario)
+def perfil_guardado(sender, instance, created, **kwargs):
+    if created:
+        rollups.registrar_rol(instance.rol, +1)
+        return
+
+    anterior = getattr(instance, "_rol_anterior", None)
+    if anterior and anterior != instance.rol:
+        rollups.registrar_rol(anterior, -1)
+        rollups.registrar_rol(instance.rol, +1)
+
+
+@receiver(post_delete, sender=PerfilUsuario)
+def perfil_eliminado(sender, instance, **kwargs):
+    rollups.registrar_rol(instance.rol, -1)
@@ -0,0 +1,176 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from gestorcursos.models import Curso, Inscripcion
+from gestorreportes import rollups
+from gestorreportes.models import ReporteCurso, ReporteDia, ReporteNivel, ReporteRol
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+def crear_estudiante(n, rol="estudiante"):
+    user = User.objects.create_user(username=f"reporte{n}@chucky.cl", password="Chucky123*")
+    PerfilUsuario.objects.create(user=user, rol=rol)
+    return Estudiante.objects.create(user=user, rut=f"{n}-R")
+
+
+def reportes():
+    """Filas no nulas de los reportes: lo que debe coincidir con reconstruir()."""
+    return {
+        "cursos": sorted(ReporteCurso.objects.exclude(total_inscripciones=0).values_list("curso_id", "total_inscripciones")),
+        "niveles": sorted(ReporteNivel.objects.exclude(total_inscripciones=0).values_list("nivel", "total_inscripciones")),
+        "dias": sorted(ReporteDia.objects.exclude(total_inscripciones=0).values_list("fecha", "total_inscripciones")),
+        "roles": sorted(ReporteRol.objects.exclude(total_usuarios=0).values_list("rol", "total_usuarios")),
+    }
+
+
+# =============================================================
+#      ACTUALIZACIÓN INCREMENTAL = RECONSTRUCCIÓN COMPLETA
+# =============================================================
+
+class RollupsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.quimica = Curso.objects.create(nombre="Química", nivel="2° Medio")
+        cls.fisica = Curso.objects.create(nombre="Física", nivel="2° Medio")
+        cls.arte = Curso.objects.create(nombre="Arte")  # sin nivel
+        cls.estudiantes = [crear_estudiante(n) for n in range(4)]
+        crear_estudiante(9, rol="docente")
+
+    def assertCuadraConReconstruir(self):
+        incrementales = reportes()
+        rollups.reconstruir()
+        self.assertEqual(incrementales, reportes())
+        return incrementales
+
+    def test_inscribir_y_desinscribir(self):
+        ayer = timezone.now() - timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            with mock.patch("django.utils.timezone.now", return_value=ayer):
+                Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.quimica)
+            for estudiante in self.estudiantes[1:]:
+                Inscripcion.objects.create(estudiante=estudiante, curso=self.quimica)
+                Inscripcion.objects.create(estudiante=estudiante, curso=self.arte)
+            Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.fisica)
+
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["cursos"]), {self.quimica.id: 4, self.fisica.id: 1, self.arte.id: 3})
+        self.assertEqual(dict(totales["niveles"]), {"2° Medio": 5, "": 3})
+        self.assertEqual(dict(totales["dias"]), {
+            timezone.localdate(ayer): 1, timezone.localdate(): 7,
+        })
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Inscripcion.objects.filter(curso=self.arte).first().delete()
+            Inscripcion.objects.get(estudiante=self.estudiantes[0], curso=self.quimica).delete()
+
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["cursos"]), {self.quimica.id: 3, self.fisica.id: 1, self.arte.id: 2})
+        self.assertEqual(dict(totales["dias"]), {timezone.localdate(): 6})
+
+    def test_se_aplican_al_confirmar_y_no_si_se_revierte(self):
+        with self.captureOnCommitCallbacks() as pendientes:
+            Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.quimica)
+            try:
+                with transaction.atomic():
+                    Inscripcion.objects.create(estudiante=self.estudiantes[1], curso=self.quimica)
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+
+            # Dentro de la transacción no se toca ninguna fila de reportes
+            self.assertEqual((reportes()["cursos"], reportes()["dias"]), ([], []))
+
+        # Al confirmar: la inscripción revertida no deja su callback
+        for callback in pendientes:
+            callback()
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["cursos"]), {self.quimica.id: 1})
+
+    def test_cambio_de_nivel_mueve_sus_inscripciones(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for estudiante in self.estudiantes:
+                Inscripcion.objects.create(estudiante=estudiante, curso=self.quimica)
+            Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.fisica)
+
+        self.quimica.nivel = "3° Medio"
+        self.quimica.save()
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["niveles"]), {"2° Medio": 1, "3° Medio": 4})
+
+        # Sin nivel: pasa a la fila "" (NULL y "" son lo mismo)
+        self.quimica.nivel = None
+        self.quimica.save()
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["niveles"]), {"2° Medio": 1, "": 4})
+
+    def test_cambio_de_rol(self):
+        perfil = self.estudiantes[0].user.perfilusuario
+        perfil.rol = "administrador"
+        perfil.save()
+
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["roles"]), {"estudiante": 3, "docente": 1, "administrador": 1})
+
+        self.estudiantes[1].user.perfilusuario.delete()
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["roles"]), {"estudiante": 2, "docente": 1, "administrador": 1})
+
+    def test_descontar_nunca_baja_de_cero(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            inscripcion = Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.quimica)
+            Inscripcion.objects.create(estudiante=self.estudiantes[1], curso=self.quimica)
+        filas = [(inscripcion.curso_id, inscripcion.fecha_inscripcion)]
+
+        # Borrado sin señales (como gestortareas) y su descuento
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {Inscripcion._meta.db_table} WHERE id = %s", [inscripcion.pk])
+        rollups.descontar_inscripciones(filas)
+        self.assertCuadraConReconstruir()
+
+        # Descontar de más (tres veces lo que queda) no deja negativos ni
+        # toca los contadores, y un nivel o día sin fila no se crea
+        rollups.descontar_inscripciones(filas * 3)
+        rollups.descontar_inscripciones([(self.arte.id, timezone.now() - timedelta(days=400))])
+        totales = self.assertCuadraConReconstruir()
+        self.assertEqual(dict(totales["cursos"]), {self.quimica.id: 1})
+        self.assertEqual(dict(totales["niveles"]), {"2° Medio": 1})
+        self.assertFalse(ReporteNivel.objects.filter(nivel="").exists())
+        self.assertEqual(ReporteDia.objects.count(), 1)
+
+    def test_resumen(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for estudiante in self.estudiantes:
+                Inscripcion.objects.create(estudiante=estudiante, curso=self.quimica)
+            Inscripcion.objects.create(estudiante=self.estudiantes[0], curso=self.arte)
+
+        def leer():
+            datos = rollups.resumen()
+            return {
+                "total_inscripciones": datos["total_inscripciones"],
+                "por_rol": datos["por_rol"],
+                "total_usuarios": datos["total_usuarios"],
+                "por_nivel": [(r.nivel, r.total_inscripciones) for r in datos["por_nivel"]],
+                "top_cursos": [(r.curso.nombre, r.total_inscripciones) for r in datos["top_cursos"]],
+                "cursos_sin_inscritos": [r.curso.nombre for r in datos["cursos_sin_inscritos"]],
+                "total_cursos_sin_inscritos": datos["total_cursos_sin_inscritos"],
+                "por_dia": [(r.fecha, r.total_inscripciones) for r in datos["por_dia"]],
+                "por_semana": [r["total"] for r in datos["por_semana"]],
+            }
+
+        incremental = leer()
+        rollups.reconstruir()
+        self.assertEqual(incremental, leer())
+
+        self.assertEqual(incremental["total_inscripciones"], 5)
+        self.assertEqual(incremental["total_usuarios"], 5)
+        self.assertEqual(incremental["por_nivel"], [("2° Medio", 4), ("", 1)])
+        self.assertEqual(incremental["top_cursos"], [("Química", 4), ("Arte", 1)])
+        self.assertEqual(incremental["cursos_sin_inscritos"], ["Física"])
+        self.assertEqual(incremental["por_dia"], [(timezone.localdate(), 5)])
+        self.assertEqual(incremental["por_semana"], [5])
@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import Tarea
+
+
+# La cola la escriben las vistas y el worker: solo lectura en el admin
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    list_display = ("id", "descripcion", "estado", "procesadas", "total", "creada", "terminada")
+    list_filter = ("estado", "tipo")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
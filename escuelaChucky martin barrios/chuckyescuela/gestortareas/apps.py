@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class GestortareasConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'gestortareas'
+
+    def ready(self):
+        # Registra los tipos de tarea (eliminaciones por lotes)
+        from gestortareas import eliminacion  # noqa: F401
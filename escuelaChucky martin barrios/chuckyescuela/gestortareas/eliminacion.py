@@ -0,0 +1,137 @@
+"""
+Eliminaciones pesadas fuera de la petición: cursos y estudiantes.
+
+La vista solo marca y encola (una o dos consultas):
+
+  - Curso      → Curso.eliminando = True: el manager por defecto lo oculta
+                 al instante (catálogo, búsqueda, listados, ver_curso).
+  - Estudiante → User.is_active = False: sus sesiones dejan de valer.
+
+El worker borra después las inscripciones (vigentes y del historial) por
+lotes de LOTE filas, una transacción por lote y sin señales por fila (mismo
+criterio que bulk_create en cohortes.py): por lote se recuentan los cursos
+afectados y se restan los reportes con un UPDATE por curso, nivel y día.
+Al final el ORM borra lo poco que queda (asignaturas, perfil, usuario) con
+sus señales.
+"""
+
+from django.contrib.auth.models import User
+from django.db import connections, router, transaction
+from django.db.models.functions import Now
+
+from gestorcursos import busqueda, catalogo
+from gestorcursos.models import Curso, Inscripcion, InscripcionHistorica
+from gestorreportes import rollups
+from gestortareas import tareas
+from gestorusers.models import Estudiante
+
+
+LOTE = 1000
+
+
+def _borrar(cursor, modelo, ids):
+    """DELETE ... WHERE id IN (ids) directo. Devuelve cuántas filas borró."""
+    q = cursor.db.ops.quote_name
+    cursor.execute(
+        f"DELETE FROM {q(modelo._meta.db_table)} "
+        f"WHERE {q(modelo._meta.pk.column)} IN ({', '.join(['%s'] * len(ids))})",
+        ids,
+    )
+    return cursor.rowcount
+
+
+def _borrar_inscripciones(tarea, *querysets):
+    """
+    Borra por lotes las inscripciones de los querysets (de Inscripcion o de
+    InscripcionHistorica), con reportes y contadores al día.
+    """
+    tareas.avanzar(tarea, total=tarea.procesadas + sum(qs.count() for qs in querysets))
+    for inscripciones in querysets:
+        alias = router.db_for_write(inscripciones.model)
+        while True:
+            with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+                # FOR UPDATE: hasta el COMMIT nadie más (archivar_inscripciones,
+                # otra baja) mueve ni borra estas filas
+                filas = list(
+                    inscripciones.select_for_update().order_by("pk")
+                    .values_list("pk", "curso_id", "fecha_inscripcion")[:LOTE]
+                )
+                if not filas:
+                    break
+                # Sin cargar objetos ni disparar post_delete por fila: lo que
+                # harían las señales va a continuación, solo si se borró el
+                # lote entero (si no, se deshace y se vuelve a leer)
+                if _borrar(cursor, inscripciones.model, [pk for pk, _, _ in filas]) != len(filas):
+                    transaction.set_rollback(True, using=alias)
+                    continue
+
+                # Los reportes cuentan también el historial; total_inscritos no
+                rollups.descontar_inscripciones([(curso_id, fecha) for _, curso_id, fecha in filas])
+                if inscripciones.model is Inscripcion:
+                    Curso.todos.filter(pk__in={curso_id for _, curso_id, _ in filas}).recontar_inscripciones()
+            tareas.avanzar(tarea, len(filas))
+
+
+# =============================================================
+#                          CURSOS
+# =============================================================
+
+def encolar_curso(curso):
+    """Oculta el curso ya y encola su eliminación. Devuelve la Tarea."""
+    with transaction.atomic():
+        Curso.todos.filter(pk=curso.pk).update(eliminando=True, actualizado=Now())
+        tarea = tareas.encolar("eliminar_curso", f"Eliminar curso «{curso.nombre}»", curso_id=curso.pk)
+
+    # QuerySet.update no dispara señales: fuera de la búsqueda y del catálogo
+    busqueda.quitar_curso(curso.pk)
+    catalogo.invalidar()
+    return tarea
+
+
+@tareas.registrar("eliminar_curso")
+def eliminar_curso(tarea, curso_id):
+    _borrar_inscripciones(
+        tarea,
+        Inscripcion.objects.filter(curso_id=curso_id),
+        InscripcionHistorica.objects.filter(curso_id=curso_id),
+    )
+
+    # Asignaturas y fila de reportes en cascada (pocas filas, con señales)
+    with transaction.atomic():
+        curso = Curso.todos.filter(pk=curso_id).first()
+        if curso is not None:
+            curso.delete()
+
+
+# =============================================================
+#                        ESTUDIANTES
+# =============================================================
+
+def encolar_estudiante(estudiante):
+    """Desactiva al usuario ya y encola la eliminación del estudiante."""
+    user = estudiante.user
+    with transaction.atomic():
+        # PerfilUsuarioBackend.get_user rechaza usuarios inactivos
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        return tareas.encolar(
+            "eliminar_estudiante",
+            f"Eliminar estudiante {user.get_full_name() or user.username} ({estudiante.rut})",
+            estudiante_id=estudiante.pk,
+        )
+
+
+@tareas.registrar("eliminar_estudiante")
+def eliminar_estudiante(tarea, estudiante_id):
+    user_id = Estudiante.objects.filter(pk=estudiante_id).values_list("user_id", flat=True).first()
+    if user_id is None:
+        return
+
+    _borrar_inscripciones(
+        tarea,
+        Inscripcion.objects.filter(estudiante_id=estudiante_id),
+        InscripcionHistorica.objects.filter(estudiante_id=estudiante_id),
+    )
+
+    # User → PerfilUsuario y Estudiante en cascada (con sus señales)
+    with transaction.atomic():
+        User.objects.filter(pk=user_id).delete()
@@ -0,0 +1,49 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from gestortareas import tareas
+
+
+class Command(BaseCommand):
+    help = (
+        "Procesa la cola de tareas en segundo plano (gestortareas): por ahora, "
+        "eliminación por lotes de cursos y estudiantes. Correrlo como servicio "
+        "junto al servidor web (systemd, supervisor...); pueden correr varios a "
+        "la vez. Con --una-vez procesa lo pendiente y termina (cron, tests)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--intervalo", type=float, default=2.0,
+                            help="Segundos de espera cuando la cola está vacía (default: 2).")
+        parser.add_argument("--una-vez", action="store_true",
+                            help="Terminar cuando no queden tareas pendientes.")
+
+    def handle(self, *args, **options):
+        detener = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            # SIGTERM (systemd stop): se termina la tarea en curso y se sale
+            signal.signal(signal.SIGTERM, lambda *_: detener.set())
+
+        try:
+            while not detener.is_set():
+                close_old_connections()
+                tarea = tareas.tomar()
+                if tarea is None:
+                    if options["una_vez"]:
+                        break
+                    detener.wait(options["intervalo"])
+                    continue
+
+                inicio = time.perf_counter()
+                ok = tareas.ejecutar(tarea)
+                detalle = f"#{tarea.pk} {tarea.descripcion} — {tarea.procesadas} filas en {time.perf_counter() - inicio:.1f} s"
+                if ok:
+                    self.stdout.write(self.style.SUCCESS(f"OK     {detalle}"))
+                else:
+                    self.stdout.write(self.style.ERROR(f"FALLÓ  {detalle}"))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,59 @@
+from django.db import models
+
+
+# =============================================================
+#          COLA DE TAREAS EN SEGUNDO PLANO (run_worker)
+# =============================================================
+#
+# Cada fila es un trabajo pesado que se sacó de la petición (p. ej.
+# eliminar un curso con miles de inscripciones). Lo ejecuta:
+#     python manage.py run_worker
+# y el administrador sigue su estado en admin_tareas.
+
+
+class Tarea(models.Model):
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADA = "completada"
+    FALLIDA = "fallida"
+    ESTADOS = (
+        (PENDIENTE, "Pendiente"),
+        (EN_CURSO, "En curso"),
+        (COMPLETADA, "Completada"),
+        (FALLIDA, "Fallida"),
+    )
+
+    # Nombre registrado en gestortareas/tareas.py y sus argumentos
+    tipo = models.CharField(max_length=50)
+    parametros = models.JSONField(default=dict)
+    descripcion = models.CharField(max_length=200)
+
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    # Avance: filas procesadas de `total` (None mientras no se sabe)
+    procesadas = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    intentos = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    creada = models.DateTimeField(auto_now_add=True)
+    iniciada = models.DateTimeField(null=True, blank=True)
+    terminada = models.DateTimeField(null=True, blank=True)
+    # Se renueva en cada lote: una tarea "en curso" sin avance es de un worker caído
+    actualizada = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # ✔ El worker busca la próxima pendiente (y las colgadas)
+            models.Index(fields=["estado", "id"], name="tarea_estado_id_idx"),
+        ]
+
+    @property
+    def porcentaje(self):
+        if self.estado == self.COMPLETADA:
+            return 100
+        if not self.total:
+            return None
+        return min(100, self.procesadas * 100 // self.total)
+
+    def __str__(self):
+        return f"#{self.pk} {self.descripcion} ({self.estado})"
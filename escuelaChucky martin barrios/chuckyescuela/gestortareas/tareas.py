@@ -0,0 +1,117 @@
+"""
+Cola de tareas en la base de datos (sin broker externo).
+
+    @registrar("nombre")   declara una función tarea(tarea, **parametros)
+    encolar()              crea la Tarea pendiente (dentro de la transacción
+                           de la vista: si la vista falla, no queda encolada)
+    tomar()                el worker reclama la próxima con un UPDATE
+                           condicional: dos workers nunca toman la misma
+    ejecutar()             la corre y deja el estado final (o el error)
+    avanzar()              la función informa su avance lote a lote
+
+Las funciones deben poder repetirse sin daño: si un worker se cae a mitad
+de camino, la tarea queda "en curso" sin avance y pasados MINUTOS_COLGADA
+otro worker la retoma desde donde quedó.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from gestortareas.models import Tarea
+
+
+logger = logging.getLogger(__name__)
+
+MINUTOS_COLGADA = 10
+
+# nombre → función
+TIPOS = {}
+
+
+def registrar(nombre):
+    def decorator(funcion):
+        TIPOS[nombre] = funcion
+        return funcion
+
+    return decorator
+
+
+def encolar(tipo, descripcion, **parametros):
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de tarea desconocido: {tipo}")
+    return Tarea.objects.create(tipo=tipo, descripcion=descripcion[:200], parametros=parametros)
+
+
+# =============================================================
+#                        WORKER
+# =============================================================
+
+def tomar():
+    """Reclama la próxima tarea pendiente (o colgada). None si no hay."""
+    ahora = timezone.now()
+    candidatas = (
+        Tarea.objects.filter(
+            Q(estado=Tarea.PENDIENTE)
+            | Q(estado=Tarea.EN_CURSO, actualizada__lt=ahora - timedelta(minutes=MINUTOS_COLGADA))
+        )
+        .order_by("id")
+        .values_list("id", "estado", "actualizada")[:10]
+    )
+    for tarea_id, estado, actualizada in candidatas:
+        # Solo uno gana: el UPDATE exige que nadie la haya tocado entretanto
+        tomada = Tarea.objects.filter(pk=tarea_id, estado=estado, actualizada=actualizada).update(
+            estado=Tarea.EN_CURSO,
+            iniciada=ahora,
+            actualizada=ahora,
+            intentos=F("intentos") + 1,
+        )
+        if tomada:
+            return Tarea.objects.get(pk=tarea_id)
+    return None
+
+
+def avanzar(tarea, procesadas=0, total=None):
+    """Suma `procesadas` al avance (y fija `total` si se indica)."""
+    cambios = {"procesadas": F("procesadas") + procesadas, "actualizada": timezone.now()}
+    if total is not None:
+        cambios["total"] = total
+    Tarea.objects.filter(pk=tarea.pk).update(**cambios)
+    tarea.procesadas += procesadas
+    if total is not None:
+        tarea.total = total
+
+
+def ejecutar(tarea):
+    """Corre la tarea. Devuelve True si terminó bien."""
+    try:
+        funcion = TIPOS.get(tarea.tipo)
+        if funcion is None:
+            raise LookupError(f"Tipo de tarea desconocido: {tarea.tipo}")
+        funcion(tarea, **tarea.parametros)
+    except Exception:
+        logger.exception("Falló la tarea %s", tarea)
+        _terminar(tarea, Tarea.FALLIDA, error=traceback.format_exc())
+        return False
+    _terminar(tarea, Tarea.COMPLETADA)
+    return True
+
+
+def _terminar(tarea, estado, error=""):
+    ahora = timezone.now()
+    Tarea.objects.filter(pk=tarea.pk).update(
+        estado=estado, error=error, terminada=ahora, actualizada=ahora,
+    )
+    tarea.estado, tarea.error, tarea.terminada = estado, error, ahora
+
+
+def reintentar(tarea_id):
+    """Vuelve a encolar una tarea fallida. Devuelve True si lo hizo."""
+    return bool(
+        Tarea.objects.filter(pk=tarea_id, estado=Tarea.FALLIDA).update(
+            estado=Tarea.PENDIENTE, error="", terminada=None, actualizada=timezone.now(),
+        )
+    )
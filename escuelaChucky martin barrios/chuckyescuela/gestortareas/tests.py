@@ -0,0 +1,289 @@
+import io
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from gestorcursos import archivado
+from gestorcursos.models import Asignatura, Curso, Inscripcion, InscripcionHistorica, Periodo
+from gestorreportes import rollups
+from gestorreportes.models import ReporteCurso, ReporteDia, ReporteNivel
+from gestortareas import eliminacion, tareas
+from gestortareas.models import Tarea
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+def crear_usuario(correo, rol):
+    user = User.objects.create_user(username=correo, email=correo, password="Chucky123*")
+    PerfilUsuario.objects.create(user=user, rol=rol)
+    return user
+
+
+def crear_estudiante(n, cursos=()):
+    est = Estudiante.objects.create(user=crear_usuario(f"tarea{n}@chucky.cl", "estudiante"), rut=f"{n}-T")
+    for curso in cursos:
+        Inscripcion.objects.create(estudiante=est, curso=curso)
+    return est
+
+
+def procesar_cola():
+    """Lo que hace run_worker --una-vez, sin cerrar la conexión del test."""
+    while (tarea := tareas.tomar()) is not None:
+        tareas.ejecutar(tarea)
+
+
+def reportes():
+    """Filas no nulas de los reportes, para comparar con reconstruir()."""
+    return (
+        sorted(ReporteCurso.objects.exclude(total_inscripciones=0).values_list("curso_id", "total_inscripciones")),
+        sorted(ReporteNivel.objects.exclude(total_inscripciones=0).values_list("nivel", "total_inscripciones")),
+        sorted(ReporteDia.objects.exclude(total_inscripciones=0).values_list("fecha", "total_inscripciones")),
+    )
+
+
+# =============================================================
+#             ELIMINAR CURSO — oculto ya, borrado después
+# =============================================================
+
+class EliminarCursoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.curso = Curso.objects.create(nombre="Química", nivel="2° Medio")
+        cls.otro = Curso.objects.create(nombre="Historia", nivel="2° Medio")
+        Asignatura.objects.create(nombre="Orgánica", curso=cls.curso)
+        # Los reportes de cada inscripción se aplican al confirmar
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.estudiantes = [crear_estudiante(n, [cls.curso, cls.otro]) for n in range(5)]
+        crear_usuario("admin-tareas@chucky.cl", "administrador")
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username="admin-tareas@chucky.cl", password="Chucky123*")
+
+    def test_el_curso_se_oculta_al_instante(self):
+        response = self.client.post(reverse("eliminar_curso", args=[self.curso.id]))
+        self.assertRedirects(response, reverse("admin_listar_cursos"), fetch_redirect_response=False)
+
+        # Nada se borró todavía, pero el curso ya no se ve
+        self.assertEqual(Inscripcion.objects.filter(curso=self.curso).count(), 5)
+        self.assertTrue(Curso.todos.filter(pk=self.curso.pk, eliminando=True).exists())
+        self.assertFalse(Curso.objects.filter(pk=self.curso.pk).exists())
+        self.assertEqual(self.client.get(reverse("ver_curso", args=[self.curso.id])).status_code, 404)
+        self.assertNotContains(self.client.get(reverse("admin_listar_cursos")), "Química")
+
+        tarea = Tarea.objects.get()
+        self.assertEqual((tarea.tipo, tarea.estado), ("eliminar_curso", Tarea.PENDIENTE))
+
+    def test_el_worker_borra_por_lotes(self):
+        self.client.post(reverse("eliminar_curso", args=[self.curso.id]))
+
+        with mock.patch.object(eliminacion, "LOTE", 2):
+            procesar_cola()
+
+        tarea = Tarea.objects.get()
+        self.assertEqual(tarea.estado, Tarea.COMPLETADA, tarea.error)
+        self.assertEqual((tarea.procesadas, tarea.total), (5, 5))
+        self.assertFalse(Curso.todos.filter(pk=self.curso.pk).exists())
+        self.assertFalse(Inscripcion.objects.filter(curso_id=self.curso.pk).exists())
+        self.assertFalse(Asignatura.objects.filter(curso_id=self.curso.pk).exists())
+
+        # Lo demás intacto y los reportes cuadran con un recálculo completo
+        self.otro.refresh_from_db()
+        self.assertEqual(self.otro.total_inscritos, 5)
+        incrementales = reportes()
+        rollups.reconstruir()
+        self.assertEqual(incrementales, reportes())
+
+    def test_lote_incompleto_se_deshace_y_se_relee(self):
+        # Otro proceso se llevó parte del lote entre el SELECT y el DELETE:
+        # no se descuenta nada de ese intento, se vuelve a leer el lote
+        borrar = eliminacion._borrar
+        intentos = []
+
+        def borra_de_menos(cursor, modelo, ids):
+            intentos.append(ids)
+            if len(intentos) == 1:
+                return len(ids) - 1
+            return borrar(cursor, modelo, ids)
+
+        self.client.post(reverse("eliminar_curso", args=[self.curso.id]))
+        with mock.patch.object(eliminacion, "_borrar", borra_de_menos):
+            procesar_cola()
+
+        self.assertEqual(intentos[0], intentos[1])
+        tarea = Tarea.objects.get()
+        self.assertEqual((tarea.estado, tarea.procesadas), (Tarea.COMPLETADA, 5))
+        incrementales = reportes()
+        rollups.reconstruir()
+        self.assertEqual(incrementales, reportes())
+
+    def test_tambien_borra_el_historial(self):
+        periodo = Periodo.objects.create(nombre="2024-1", inicio=date(2024, 3, 1), fin=date(2024, 7, 31), cerrado=True)
+        Inscripcion.objects.filter(curso=self.curso, estudiante__in=self.estudiantes[:3]).update(
+            fecha_inscripcion=timezone.make_aware(datetime(2024, 4, 10, 9, 30))
+        )
+        rollups.reconstruir()
+        archivado.archivar(periodo)
+
+        self.client.post(reverse("eliminar_curso", args=[self.curso.id]))
+        procesar_cola()
+
+        tarea = Tarea.objects.get()
+        self.assertEqual((tarea.estado, tarea.procesadas, tarea.total), (Tarea.COMPLETADA, 5, 5))
+        self.assertFalse(InscripcionHistorica.objects.exists())
+        incrementales = reportes()
+        rollups.reconstruir()
+        self.assertEqual(incrementales, reportes())
+
+    def test_solo_administradores(self):
+        crear_usuario("docente-tareas@chucky.cl", "docente")
+        self.client.login(username="docente-tareas@chucky.cl", password="Chucky123*")
+        self.client.post(reverse("eliminar_curso", args=[self.curso.id]))
+
+        self.assertTrue(Curso.objects.filter(pk=self.curso.pk).exists())
+        self.assertFalse(Tarea.objects.exists())
+
+    def test_solo_por_post_con_csrf(self):
+        # Un enlace o una imagen en otro sitio no borra nada
+        response = self.client.get(reverse("eliminar_curso", args=[self.curso.id]))
+        self.assertEqual(response.status_code, 405)
+
+        csrf = self.client_class(enforce_csrf_checks=True)
+        csrf.login(username="admin-tareas@chucky.cl", password="Chucky123*")
+        self.assertEqual(csrf.post(reverse("eliminar_curso", args=[self.curso.id])).status_code, 403)
+        self.assertTrue(Curso.objects.filter(pk=self.curso.pk).exists())
+        self.assertFalse(Tarea.objects.exists())
+
+        # Los listados lo ofrecen como formulario con su token
+        for url in (reverse("listar_cursos"), reverse("admin_listar_cursos")):
+            response = self.client.get(url)
+            self.assertContains(
+                response, f'<form method="post" action="{reverse("eliminar_curso", args=[self.curso.id])}"'
+            )
+            self.assertContains(response, "csrfmiddlewaretoken")
+
+
+# =============================================================
+#        ELIMINAR ESTUDIANTE — desactivado ya, borrado después
+# =============================================================
+
+class EliminarEstudianteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.curso = Curso.objects.create(nombre="Biología", nivel="1° Medio")
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.estudiante = crear_estudiante(1, [cls.curso])
+            crear_estudiante(2, [cls.curso])
+        crear_usuario("admin-tareas@chucky.cl", "administrador")
+
+    def test_desactiva_y_el_worker_lo_borra(self):
+        alumno = self.client_class()
+        alumno.login(username="tarea1@chucky.cl", password="Chucky123*")
+
+        self.client.login(username="admin-tareas@chucky.cl", password="Chucky123*")
+        self.client.post(reverse("admin_eliminar_estudiante", args=[self.estudiante.id]))
+
+        # Su sesión deja de valer antes de que corra el worker
+        self.assertFalse(User.objects.get(pk=self.estudiante.user_id).is_active)
+        self.assertEqual(alumno.get(reverse("panel_estudiante")).status_code, 302)
+
+        # Borra al User en cascada: sus inscripciones se descuentan al confirmar
+        with self.captureOnCommitCallbacks(execute=True):
+            procesar_cola()
+
+        self.assertFalse(User.objects.filter(pk=self.estudiante.user_id).exists())
+        self.assertFalse(Estudiante.objects.filter(pk=self.estudiante.pk).exists())
+        self.curso.refresh_from_db()
+        self.assertEqual(self.curso.total_inscritos, 1)
+        incrementales = reportes()
+        rollups.reconstruir()
+        self.assertEqual(incrementales, reportes())
+
+    def test_solo_por_post(self):
+        self.client.login(username="admin-tareas@chucky.cl", password="Chucky123*")
+        url = reverse("admin_eliminar_estudiante", args=[self.estudiante.id])
+
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertTrue(User.objects.get(pk=self.estudiante.user_id).is_active)
+        self.assertFalse(Tarea.objects.exists())
+
+        response = self.client.get(reverse("admin_listar_estudiantes"))
+        self.assertContains(response, f'<form method="post" action="{url}"')
+        self.assertContains(response, "csrfmiddlewaretoken")
+# =============================================================
+
+class ColaTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(tareas.TIPOS, {"explota": self.explota})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def explota(tarea):
+        raise RuntimeError("sin conexión al disco")
+
+    def test_dos_workers_no_toman_la_misma(self):
+        tareas.encolar("explota", "Una sola")
+        self.assertIsNotNone(tareas.tomar())
+        self.assertIsNone(tareas.tomar())
+
+    def test_retoma_una_tarea_colgada(self):
+        tarea = tareas.encolar("explota", "Colgada")
+        tareas.tomar()
+        Tarea.objects.filter(pk=tarea.pk).update(
+            actualizada=timezone.now() - timedelta(minutes=tareas.MINUTOS_COLGADA + 1)
+        )
+
+        retomada = tareas.tomar()
+        self.assertEqual((retomada.pk, retomada.intentos), (tarea.pk, 2))
+
+    def test_tipo_desconocido(self):
+        with self.assertRaises(ValueError):
+            tareas.encolar("no_existe", "Nada")
+
+    def test_fallida_y_reintento_desde_el_panel(self):
+        tarea = tareas.encolar("explota", "Tarea que falla")
+        with self.assertLogs("gestortareas.tareas", "ERROR"):
+            self.assertFalse(tareas.ejecutar(tareas.tomar()))
+
+        tarea.refresh_from_db()
+        self.assertEqual(tarea.estado, Tarea.FALLIDA)
+        self.assertIn("sin conexión al disco", tarea.error)
+
+        crear_usuario("admin-tareas@chucky.cl", "administrador")
+        self.client.login(username="admin-tareas@chucky.cl", password="Chucky123*")
+        response = self.client.get(reverse("admin_tareas"))
+        self.assertContains(response, "Tarea que falla")
+        self.assertContains(response, 'name="reintentar"')
+
+        self.client.post(reverse("admin_tareas"), {"reintentar": tarea.pk})
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.estado, tarea.error), (Tarea.PENDIENTE, ""))
+
+
+# =============================================================
+#                 run_worker (comando completo)
+# =============================================================
+
+class RunWorkerTests(TransactionTestCase):
+    # Sin transacción envolvente: el comando cierra conexiones viejas
+
+    def test_una_vez(self):
+        curso = Curso.objects.create(nombre="Arte")
+        crear_estudiante(1, [curso])
+        eliminacion.encolar_curso(curso)
+
+        salida = io.StringIO()
+        call_command("run_worker", "--una-vez", stdout=salida)
+
+        self.assertIn("OK", salida.getvalue())
+        self.assertEqual(Tarea.objects.get().estado, Tarea.COMPLETADA)
+        self.assertFalse(Curso.todos.exists())
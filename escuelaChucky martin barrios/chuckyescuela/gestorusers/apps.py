@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GestorusersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestorusers'
+
+    def ready(self):
+        # Registra los receptores de señales (caché del rol en sesión)
+        from gestorusers import signals  # noqa: F401
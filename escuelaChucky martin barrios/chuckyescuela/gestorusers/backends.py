@@ -0,0 +1,50 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.contrib.auth.models import User
+
+
+# =============================================================
+#      BACKEND DE LOGIN: User + PerfilUsuario en UNA consulta
+# =============================================================
+
+class PerfilUsuarioBackend(ModelBackend):
+    """
+    Igual que ModelBackend, pero trae el PerfilUsuario y el Estudiante
+    junto al User (select_related) tanto al autenticar como en cada request.
+
+    Así user.perfilusuario / user.estudiante quedan en memoria y el rol
+    para la redirección del login / la caché de sesión
+    (gestorusers.middleware) sale sin una consulta extra.
+
+    Si las credenciales no sirven lanza PermissionDenied: authenticate()
+    no sigue con ModelBackend (mismo User, mismo hash), que solo está en
+    AUTHENTICATION_BACKENDS para las sesiones iniciadas con él.
+    """
+
+    def _usuarios(self):
+        return User._default_manager.select_related("perfilusuario", "estudiante")
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = self._usuarios().get(**{User.USERNAME_FIELD: username})
+        except User.DoesNotExist:
+            # Igual que ModelBackend: hashear igual para no filtrar por tiempo
+            # qué correos existen
+            User().set_password(password)
+            raise PermissionDenied
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        raise PermissionDenied
+
+    def get_user(self, user_id):
+        try:
+            user = self._usuarios().get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
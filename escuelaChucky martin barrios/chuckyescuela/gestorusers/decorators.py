@@ -0,0 +1,69 @@
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib import messages
+from django.shortcuts import redirect
+
+
+# =============================================================
+#        REDIRECCIÓN SEGÚN ROL (usada en todo el proyecto)
+# =============================================================
+
+PANEL_POR_ROL = {
+    "administrador": "panel_admin",
+    # Rol docente = usuario normal según rúbrica
+    "docente": "panel_usuario",
+    "estudiante": "panel_estudiante",
+}
+
+
+def redirigir_a_panel(rol):
+    """
+    Redirige al panel que corresponde al rol.
+    Un usuario sin PerfilUsuario vuelve a la página inicial.
+    """
+    if rol is None:
+        return redirect("index")
+    return redirect(PANEL_POR_ROL.get(rol, "panel_estudiante"))
+
+
+# =============================================================
+#                 DECORADOR @role_required
+# =============================================================
+
+def role_required(*roles, mensaje="No tiene permisos para acceder aquí."):
+    """
+    Restringe una vista a uno o más roles de PerfilUsuario.
+    Usa request.rol (resuelto por PerfilUsuarioMiddleware, sin consulta).
+    Si el rol no corresponde, muestra `mensaje` y redirige al panel propio.
+
+    Uso (también sobre vistas async):
+        @login_required
+        @role_required("administrador")
+        def admin_reportes(request): ...
+    """
+
+    def rechazar(request):
+        rol = getattr(request, "rol", None)
+        if rol in roles:
+            return None
+        messages.error(request, mensaje)
+        return redirigir_a_panel(rol)
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            async def _wrapped(request, *args, **kwargs):
+                redireccion = rechazar(request)
+                if redireccion is not None:
+                    return redireccion
+                return await view_func(request, *args, **kwargs)
+        else:
+            def _wrapped(request, *args, **kwargs):
+                redireccion = rechazar(request)
+                if redireccion is not None:
+                    return redireccion
+                return view_func(request, *args, **kwargs)
+
+        return wraps(view_func)(_wrapped)
+
+    return decorator
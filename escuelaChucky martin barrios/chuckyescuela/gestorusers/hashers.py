@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class PBKDF2ConfigurableHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 con iteraciones configurables (settings.PASSWORD_PBKDF2_ITERATIONS).
+
+    Mantiene el nombre de algoritmo "pbkdf2_sha256", así los hashes ya
+    guardados siguen siendo válidos; al cambiar el setting, cada usuario se
+    re-hashea automáticamente con el nuevo costo en su próximo login.
+    Medir el impacto con: python manage.py bench_login
+
+    El setting solo puede SUBIR el costo: nunca se usan menos iteraciones
+    que las de Django (PBKDF2PasswordHasher.iterations), porque must_update()
+    re-hashearía a la baja todas las contraseñas existentes.
+    """
+
+    @property
+    def iterations(self):
+        configuradas = getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", None) or 0
+        return max(configuradas, PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,279 @@
+"""
+Importación masiva de estudiantes desde CSV / XLSX.
+
+Flujo:
+  1. leer_archivo()  → filas como dicts (columnas: nombre, apellido, correo,
+                        rut, nivel, password).
+  2. validar()       → errores por fila; duplicados de correo/RUT dentro del
+                        archivo (en memoria) y contra la base (UNA consulta).
+  3. importar()      → hashea las contraseñas en un pool de procesos (o de
+                        hilos, desde una petición web) y crea User +
+                        PerfilUsuario + Estudiante con bulk_create en una
+                        sola transacción. Si otro proceso creó entretanto un
+                        correo o RUT del archivo, no se crea nada
+                        (ImportacionError) y basta con volver a validar.
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Value
+
+from gestorreportes import rollups
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+COLUMNAS = ("nombre", "apellido", "correo", "rut", "nivel", "password")
+OBLIGATORIAS = ("nombre", "apellido", "correo", "rut")
+
+# Igual que admin_crear_estudiante cuando no se indica contraseña (solo demo)
+PASSWORD_POR_DEFECTO = "Chucky123*"
+
+
+class ImportacionError(Exception):
+    """
+    El archivo completo no se puede leer (formato, columnas, dependencias)
+    o no se pudo importar (correo/RUT creado entre validar e importar).
+    """
+
+
+# =============================================================
+#                    LECTURA DEL ARCHIVO
+# =============================================================
+
+def leer_archivo(archivo, nombre):
+    """Devuelve una lista de dicts (una por fila) según la extensión del archivo."""
+    if nombre.lower().endswith(".xlsx"):
+        filas = _leer_xlsx(archivo)
+    else:
+        filas = _leer_csv(archivo)
+
+    faltantes = [c for c in OBLIGATORIAS if filas and c not in filas[0]]
+    if faltantes:
+        raise ImportacionError(f"Faltan columnas: {', '.join(faltantes)}.")
+    return filas
+
+
+def _leer_csv(archivo):
+    contenido = archivo.read()
+    if isinstance(contenido, bytes):
+        try:
+            contenido = contenido.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            contenido = contenido.decode("latin-1")
+
+    # Excel en español suele guardar con ";" como separador
+    try:
+        dialecto = csv.Sniffer().sniff(contenido[:2048], delimiters=",;")
+    except csv.Error:
+        dialecto = csv.excel
+
+    lector = csv.DictReader(io.StringIO(contenido), dialect=dialecto)
+    return [
+        {(k or "").strip().lower(): (v or "").strip() for k, v in fila.items()}
+        for fila in lector
+    ]
+
+
+def _leer_xlsx(archivo):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportacionError(
+            "Para importar archivos .xlsx instala openpyxl (pip install openpyxl) "
+            "o guarda la planilla como CSV."
+        )
+
+    hoja = load_workbook(archivo, read_only=True, data_only=True).active
+    filas = hoja.iter_rows(values_only=True)
+    encabezados = [str(c or "").strip().lower() for c in next(filas, ())]
+    return [
+        {k: str(v).strip() if v is not None else "" for k, v in zip(encabezados, fila)}
+        for fila in filas
+        if any(v is not None for v in fila)
+    ]
+
+
+# =============================================================
+#                        VALIDACIÓN
+# =============================================================
+
+def validar(filas):
+    """
+    Devuelve (validas, errores).
+    - validas: lista de dicts normalizados (con "fila" = nº de línea del archivo)
+    - errores: lista de (nº de fila, mensaje)
+    """
+    errores = []
+    candidatas = []
+    correos_vistos = {}
+    ruts_vistos = {}
+
+    # La fila 1 del archivo son los encabezados
+    for numero, fila in enumerate(filas, start=2):
+        datos = {c: fila.get(c, "") for c in COLUMNAS}
+        datos["correo"] = datos["correo"].lower()
+        datos["fila"] = numero
+
+        faltan = [c for c in OBLIGATORIAS if not datos[c]]
+        if faltan:
+            errores.append((numero, f"Faltan datos obligatorios: {', '.join(faltan)}."))
+            continue
+
+        try:
+            validate_email(datos["correo"])
+        except ValidationError:
+            errores.append((numero, f"Correo inválido: {datos['correo']}."))
+            continue
+
+        if datos["correo"] in correos_vistos:
+            errores.append((numero, f"Correo repetido en el archivo (fila {correos_vistos[datos['correo']]})."))
+            continue
+        if datos["rut"] in ruts_vistos:
+            errores.append((numero, f"RUT repetido en el archivo (fila {ruts_vistos[datos['rut']]})."))
+            continue
+
+        correos_vistos[datos["correo"]] = numero
+        ruts_vistos[datos["rut"]] = numero
+        candidatas.append(datos)
+
+    # Duplicados contra la base: correos y RUTs existentes en UNA consulta
+    existentes = _existentes(correos_vistos, ruts_vistos)
+
+    validas = []
+    for datos in candidatas:
+        if ("correo", datos["correo"]) in existentes:
+            errores.append((datos["fila"], f"Ya existe un usuario con el correo {datos['correo']}."))
+        elif ("rut", datos["rut"]) in existentes:
+            errores.append((datos["fila"], f"Ya existe un estudiante con el RUT {datos['rut']}."))
+        else:
+            validas.append(datos)
+
+    errores.sort()
+    return validas, errores
+
+
+def _existentes(correos, ruts):
+    if not correos and not ruts:
+        return set()
+    usuarios = (
+        User.objects.filter(username__in=list(correos))
+        .annotate(tipo=Value("correo")).values_list("tipo", "username")
+    )
+    estudiantes = (
+        Estudiante.objects.filter(rut__in=list(ruts))
+        .annotate(tipo=Value("rut")).values_list("tipo", "rut")
+    )
+    return set(usuarios.union(estudiantes, all=True))
+
+
+# =============================================================
+#                  HASH DE CONTRASEÑAS (pool)
+# =============================================================
+
+def _inicializar_worker(settings_module):
+    # Con "spawn" (Windows/macOS) el proceso hijo arranca sin Django cargado
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hashear_passwords(passwords, procesos=None, hilos=False):
+    """
+    Aplica make_password a cada contraseña. PBKDF2 es deliberadamente lento,
+    así que el trabajo se reparte en `procesos` procesos (default: nº de CPUs).
+    Con hilos=True se reparte en hilos: es lo que corresponde dentro de una
+    petición web (no se levantan procesos desde el servidor) y rinde casi lo
+    mismo, porque hashlib.pbkdf2_hmac suelta el GIL mientras calcula.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(passwords) < 2:
+        return [make_password(p) for p in passwords]
+
+    if hilos:
+        with ThreadPoolExecutor(max_workers=procesos) as pool:
+            return list(pool.map(make_password, passwords))
+
+    settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "chuckyescuela.settings")
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        initializer=_inicializar_worker,
+        initargs=(settings_module,),
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (procesos * 4))))
+
+
+# =============================================================
+#                         IMPORTACIÓN
+# =============================================================
+
+def importar(validas, procesos=None, hilos=False, batch_size=1000):
+    """
+    Crea los estudiantes ya validados. Todo o nada: una sola transacción.
+    Devuelve la cantidad de estudiantes creados. Lanza ImportacionError
+    (sin haber creado nada) si un correo o RUT ya existe: lo creó otro
+    proceso después de validar().
+    """
+    if not validas:
+        return 0
+
+    hashes = hashear_passwords(
+        [d["password"] or PASSWORD_POR_DEFECTO for d in validas], procesos, hilos
+    )
+
+    try:
+        _crear(validas, hashes, batch_size)
+    except IntegrityError:
+        raise ImportacionError(
+            "Algunos correos o RUT del archivo se registraron mientras se importaba. "
+            "No se importó ningún estudiante: vuelve a validar el archivo."
+        )
+    return len(validas)
+
+
+def _crear(validas, hashes, batch_size):
+    with transaction.atomic():
+        User.objects.bulk_create(
+            (
+                User(
+                    username=d["correo"],
+                    email=d["correo"],
+                    password=hash_,
+                    first_name=d["nombre"],
+                    last_name=d["apellido"],
+                )
+                for d, hash_ in zip(validas, hashes)
+            ),
+            batch_size=batch_size,
+        )
+
+        # bulk_create no devuelve los id en MySQL: se recuperan en una consulta
+        ids = dict(
+            User.objects.filter(username__in=[d["correo"] for d in validas])
+            .values_list("username", "id")
+        )
+
+        PerfilUsuario.objects.bulk_create(
+            (PerfilUsuario(user_id=ids[d["correo"]], rol="estudiante") for d in validas),
+            batch_size=batch_size,
+        )
+        Estudiante.objects.bulk_create(
+            (
+                Estudiante(user_id=ids[d["correo"]], rut=d["rut"], nivel=d["nivel"] or None)
+                for d in validas
+            ),
+            batch_size=batch_size,
+        )
+
+        # bulk_create no dispara señales: se actualiza el reporte por rol aquí
+        rollups.registrar_rol("estudiante", len(validas))
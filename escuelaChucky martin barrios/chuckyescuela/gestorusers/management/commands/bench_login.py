@@ -0,0 +1,81 @@
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from gestorusers.models import PerfilUsuario
+
+
+BACKENDS = {
+    "ModelBackend": "django.contrib.auth.backends.ModelBackend",
+    "PerfilUsuarioBackend": "gestorusers.backends.PerfilUsuarioBackend",
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide logins/segundo de login_view con ModelBackend y con "
+        "PerfilUsuarioBackend, para uno o más valores de PASSWORD_PBKDF2_ITERATIONS. "
+        "Los usuarios de prueba se crean en una transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20,
+                            help="Logins por combinación (default: 20).")
+        parser.add_argument("--iteraciones", default=str(PBKDF2PasswordHasher.iterations),
+                            help="Lista separada por comas, ej: 1000000,1500000 (default: el de Django).")
+
+    def handle(self, *args, **options):
+        iteraciones = [int(i) for i in options["iteraciones"].split(",")]
+        # El hasher nunca baja del default de Django: medir menos no tiene sentido
+        if min(iteraciones) < PBKDF2PasswordHasher.iterations:
+            raise CommandError(
+                f"El mínimo de iteraciones es {PBKDF2PasswordHasher.iterations} (default de Django)."
+            )
+        try:
+            # Client usa el host "testserver"
+            with override_settings(ALLOWED_HOSTS=["testserver"]), transaction.atomic():
+                for n in iteraciones:
+                    with override_settings(PASSWORD_PBKDF2_ITERATIONS=n):
+                        self._medir_iteraciones(n, options["logins"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _medir_iteraciones(self, iteraciones, logins):
+        correo = f"bench-login-{iteraciones}@chucky.cl"
+        user = User.objects.create_user(username=correo, email=correo, password="Chucky123*")
+        PerfilUsuario.objects.create(user=user, rol="estudiante")
+
+        for nombre, backend in BACKENDS.items():
+            with override_settings(AUTHENTICATION_BACKENDS=[backend]):
+                cliente = Client()
+                url = reverse("login")
+                consultas = 0
+
+                inicio = time.perf_counter()
+                for _ in range(logins):
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = cliente.post(url, {"correo": correo, "password": "Chucky123*"})
+                    if response.status_code != 302 or response.url == url:
+                        self.stderr.write(f"Login fallido con {nombre}.")
+                        return
+                    consultas += len(ctx.captured_queries)
+                    cliente.cookies.clear()
+                duracion = time.perf_counter() - inicio
+
+            self.stdout.write(
+                f"iteraciones={iteraciones:>8}  {nombre:<22} "
+                f"{logins / duracion:8.1f} logins/s  "
+                f"{duracion / logins * 1000:7.1f} ms/login  "
+                f"{consultas / logins:4.1f} consultas/login"
+            )
@@ -0,0 +1,148 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.urls import reverse
+
+from chuckyescuela.db import pool
+from gestorusers.models import PerfilUsuario
+
+
+# modo → variables de entorno para chuckyescuela.settings_produccion
+MODOS = {
+    "sin_pool": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "0"},
+    "persistente": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "60"},
+    "pool": {"DB_POOL": "1"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara peticiones/segundo con una conexión nueva por petición, con "
+        "conexiones persistentes de Django (CONN_MAX_AGE) y con el pool "
+        "(chuckyescuela/db/pool.py). Cada modo corre en un proceso aparte con "
+        "el perfil chuckyescuela.settings_produccion."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--motor", choices=("sqlite", "mysql"), default="sqlite",
+                            help="DB_MOTOR del perfil de producción (default: sqlite).")
+        parser.add_argument("--nombre", help="DB_NOMBRE (base ya migrada).")
+        parser.add_argument("--peticiones", type=int, default=500,
+                            help="Peticiones por hilo (default: 500).")
+        parser.add_argument("--hilos", type=int, default=4,
+                            help="Hilos concurrentes, como un worker con threads (default: 4).")
+        parser.add_argument("--pool-max", type=int, default=2,
+                            help="DB_POOL_MAX; menor que --hilos para provocar esperas (default: 2).")
+        parser.add_argument("--medir", action="store_true", help="(interno) corre un solo modo.")
+
+    def handle(self, *args, **options):
+        if options["medir"]:
+            resultado = self._medir(options["peticiones"], options["hilos"])
+            self.stdout.write(json.dumps(resultado))
+            return
+
+        self.stdout.write(
+            f"{'modo':12} {'pet/s':>8} {'p50 ms':>8} {'p95 ms':>8}  métricas del pool"
+        )
+        for modo, entorno in MODOS.items():
+            resultado = self._lanzar(modo, entorno, options)
+            metricas = resultado["pool"].get("default")
+            detalle = (
+                f"creadas={metricas['creadas']} préstamos={metricas['prestamos']} "
+                f"esperas={metricas['esperas']} ({metricas['segundos_espera']} s) "
+                f"agotado={metricas['agotado']}"
+                if metricas else "—"
+            )
+            self.stdout.write(
+                f"{modo:12} {resultado['peticiones_s']:8.1f} {resultado['p50_ms']:8.2f} "
+                f"{resultado['p95_ms']:8.2f}  {detalle}"
+            )
+
+    # ---------------------------------------------------------
+    def _lanzar(self, modo, entorno, options):
+        env = {
+            **os.environ,
+            **entorno,
+            "DJANGO_SETTINGS_MODULE": "chuckyescuela.settings_produccion",
+            "DJANGO_ALLOWED_HOSTS": "testserver",
+            "ESTATICOS_MANIFEST": "0",
+            # El perfil exige caché compartida; el benchmark es un solo proceso
+            "CACHE_MODO": os.environ.get("CACHE_MODO", "archivo"),
+            "CACHE_UBICACION": os.environ.get(
+                "CACHE_UBICACION", os.path.join(tempfile.gettempdir(), "chuckyescuela-bench-cache")
+            ),
+            "DB_MOTOR": options["motor"],
+            "DB_POOL_MAX": str(options["pool_max"]),
+        }
+        if options["nombre"]:
+            env["DB_NOMBRE"] = options["nombre"]
+
+        salida = subprocess.run(
+            [
+                sys.executable, str(settings.BASE_DIR / "manage.py"), "bench_pool", "--medir",
+                "--peticiones", str(options["peticiones"]), "--hilos", str(options["hilos"]),
+            ],
+            env=env, check=True, capture_output=True, text=True,
+        )
+        # La última línea es el JSON (antes pueden venir avisos de system checks)
+        return json.loads(salida.stdout.strip().splitlines()[-1])
+
+    def _medir(self, peticiones, hilos):
+        correo = f"bench-pool-{os.getpid()}@chucky.cl"
+        user = User.objects.create(username=correo, email=correo)
+        PerfilUsuario.objects.create(user=user, rol="administrador")
+        clientes = []
+        for _ in range(hilos):
+            cliente = Client()
+            cliente.force_login(user)
+            clientes.append(cliente)
+        connection.close()
+
+        url = reverse("listar_cursos")
+        tiempos = []
+        lock = threading.Lock()
+
+        def trabajar(cliente):
+            propios = []
+            for _ in range(peticiones):
+                inicio = time.perf_counter()
+                cliente.get(url)
+                # Lo mismo que hace el handler de Django al terminar la petición
+                close_old_connections()
+                propios.append(time.perf_counter() - inicio)
+            with lock:
+                tiempos.extend(propios)
+
+        try:
+            inicio = time.perf_counter()
+            trabajadores = [threading.Thread(target=trabajar, args=(c,)) for c in clientes]
+            for t in trabajadores:
+                t.start()
+            for t in trabajadores:
+                t.join()
+            duracion = time.perf_counter() - inicio
+        finally:
+            Session.objects.filter(
+                session_key__in=[c.session.session_key for c in clientes]
+            ).delete()
+            user.delete()
+
+        cuantiles = statistics.quantiles(tiempos, n=20)
+        return {
+            "peticiones_s": len(tiempos) / duracion,
+            "p50_ms": statistics.median(tiempos) * 1000,
+            "p95_ms": cuantiles[18] * 1000,
+            "pool": pool.estadisticas(),
+        }
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gestorusers import importacion
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa estudiantes en bloque desde un CSV/XLSX con columnas "
+        "nombre, apellido, correo, rut, nivel, password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta al archivo .csv o .xlsx")
+        parser.add_argument(
+            "--procesos",
+            type=int,
+            default=None,
+            help="Procesos para hashear contraseñas (default: nº de CPUs).",
+        )
+        parser.add_argument(
+            "--solo-validar",
+            action="store_true",
+            help="Valida el archivo y muestra los errores sin crear nada.",
+        )
+
+    def handle(self, *args, **options):
+        ruta = options["archivo"]
+        try:
+            with open(ruta, "rb") as archivo:
+                filas = importacion.leer_archivo(archivo, ruta)
+        except OSError as e:
+            raise CommandError(f"No se pudo abrir {ruta}: {e}")
+        except importacion.ImportacionError as e:
+            raise CommandError(str(e))
+
+        validas, errores = importacion.validar(filas)
+
+        for fila, mensaje in errores:
+            self.stderr.write(f"Fila {fila}: {mensaje}")
+
+        if options["solo_validar"]:
+            self.stdout.write(f"Filas válidas: {len(validas)} — con errores: {len(errores)}.")
+            return
+
+        inicio = time.perf_counter()
+        try:
+            creados = importacion.importar(validas, procesos=options["procesos"])
+        except importacion.ImportacionError as e:
+            raise CommandError(str(e))
+        duracion = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Estudiantes creados: {creados} en {duracion:.1f} s — filas con errores: {len(errores)}."
+        ))
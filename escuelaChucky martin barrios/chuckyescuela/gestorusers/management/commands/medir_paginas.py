@@ -0,0 +1,138 @@
+import gzip
+import re
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from gestorcursos.models import Asignatura, Curso, Inscripcion
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+class _Rollback(Exception):
+    pass
+
+
+# (nombre de la URL, argumentos, rol con el que se visita; None = anónimo)
+PAGINAS = [
+    ("index", (), None),
+    ("login", (), None),
+    ("registro", (), None),
+    ("panel_estudiante", (), "estudiante"),
+    ("mis_cursos", (), "estudiante"),
+    ("ver_curso", ("curso",), "estudiante"),
+    ("listar_asignaturas", (), "estudiante"),
+    ("panel_usuario", (), "docente"),
+    ("panel_admin", (), "administrador"),
+    ("listar_cursos", (), "administrador"),
+    ("admin_listar_cursos", (), "administrador"),
+    ("admin_listar_estudiantes", (), "administrador"),
+    ("admin_crear_estudiante", (), "administrador"),
+    ("admin_importar_estudiantes", (), "administrador"),
+    ("admin_inscripciones", (), "administrador"),
+    ("admin_reportes", (), "administrador"),
+    ("agregar_curso", (), "administrador"),
+]
+
+_RECURSO = re.compile(r'(?:href|src)="(%s[^"]+)"' % re.escape(settings.STATIC_URL))
+
+
+def _gz(contenido):
+    return len(gzip.compress(contenido, compresslevel=9))
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide peso (HTML + CSS/JS propios, con y sin gzip) y tiempo de render "
+        "de cada página. Los datos de prueba se crean en una transacción que "
+        "se revierte. Los recursos de CDN (Bootstrap, iconos) no se cuentan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeticiones", type=int, default=20,
+                            help="Veces que se pide cada página (default: 20).")
+
+    def handle(self, *args, **options):
+        try:
+            with override_settings(ALLOWED_HOSTS=["testserver"]), transaction.atomic():
+                self._medir(options["repeticiones"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    # ---------------------------------------------------------
+    def _datos(self):
+        cursos = [
+            Curso.objects.create(nombre=f"Curso medición {i}", descripcion="Descripción " * 10,
+                                 nivel="1° Medio")
+            for i in range(10)
+        ]
+        for curso in cursos:
+            for j in range(3):
+                Asignatura.objects.create(nombre=f"Asignatura {j}", descripcion="Texto", curso=curso)
+
+        usuarios = {}
+        for rol in ("estudiante", "docente", "administrador"):
+            correo = f"medicion-{rol}@chucky.cl"
+            usuarios[rol] = User.objects.create_user(username=correo, email=correo, password="x")
+            PerfilUsuario.objects.create(user=usuarios[rol], rol=rol)
+
+        estudiante = Estudiante.objects.create(user=usuarios["estudiante"], rut="medicion-1")
+        for curso in cursos[:5]:
+            Inscripcion.objects.create(estudiante=estudiante, curso=curso)
+        return usuarios, {"curso": cursos[0].pk}
+
+    def _medir(self, repeticiones):
+        usuarios, argumentos = self._datos()
+        clientes = {None: Client()}
+        for rol, user in usuarios.items():
+            clientes[rol] = Client()
+            clientes[rol].force_login(user)
+
+        self.stdout.write(
+            f"{'vista':28} {'HTML':>8} {'HTML gz':>8} {'CSS/JS':>8} {'CSS/JS gz':>9} "
+            f"{'1ª visita gz':>12} {'siguientes gz':>13} {'render ms':>9}"
+        )
+        totales = [0, 0, 0]
+
+        for nombre, args, rol in PAGINAS:
+            url = reverse(nombre, args=[argumentos[a] for a in args])
+            cliente = clientes[rol]
+
+            respuesta = cliente.get(url)
+            html = respuesta.content
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                cliente.get(url)
+            ms = (time.perf_counter() - inicio) / repeticiones * 1000
+
+            recursos = crudo = comprimido = 0
+            for ruta in set(_RECURSO.findall(html.decode())):
+                archivo = finders.find(ruta[len(settings.STATIC_URL):])
+                if archivo:
+                    with open(archivo, "rb") as f:
+                        contenido = f.read()
+                    recursos += 1
+                    crudo += len(contenido)
+                    comprimido += _gz(contenido)
+
+            html_gz = _gz(html)
+            totales[0] += html_gz + comprimido
+            totales[1] += html_gz
+            totales[2] += ms
+            self.stdout.write(
+                f"{nombre:28} {len(html) / 1024:7.1f}K {html_gz / 1024:7.1f}K "
+                f"{crudo / 1024:7.1f}K {comprimido / 1024:8.1f}K "
+                f"{(html_gz + comprimido) / 1024:11.1f}K {html_gz / 1024:12.1f}K {ms:9.2f}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Total {len(PAGINAS)} páginas — 1ª visita: {totales[0] / 1024:.1f}K gz | "
+            f"visitas siguientes (CSS/JS en caché): {totales[1] / 1024:.1f}K gz | "
+            f"render medio: {totales[2] / len(PAGINAS):.2f} ms"
+        ))
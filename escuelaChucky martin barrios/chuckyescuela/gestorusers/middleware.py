@@ -0,0 +1,141 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+
+# =============================================================
+#        CACHÉ DEL ROL EN SESIÓN (PerfilUsuario)
+# =============================================================
+#
+# El rol se resuelve UNA sola vez (al iniciar sesión) y queda guardado
+# en la sesión junto a una "versión" del perfil. Cada vez que la fila
+# PerfilUsuario cambia, la versión guardada en la caché se renueva
+# (ver gestorusers/signals.py) y la sesión vuelve a consultarla.
+
+SESSION_KEY_PERFIL = "_perfil_rol"
+
+
+def _clave_version(user_id):
+    return f"perfil:version:{user_id}"
+
+
+def version_perfil(user_id):
+    """
+    Devuelve la versión actual del perfil del usuario.
+    Si la caché no la tiene (expiró o se reinició), se crea una nueva,
+    lo que obliga a re-consultar el rol una vez: nunca se sirve un rol viejo.
+    """
+    clave = _clave_version(user_id)
+    version = cache.get(clave)
+    if version is None:
+        cache.add(clave, time.time_ns(), timeout=None)
+        version = cache.get(clave)
+    return version
+
+
+def invalidar_perfil(user_id):
+    """Renueva la versión del perfil: todas las sesiones del usuario re-consultan el rol."""
+    cache.set(_clave_version(user_id), time.time_ns(), timeout=None)
+
+
+def guardar_perfil_en_sesion(request, perfil, estudiante_id=None):
+    """
+    Guarda (o limpia si perfil es None) el rol del usuario en la sesión
+    y lo deja disponible como request.perfil / request.rol, junto al id
+    de su Estudiante como request.estudiante_id (None si no tiene).
+    """
+    if perfil is None:
+        request.session.pop(SESSION_KEY_PERFIL, None)
+        request.perfil = None
+        request.rol = None
+        request.estudiante_id = None
+        return
+
+    request.session[SESSION_KEY_PERFIL] = {
+        "id": perfil.id,
+        "rol": perfil.rol,
+        "estudiante_id": estudiante_id,
+        "version": version_perfil(perfil.user_id),
+    }
+    request.perfil = perfil
+    request.rol = perfil.rol
+    request.estudiante_id = estudiante_id
+
+
+def resolver_perfil(request, user):
+    """
+    Obtiene el PerfilUsuario del usuario y lo guarda en sesión.
+    Con PerfilUsuarioBackend el perfil y el Estudiante ya vienen cargados
+    junto al User (select_related) y no se hace ninguna consulta.
+    """
+    # RelatedObjectDoesNotExist hereda de AttributeError → None si no tiene perfil
+    perfil = getattr(user, "perfilusuario", None)
+    estudiante = getattr(user, "estudiante", None) if perfil is not None else None
+    guardar_perfil_en_sesion(request, perfil, estudiante.id if estudiante else None)
+
+
+class PerfilUsuarioMiddleware:
+    """
+    Expone request.rol y request.perfil sin consultar PerfilUsuario en
+    cada request. Debe ir DESPUÉS de AuthenticationMiddleware.
+
+    - request.rol           → 'estudiante' / 'docente' / 'administrador' (o None)
+    - request.perfil        → PerfilUsuario perezoso: solo se consulta si se usa.
+    - request.estudiante_id → id del Estudiante del usuario (o None).
+
+    Es síncrono y asíncrono: bajo ASGI no obliga a pasar a un hilo antes
+    de las vistas async (ver chuckyescuela/asgi.py).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request.rol = None
+        request.perfil = None
+        request.estudiante_id = None
+
+        user = request.user
+        if user.is_authenticated and not _rol_desde_sesion(
+            request, user, request.session.get(SESSION_KEY_PERFIL)
+        ):
+            resolver_perfil(request, user)
+
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.rol = None
+        request.perfil = None
+        request.estudiante_id = None
+
+        user = await request.auser()
+        # Ya cargado: plantillas y código síncrono no lo vuelven a consultar
+        request.user = user
+        if user.is_authenticated and not _rol_desde_sesion(
+            request, user, await request.session.aget(SESSION_KEY_PERFIL)
+        ):
+            await sync_to_async(resolver_perfil)(request, user)
+
+        return await self.get_response(request)
+
+
+def _rol_desde_sesion(request, user, datos):
+    """Usa el rol guardado en sesión si sigue vigente; False si hay que resolverlo."""
+    # Sesiones anteriores a estudiante_id también se resuelven de nuevo
+    if not datos or "estudiante_id" not in datos or datos.get("version") != version_perfil(user.id):
+        return False
+    request.rol = datos["rol"]
+    request.estudiante_id = datos["estudiante_id"]
+    # Con PerfilUsuarioBackend ya viene cargado junto al User
+    request.perfil = SimpleLazyObject(lambda: user.perfilusuario)
+    return True
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 
 
@@ -18,6 +20,12 @@ class PerfilUsuario(models.Model):
     rol = models.CharField(max_length=20, choices=ROLES, default="estudiante")
     fecha_creacion = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # ✔ Conteos y listados por rol
+            models.Index(fields=["rol"], name="perfil_rol_idx"),
+        ]
+
     def __str__(self):
         # Mostramos el rol con su etiqueta legible (Estudiante / Usuario normal / Administrador)
         return f"{self.user.username} — {self.get_rol_display()}"
@@ -26,6 +34,36 @@ class PerfilUsuario(models.Model):
 # =====================================================
 #   ESTUDIANTE (Datos adicionales)
 # =====================================================
+class EstudianteQuerySet(models.QuerySet):
+
+    def with_enrollment_stats(self):
+        """
+        Agrega a cada estudiante, en la misma consulta:
+          - total_cursos         → cantidad de inscripciones
+          - primera_inscripcion  → fecha_inscripcion más antigua (o None)
+          - ultima_inscripcion   → fecha_inscripcion más reciente (o None)
+
+        Con subconsultas por fila (índice insc_estudiante_fecha_idx) y no con
+        JOIN + GROUP BY: así un listado paginado lee solo las filas de la
+        página en vez de agrupar a todos los estudiantes antes de ordenar.
+        """
+        # gestorcursos importa este módulo: el modelo se toma de la relación
+        Inscripcion = self.model._meta.get_field("inscripcion").related_model
+        propias = (
+            Inscripcion.objects.filter(estudiante=OuterRef("pk"))
+            .order_by().values("estudiante")
+        )
+        return self.annotate(
+            total_cursos=Coalesce(Subquery(propias.annotate(n=Count("id")).values("n")), 0),
+            primera_inscripcion=Subquery(
+                propias.annotate(f=Min("fecha_inscripcion")).values("f")
+            ),
+            ultima_inscripcion=Subquery(
+                propias.annotate(f=Max("fecha_inscripcion")).values("f")
+            ),
+        )
+
+
 class Estudiante(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     rut = models.CharField(max_length=20, unique=True)
@@ -33,6 +71,14 @@ class Estudiante(models.Model):
     nivel = models.CharField(max_length=50, blank=True, null=True)
     fecha_registro = models.DateField(auto_now_add=True)
 
+    objects = EstudianteQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # ✔ Cohortes por nivel (inscripción masiva) y lista de niveles
+            models.Index(fields=["nivel"], name="estudiante_nivel_idx"),
+        ]
+
     def __str__(self):
         return f"Estudiante: {self.user.first_name} {self.user.last_name}"
 
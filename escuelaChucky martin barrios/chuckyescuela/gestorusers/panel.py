@@ -0,0 +1,64 @@
+"""
+Caché del panel del estudiante (panel_estudiante).
+
+El resumen de cada estudiante (sus cursos inscritos y el total) sale de UNA
+consulta con JOIN a Curso, ordenada por el índice insc_estudiante_fecha_idx;
+el total es la cantidad de filas, sin un count() aparte.
+
+La clave incluye la versión del catálogo (gestorcursos/catalogo.py): si se
+edita o elimina un curso, los resúmenes que lo muestran quedan obsoletos
+solos. Las inscripciones del estudiante borran su entrada al guardarse o
+eliminarse (gestorusers/signals.py).
+
+Ojo: bulk_create / QuerySet.update / QuerySet.delete de Inscripcion no
+disparan señales; quien los use debe llamar a invalidar(estudiante_ids).
+"""
+
+from django.core.cache import cache
+
+from chuckyescuela.db.replicas import en_primario
+from gestorcursos import catalogo
+from gestorcursos.models import Inscripcion
+
+
+DURACION = 60 * 60 * 24
+
+CAMPOS_CURSO = ("id", "nombre", "nivel", "descripcion")
+
+
+def _clave(estudiante_id, version=None):
+    return f"panel:{catalogo.version() if version is None else version}:{estudiante_id}"
+
+
+def _construir(estudiante_id):
+    filas = (
+        Inscripcion.objects.filter(estudiante_id=estudiante_id, curso__eliminando=False)
+        .order_by("fecha_inscripcion", "id")
+        .values_list(*(f"curso__{campo}" for campo in CAMPOS_CURSO))
+    )
+    cursos = [dict(zip(CAMPOS_CURSO, fila)) for fila in filas]
+    return {"cursos": cursos, "total_cursos": len(cursos)}
+
+
+def resumen(estudiante_id):
+    """
+    {"cursos": [dict(id, nombre, nivel, descripcion)], "total_cursos": n}
+    del estudiante, desde la caché. Sin Estudiante (None) → resumen vacío.
+    """
+    if estudiante_id is None:
+        return {"cursos": [], "total_cursos": 0}
+
+    clave = _clave(estudiante_id)
+    valor = cache.get(clave)
+    if valor is None:
+        # Recién inscrito y redirigido aquí: nunca desde una réplica atrasada
+        with en_primario():
+            valor = _construir(estudiante_id)
+        cache.set(clave, valor, DURACION)
+    return valor
+
+
+def invalidar(estudiante_ids):
+    """Descarta el resumen de esos estudiantes (versión actual del catálogo)."""
+    version = catalogo.version()
+    cache.delete_many([_clave(estudiante_id, version) for estudiante_id in estudiante_ids])
@@ -0,0 +1,51 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from gestorcursos.models import Inscripcion
+from gestorusers import panel
+from gestorusers.middleware import invalidar_perfil, resolver_perfil
+from gestorusers.models import Estudiante, PerfilUsuario
+
+
+# =============================================================
+#     INVALIDAR EL ROL EN SESIÓN CUANDO CAMBIA PerfilUsuario
+# =============================================================
+
+@receiver(post_save, sender=PerfilUsuario)
+@receiver(post_delete, sender=PerfilUsuario)
+def perfil_modificado(sender, instance, **kwargs):
+    invalidar_perfil(instance.user_id)
+
+
+# El id del Estudiante también va en la sesión (request.estudiante_id)
+@receiver(post_save, sender=Estudiante)
+@receiver(post_delete, sender=Estudiante)
+def estudiante_modificado(sender, instance, created=True, **kwargs):
+    if created:
+        invalidar_perfil(instance.user_id)
+
+
+# =============================================================
+#     PANEL DEL ESTUDIANTE EN CACHÉ (gestorusers/panel.py)
+# =============================================================
+
+@receiver(post_save, sender=Inscripcion)
+@receiver(post_delete, sender=Inscripcion)
+def inscripcion_modificada(sender, instance, **kwargs):
+    # Igual que el catálogo: ahora y al confirmar, por si otra petición
+    # llenó la caché con la transacción todavía abierta
+    estudiantes = [instance.estudiante_id]
+    panel.invalidar(estudiantes)
+    transaction.on_commit(lambda: panel.invalidar(estudiantes))
+
+
+# =============================================================
+#          RESOLVER EL ROL UNA SOLA VEZ AL INICIAR SESIÓN
+# =============================================================
+
+@receiver(user_logged_in)
+def cargar_perfil_al_login(sender, request, user, **kwargs):
+    if request is not None:
+        resolver_perfil(request, user)
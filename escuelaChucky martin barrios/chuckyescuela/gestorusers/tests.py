@@ -1,3 +1,522 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from chuckyescuela.db import consultas
+from chuckyescuela.pruebas import PresupuestoConsultasMixin
+from gestorusers import importacion, middleware, urls
+from gestorusers.decorators import role_required
+from gestorusers.models import Estudiante, PerfilUsuario
+from gestorcursos import cohortes
+from gestorcursos.models import Curso, Inscripcion
+
+
+def crear_usuario(correo, rol, password="Chucky123*"):
+    user = User.objects.create_user(username=correo, email=correo, password=password)
+    PerfilUsuario.objects.create(user=user, rol=rol)
+    return user
+
+
+def crear_estudiante(n, cursos=()):
+    user = crear_usuario(f"estudiante{n}@chucky.cl", "estudiante")
+    est = Estudiante.objects.create(user=user, rut=f"{n}-K")
+    for curso in cursos:
+        Inscripcion.objects.create(estudiante=est, curso=curso)
+    return est
+
+
+# =============================================================
+#        ESTUDIANTES — with_enrollment_stats()
+# =============================================================
+
+class EnrollmentStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cursos = [Curso.objects.create(nombre=f"Curso {i}") for i in range(3)]
+
+    def test_estadisticas_por_estudiante(self):
+        con_cursos = crear_estudiante(1, self.cursos)
+        sin_cursos = crear_estudiante(2)
+
+        stats = {e.id: e for e in Estudiante.objects.with_enrollment_stats()}
+
+        self.assertEqual(stats[con_cursos.id].total_cursos, 3)
+        self.assertIsNotNone(stats[con_cursos.id].primera_inscripcion)
+        self.assertLessEqual(
+            stats[con_cursos.id].primera_inscripcion,
+            stats[con_cursos.id].ultima_inscripcion,
+        )
+        self.assertEqual(stats[sin_cursos.id].total_cursos, 0)
+        self.assertIsNone(stats[sin_cursos.id].ultima_inscripcion)
+
+
+class AdminListarEstudiantesQueryCountTests(TestCase):
+
+    def setUp(self):
+        self.cursos = [Curso.objects.create(nombre=f"Curso {i}") for i in range(2)]
+        crear_usuario("admin@chucky.cl", "administrador")
+        self.client.login(username="admin@chucky.cl", password="Chucky123*")
+        self.url = reverse("admin_listar_estudiantes")
+
+    def contar_consultas(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_cantidad_de_consultas_no_depende_de_los_estudiantes(self):
+        crear_estudiante(1, self.cursos)
+        con_uno = self.contar_consultas()
+
+        for n in range(2, 30):
+            crear_estudiante(n, self.cursos)
+        con_muchos = self.contar_consultas()
+
+        self.assertEqual(con_uno, con_muchos)
+
+
+# =============================================================
+#     PANEL DEL ESTUDIANTE — caché (gestorusers/panel.py)
+# =============================================================
+
+class PanelEstudianteCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.cursos = [Curso.objects.create(nombre=f"Curso {i}", nivel="1° Medio") for i in range(4)]
+        self.estudiante = crear_estudiante(1, self.cursos[:2])
+        self.client.force_login(self.estudiante.user)
+
+    def visitar(self):
+        with consultas.medir() as medicion:
+            response = self.client.get(reverse("panel_estudiante"))
+        self.assertEqual(response.status_code, 200)
+        return response, medicion.consultas
+
+    def nombres(self, response):
+        return [curso["nombre"] for curso in response.context["cursos"]]
+
+    def test_una_consulta_y_luego_desde_la_cache(self):
+        response, primera = self.visitar()
+        self.assertEqual(self.nombres(response), ["Curso 0", "Curso 1"])
+        self.assertEqual(response.context["total_cursos"], 2)
+        self.assertContains(response, reverse("ver_curso", args=[self.cursos[1].id]))
+
+        response, segunda = self.visitar()
+        self.assertEqual(segunda, primera - 1)
+        self.assertEqual(response.context["total_cursos"], 2)
+
+    def test_inscribir_y_desinscribir_invalidan(self):
+        self.visitar()
+        Inscripcion.objects.inscribir(self.estudiante.id, self.cursos[2].id)
+        response, _ = self.visitar()
+        self.assertEqual(response.context["total_cursos"], 3)
+
+        Inscripcion.objects.get(estudiante=self.estudiante, curso=self.cursos[0]).delete()
+        response, _ = self.visitar()
+        self.assertEqual(self.nombres(response), ["Curso 1", "Curso 2"])
+
+    def test_editar_un_curso_invalida(self):
+        self.visitar()
+        self.cursos[0].nombre = "Álgebra"
+        self.cursos[0].save()
+        response, _ = self.visitar()
+        self.assertEqual(self.nombres(response), ["Álgebra", "Curso 1"])
+
+    def test_inscripcion_masiva_invalida(self):
+        self.visitar()
+        cohortes.inscribir([self.estudiante.id], [c.id for c in self.cursos])
+        response, _ = self.visitar()
+        self.assertEqual(response.context["total_cursos"], 4)
+
+    def test_no_mezcla_estudiantes(self):
+        self.visitar()
+        otro = crear_estudiante(2, self.cursos[3:])
+        self.client.force_login(otro.user)
+        response, _ = self.visitar()
+        self.assertEqual(self.nombres(response), ["Curso 3"])
+
+
+# =============================================================
+#          SESIONES Y MENSAJES — sin escrituras por página
+# =============================================================
+
+class _PaginasTipicasMixin:
+
+    def setUp(self):
+        self.curso = Curso.objects.create(nombre="Historia")
+        self.estudiante = crear_estudiante(1)
+        self.client.login(username="estudiante1@chucky.cl", password="Chucky123*")
+        # Primera petición: el rol queda guardado en la sesión
+        self.client.get(reverse("panel_estudiante"))
+
+    def consultas_a_la_sesion(self):
+        """Recorre páginas típicas (con un mensaje de por medio) y devuelve las consultas a django_session."""
+        with CaptureQueriesContext(connection) as ctx:
+            for nombre in ("panel_estudiante", "mis_cursos", "listar_cursos"):
+                self.assertEqual(self.client.get(reverse(nombre)).status_code, 200)
+            response = self.client.get(
+                reverse("inscribir_en_curso", args=[self.curso.id]), follow=True
+            )
+            self.assertEqual(len(response.context["messages"]), 1)
+        return [q["sql"] for q in ctx.captured_queries if "django_session" in q["sql"]]
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+class SesionEnBaseDeDatosTests(_PaginasTipicasMixin, TestCase):
+
+    def test_solo_lee_la_sesion(self):
+        consultas = self.consultas_a_la_sesion()
+        self.assertTrue(consultas)
+        self.assertTrue(all(sql.lstrip().upper().startswith("SELECT") for sql in consultas))
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+class SesionCachedDbTests(_PaginasTipicasMixin, TestCase):
+
+    def test_no_toca_la_tabla(self):
+        self.assertEqual(self.consultas_a_la_sesion(), [])
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+class SesionEnCookieTests(_PaginasTipicasMixin, TestCase):
+
+    def test_no_toca_la_tabla(self):
+        self.assertEqual(self.consultas_a_la_sesion(), [])
+
+
+# =============================================================
+#       PRESUPUESTO DE CONSULTAS — cada URL de gestorusers
+# =============================================================
+
+# nombre → (rol con el que se visita o None, objeto del argumento, máximo)
+PRESUPUESTOS = {
+    "index": (None, None, 0),
+    "login": (None, None, 0),
+    "registro": (None, None, 0),
+    "logout": ("estudiante", None, 4),
+    # Sesión + usuario + la consulta del panel (caché vacía); la async hace 4
+    "panel_estudiante": ("estudiante", None, 4),
+    "panel_usuario": ("docente", None, 2),
+    "panel_admin": ("administrador", None, 2),
+    "admin_listar_estudiantes": ("administrador", None, 3),
+    "admin_exportar_estudiantes": ("administrador", None, 3),
+    "admin_crear_estudiante": ("administrador", None, 2),
+    "admin_importar_estudiantes": ("administrador", None, 2),
+    "admin_editar_estudiante": ("administrador", "estudiante", 4),
+    "admin_eliminar_estudiante": ("administrador", "estudiante_a_eliminar", 7),
+    "admin_tareas": ("administrador", None, 3),
+    "admin_reportes": ("administrador", None, 15),
+    "admin_estadisticas_bd": ("administrador", None, 2),
+}
+
+# Las que cambian datos solo aceptan POST
+SOLO_POST = {"admin_eliminar_estudiante"}
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+    modulo_urls = urls
+    presupuestos = PRESUPUESTOS
+    solo_post = SOLO_POST
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.estudiante = cls.estudiantes[0]
+        cls.estudiante_a_eliminar = cls.estudiantes[1]
+
+
+# =============================================================
+#        IMPORTACIÓN MASIVA (gestorusers/importacion.py)
+# =============================================================
+
+def _fila(n, **cambios):
+    return {
+        "nombre": "Ana", "apellido": f"Pérez {n}", "correo": f"importada{n}@chucky.cl",
+        "rut": f"{n}-I", "nivel": "1° Medio", "password": "", **cambios,
+    }
+
+
+def _csv(*filas):
+    lineas = [",".join(importacion.COLUMNAS)]
+    lineas += [",".join(fila[c] for c in importacion.COLUMNAS) for fila in filas]
+    return "\n".join(lineas).encode()
+
+
+class ImportacionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.existente = crear_estudiante(1)  # estudiante1@chucky.cl, RUT 1-K
+
+    def test_validar_duplicados_y_correos_invalidos(self):
+        validas, errores = importacion.validar([
+            _fila(1),                                    # fila 2: válida
+            _fila(2, correo="ESTUDIANTE1@chucky.cl"),    # 3: correo ya en la base
+            _fila(3, rut="1-K"),                         # 4: RUT ya en la base
+            _fila(4, correo="importada1@chucky.cl"),     # 5: correo repetido en el archivo
+            _fila(5, rut="1-I"),                         # 6: RUT repetido en el archivo
+            _fila(6, correo="no-es-correo"),             # 7: correo inválido
+            _fila(7, rut=""),                            # 8: falta el RUT
+            _fila(8),                                    # 9: válida
+        ])
+
+        self.assertEqual([d["fila"] for d in validas], [2, 9])
+        self.assertEqual([fila for fila, _ in errores], [3, 4, 5, 6, 7, 8])
+        mensajes = dict(errores)
+        self.assertIn("Ya existe un usuario", mensajes[3])
+        self.assertIn("Ya existe un estudiante", mensajes[4])
+        self.assertIn("(fila 2)", mensajes[5])
+        self.assertIn("(fila 2)", mensajes[6])
+        self.assertIn("Correo inválido", mensajes[7])
+        self.assertIn("rut", mensajes[8])
+
+    def test_importar_crea_usuario_perfil_y_estudiante(self):
+        validas, _ = importacion.validar([_fila(1, password="Secreta123*"), _fila(2)])
+
+        self.assertEqual(importacion.importar(validas, procesos=1), 2)
+
+        estudiante = Estudiante.objects.select_related("user__perfilusuario").get(rut="1-I")
+        self.assertEqual(estudiante.user.perfilusuario.rol, "estudiante")
+        self.assertTrue(estudiante.user.check_password("Secreta123*"))
+        self.assertTrue(User.objects.get(username="importada2@chucky.cl").check_password(
+            importacion.PASSWORD_POR_DEFECTO
+        ))
+
+    def test_importar_es_todo_o_nada(self):
+        validas, errores = importacion.validar([_fila(1), _fila(2), _fila(3)])
+        self.assertEqual(errores, [])
+
+        # Otro proceso registra el RUT de la última fila después de validar
+        Estudiante.objects.create(user=crear_usuario("otro@chucky.cl", "estudiante"), rut="3-I")
+
+        with self.assertRaises(importacion.ImportacionError):
+            importacion.importar(validas, procesos=1)
+        self.assertFalse(User.objects.filter(username__startswith="importada").exists())
+        self.assertFalse(Estudiante.objects.filter(rut__in=["1-I", "2-I"]).exists())
+
+    def test_vista_informa_el_choque_sin_error_500(self):
+        self.client.force_login(crear_usuario("admin-importa@chucky.cl", "administrador"))
+        archivo = SimpleUploadedFile("alumnos.csv", _csv(_fila(1), _fila(2, rut="1-K")))
+
+        # validar() no ve el RUT 1-K (se creó "después"); importar() choca con él
+        existentes = importacion._existentes
+        llamadas = []
+
+        def sin_ver_la_base(correos, ruts):
+            llamadas.append(ruts)
+            return set() if len(llamadas) == 1 else existentes(correos, ruts)
+
+        with mock.patch.object(importacion, "_existentes", sin_ver_la_base):
+            response = self.client.post(reverse("admin_importar_estudiantes"), {"archivo": archivo})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "No se importó ningún estudiante")
+        self.assertEqual([fila for fila, _ in response.context["errores"]], [3])
+        self.assertFalse(User.objects.filter(username__startswith="importada").exists())
+
+    def test_comando(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        ruta = os.path.join(carpeta.name, "alumnos.csv")
+        with open(ruta, "wb") as archivo:
+            archivo.write(_csv(_fila(1), _fila(2), _fila(3, correo="malo")))
+
+        salida, errores = io.StringIO(), io.StringIO()
+        call_command("importar_estudiantes", ruta, "--solo-validar", stdout=salida, stderr=errores)
+        self.assertIn("Filas válidas: 2", salida.getvalue())
+        self.assertIn("Fila 4: Correo inválido", errores.getvalue())
+        self.assertFalse(Estudiante.objects.filter(rut__endswith="-I").exists())
+
+        salida = io.StringIO()
+        call_command("importar_estudiantes", ruta, "--procesos=1", stdout=salida, stderr=io.StringIO())
+        self.assertIn("Estudiantes creados: 2", salida.getvalue())
+        self.assertEqual(Estudiante.objects.filter(rut__endswith="-I").count(), 2)
+
+        with self.assertRaises(CommandError):
+            call_command("importar_estudiantes", os.path.join(carpeta.name, "no-existe.csv"))
+
+
+# =============================================================
+#     ROL EN SESIÓN (PerfilUsuarioMiddleware) y @role_required
+# =============================================================
+
+class RolEnSesionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.estudiante = crear_estudiante(1)
+        cls.user = cls.estudiante.user
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username=self.user.username, password="Chucky123*")
+        resolver = mock.patch.object(middleware, "resolver_perfil", wraps=middleware.resolver_perfil)
+        self.resolver = resolver.start()
+        self.addCleanup(resolver.stop)
+
+    def perfil_en_sesion(self):
+        return self.client.session[middleware.SESSION_KEY_PERFIL]
+
+    def test_se_resuelve_al_iniciar_sesion_y_no_en_cada_pagina(self):
+        self.assertEqual(
+            {k: v for k, v in self.perfil_en_sesion().items() if k != "id"},
+            {"rol": "estudiante", "estudiante_id": self.estudiante.id,
+             "version": middleware.version_perfil(self.user.id)},
+        )
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse("panel_estudiante")).status_code, 200)
+        self.resolver.assert_not_called()
+
+    def test_cambio_de_rol_invalida_la_sesion(self):
+        self.assertRedirects(
+            self.client.get(reverse("panel_admin")), reverse("panel_estudiante"),
+            fetch_redirect_response=False,
+        )
+
+        perfil = self.user.perfilusuario
+        perfil.rol = "administrador"
+        perfil.save()
+
+        self.assertEqual(self.client.get(reverse("panel_admin")).status_code, 200)
+        self.assertEqual(self.resolver.call_count, 1)
+        self.assertEqual(self.perfil_en_sesion()["rol"], "administrador")
+
+        # Ya resuelto de nuevo: la siguiente página vuelve a usar la sesión
+        self.client.get(reverse("panel_admin"))
+        self.assertEqual(self.resolver.call_count, 1)
+
+    def test_version_nueva_o_perdida_obliga_a_resolver(self):
+        anterior = self.perfil_en_sesion()["version"]
+        middleware.invalidar_perfil(self.user.id)
+        self.client.get(reverse("panel_estudiante"))
+        self.assertEqual(self.resolver.call_count, 1)
+        self.assertNotEqual(self.perfil_en_sesion()["version"], anterior)
+
+        # La caché se reinició: tampoco se confía en la versión guardada
+        cache.clear()
+        self.client.get(reverse("panel_estudiante"))
+        self.assertEqual(self.resolver.call_count, 2)
+        self.assertEqual(self.perfil_en_sesion()["version"], middleware.version_perfil(self.user.id))
+
+    def test_usuario_sin_perfil_vuelve_al_inicio(self):
+        User.objects.create_user(username="sinperfil@chucky.cl", password="Chucky123*")
+        self.client.login(username="sinperfil@chucky.cl", password="Chucky123*")
+
+        response = self.client.get(reverse("panel_admin"))
+        self.assertRedirects(response, reverse("index"), fetch_redirect_response=False)
+        self.assertNotIn(middleware.SESSION_KEY_PERFIL, self.client.session)
+
+    async def test_middleware_async(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("panel_admin"))
+        self.assertRedirects(response, reverse("panel_estudiante"), fetch_redirect_response=False)
+
+    def test_role_required_sync_y_async(self):
+        @role_required("administrador", "docente", mensaje="Solo personal.")
+        def vista(request):
+            return HttpResponse("ok")
+
+        @role_required("administrador", "docente", mensaje="Solo personal.")
+        async def vista_async(request):
+            return HttpResponse("ok")
+
+        self.assertTrue(iscoroutinefunction(vista_async))
+        casos = {
+            "administrador": None,
+            "docente": None,
+            "estudiante": reverse("panel_estudiante"),
+            None: reverse("index"),
+        }
+        for funcion in (vista, async_to_sync(vista_async)):
+            for rol, redireccion in casos.items():
+                with self.subTest(funcion=funcion, rol=rol):
+                    request = RequestFactory().get("/")
+                    request.rol = rol
+                    request._messages = CookieStorage(request)
+                    response = funcion(request)
+
+                    mensajes = [str(m) for m in request._messages]
+                    if redireccion is None:
+                        self.assertEqual(response.content, b"ok")
+                        self.assertEqual(mensajes, [])
+                    else:
+                        self.assertRedirects(response, redireccion, fetch_redirect_response=False)
+                        self.assertEqual(mensajes, ["Solo personal."])
+
+
+# =============================================================
+#   LOGIN — PerfilUsuarioBackend y PBKDF2ConfigurableHasher
+# =============================================================
+
+class LoginTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.estudiante = crear_estudiante(1)
+        cls.user = cls.estudiante.user
+
+    def setUp(self):
+        cache.clear()
+
+    def test_login_en_una_consulta_y_rol_en_sesion(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("login"), {"correo": self.user.username, "password": "Chucky123*"})
+        self.assertRedirects(response, reverse("panel_estudiante"), fetch_redirect_response=False)
+
+        # User + PerfilUsuario + Estudiante en la misma consulta; nada más las lee
+        lecturas = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")
+                    and ("gestorusers_perfilusuario" in q["sql"] or '"auth_user"' in q["sql"])]
+        self.assertEqual(len(lecturas), 1)
+        self.assertIn("gestorusers_perfilusuario", lecturas[0])
+        self.assertIn("gestorusers_estudiante", lecturas[0])
+        # + last_login y la sesión (db: existe, insert y update al rotar la clave)
+        sentencias = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(sentencias), 5)
+
+        sesion = self.client.session
+        self.assertEqual(sesion["_auth_user_backend"], "gestorusers.backends.PerfilUsuarioBackend")
+        self.assertEqual(sesion[middleware.SESSION_KEY_PERFIL], {
+            "id": self.user.perfilusuario.id, "rol": "estudiante",
+            "estudiante_id": self.estudiante.id, "version": middleware.version_perfil(self.user.id),
+        })
+
+    def test_credenciales_incorrectas_no_pasan_a_model_backend(self):
+        with mock.patch("django.contrib.auth.backends.ModelBackend.authenticate") as model_backend:
+            for correo in (self.user.username, "nadie@chucky.cl"):
+                response = self.client.post(reverse("login"), {"correo": correo, "password": "otra"})
+                self.assertRedirects(response, reverse("login"), fetch_redirect_response=False)
+        # PerfilUsuarioBackend hereda de ModelBackend pero no llama a su authenticate
+        model_backend.assert_not_called()
+        self.assertNotIn("_auth_user_id", self.client.session)
+
+    def test_sesion_iniciada_con_model_backend_sigue_valida(self):
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(reverse("panel_estudiante")).status_code, 200)
+
+    def test_iteraciones_nunca_bajan_del_default_de_django(self):
+        minimo = PBKDF2PasswordHasher.iterations
+        for configuradas, esperadas in ((None, minimo), (1000, minimo), (minimo + 1, minimo + 1)):
+            with self.subTest(configuradas=configuradas), \
+                    override_settings(PASSWORD_PBKDF2_ITERATIONS=configuradas):
+                hasher = get_hasher("default")
+                self.assertEqual(hasher.iterations, esperadas)
+                # Un hash con el costo de Django no se re-hashea a la baja
+                self.assertEqual(
+                    hasher.must_update(hasher.encode("x", hasher.salt(), minimo)), esperadas != minimo,
+                )
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -18,7 +19,12 @@ urlpatterns = [
     # =========================================
     #      PANEL SEGÚN TIPO DE USUARIO
     # =========================================
-    path("panel/estudiante/", views.panel_estudiante, name="panel_estudiante"),
+    # Con VISTAS_ASYNC (despliegue ASGI) se sirve la versión async
+    path(
+        "panel/estudiante/",
+        views.panel_estudiante_async if settings.VISTAS_ASYNC else views.panel_estudiante,
+        name="panel_estudiante",
+    ),
     path("panel/usuario/", views.panel_usuario, name="panel_usuario"),
     path("panel/admin/", views.panel_admin, name="panel_admin"),
 
@@ -31,6 +37,13 @@ urlpatterns = [
         name="admin_listar_estudiantes"
     ),
 
+    #  Exportar estudiantes a CSV (streaming)
+    path(
+        "admin/estudiantes/exportar/",
+        views.admin_exportar_estudiantes,
+        name="admin_exportar_estudiantes"
+    ),
+
     #  NUEVO: Crear estudiante (ADMIN)
     path(
         "admin/estudiantes/nuevo/",
@@ -38,6 +51,13 @@ urlpatterns = [
         name="admin_crear_estudiante"
     ),
 
+    #  Importación masiva de estudiantes (CSV / XLSX)
+    path(
+        "admin/estudiantes/importar/",
+        views.admin_importar_estudiantes,
+        name="admin_importar_estudiantes"
+    ),
+
     #  Editar estudiante (ADMIN)
     path(
         "admin/estudiantes/<int:estudiante_id>/editar/",
@@ -52,6 +72,15 @@ urlpatterns = [
         name="admin_eliminar_estudiante"
     ),
 
+    # =========================================
+    #   MÓDULO ADMIN – TAREAS EN SEGUNDO PLANO
+    # =========================================
+    path(
+        "admin/tareas/",
+        views.admin_tareas,
+        name="admin_tareas"
+    ),
+
     # =========================================
     #     ⚡ MÓDULO ADMIN – REPORTES
     # =========================================
@@ -60,4 +89,11 @@ urlpatterns = [
         views.admin_reportes,
         name="admin_reportes"
     ),
+
+    # Métricas del pool de conexiones del proceso (JSON)
+    path(
+        "admin/bd/estadisticas/",
+        views.admin_estadisticas_bd,
+        name="admin_estadisticas_bd"
+    ),
 ]
@@ -1,12 +1,25 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.http import JsonResponse
 from django.urls import reverse
-
+from django.views.decorators.http import require_POST
+
+from chuckyescuela.db import pool
+from chuckyescuela.db.replicas import usar_replica
+from chuckyescuela.exportacion import filas_por_lotes, respuesta_csv
+from chuckyescuela.paginacion import paginar
+from gestorusers import importacion, panel
+from gestorusers.decorators import redirigir_a_panel, role_required
 from gestorusers.models import Estudiante, Docente, Administrador, PerfilUsuario
+from gestorcursos import busqueda, catalogo
 from gestorcursos.models import Curso, Asignatura, Inscripcion
+from gestorreportes import rollups
+from gestortareas import eliminacion, tareas
+from gestortareas.models import Tarea
 
 
 # =============================================================
@@ -37,18 +50,10 @@ def login_view(request):
             messages.error(request, "Credenciales incorrectas.")
             return redirect("login")
 
+        # login() dispara user_logged_in → el rol queda cacheado en sesión
         login(request, user)
 
-        perfil = PerfilUsuario.objects.get(user=user)
-
-        if perfil.rol == "administrador":
-            return redirect("panel_admin")
-        elif perfil.rol == "docente":
-            # Rol docente = usuario normal según rúbrica
-            return redirect("panel_usuario")
-        else:
-            # estudiante
-            return redirect("panel_estudiante")
+        return redirigir_a_panel(request.rol)
 
     # Cuando llegas por GET (por ejemplo desde registro), precarga el correo
     correo_inicial = request.GET.get("correo", "")
@@ -138,69 +143,36 @@ def registro_view(request):
 # =============================================================
 
 @login_required
+@role_required("estudiante", mensaje="No tiene permisos para acceder al panel de estudiante.")
 def panel_estudiante(request):
     """
     Panel exclusivo para rol 'estudiante'.
-    Muestra los cursos inscritos + total de cursos.
+    Muestra los cursos inscritos + total de cursos, desde la caché del
+    panel (gestorusers/panel.py): una consulta con JOIN solo si no está.
     """
-
-    perfil = PerfilUsuario.objects.get(user=request.user)
-    if perfil.rol != "estudiante":
-        messages.error(request, "No tiene permisos para acceder al panel de estudiante.")
-        if perfil.rol == "administrador":
-            return redirect("panel_admin")
-        else:  # docente / usuario normal
-            return redirect("panel_usuario")
-
-    try:
-        estudiante = Estudiante.objects.get(user=request.user)
-        inscripciones = Inscripcion.objects.filter(estudiante=estudiante)
-        total_cursos = inscripciones.count()
-    except Estudiante.DoesNotExist:
-        inscripciones = []
-        total_cursos = 0
-
-    return render(request, "usuarios/panel_estudiante.html", {
-        "inscripciones": inscripciones,
-        "total_cursos": total_cursos,
-    })
+    return render(request, "usuarios/panel_estudiante.html", panel.resumen(request.estudiante_id))
 
 
 @login_required
+@role_required("docente", mensaje="No tiene permisos para acceder al panel de usuario.")
 def panel_usuario(request):
     """
     Panel exclusivo para el rol 'docente',
     que en la rúbrica funciona como 'usuario normal'.
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
-    if perfil.rol != "docente":
-        messages.error(request, "No tiene permisos para acceder al panel de usuario.")
-        if perfil.rol == "administrador":
-            return redirect("panel_admin")
-        else:  # estudiante
-            return redirect("panel_estudiante")
-
     # Aquí podrías cargar info propia del usuario normal (docente),
     # por ahora solo mostramos el panel base.
     return render(request, "usuarios/panel_usuario.html")
 
 
 @login_required
+@role_required("administrador", mensaje="No tiene permisos para acceder al panel de administración.")
 def panel_admin(request):
     """
     Panel principal del administrador.
     Solo accesible para usuarios con rol 'administrador'.
     """
-    perfil = PerfilUsuario.objects.get(user=request.user)
-
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder al panel de administración.")
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:  # docente / usuario normal
-            return redirect("panel_usuario")
-
     return render(request, "usuarios/dashboard/admin.html")
 
 
@@ -209,39 +181,61 @@ def panel_admin(request):
 # =============================================================
 
 @login_required
+@role_required("administrador")
+@usar_replica
 def admin_listar_estudiantes(request):
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
-
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder aquí.")
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:
-            return redirect("panel_usuario")
-
-    # Traemos estudiantes + usuario relacionado
+    # Traemos estudiantes + usuario relacionado + info académica
+    # (total de cursos inscritos) en una sola consulta agregada
     estudiantes = (
         Estudiante.objects
         .select_related("user")
-        .all()
-        .order_by("-id")
+        .with_enrollment_stats()
     )
 
-    # Info académica: total de cursos inscritos por cada estudiante
-    for est in estudiantes:
-        est.total_cursos = Inscripcion.objects.filter(estudiante=est).count()
+    # Paginación por cursor (mismo paginador que admin_inscripciones)
+    pagina = paginar(request, estudiantes, ("-id",))
 
     return render(request, "usuarios/admin/estudiantes_listar.html", {
-        "estudiantes": estudiantes
+        "estudiantes": pagina.object_list,
+        "pagina": pagina,
     })
 
 
+@login_required
+@role_required("administrador")
+def admin_exportar_estudiantes(request):
+    """
+    Descarga CSV de todos los estudiantes con su total de cursos.
+    Se envía en streaming: memoria constante sin importar la cantidad de filas.
+    """
+
+    filas = filas_por_lotes(Estudiante.objects.with_enrollment_stats(), (
+        "user__first_name",
+        "user__last_name",
+        "user__email",
+        "rut",
+        "nivel",
+        "fecha_registro",
+        "total_cursos",
+    ))
+
+    return respuesta_csv(
+        "estudiantes.csv",
+        ["Nombre", "Apellido", "Correo", "RUT", "Nivel", "Fecha registro", "Cursos inscritos"],
+        (
+            (*fila[:5], fila[5].strftime("%d/%m/%Y") if fila[5] else "", fila[6])
+            for fila in filas
+        ),
+    )
+
+
 # =============================================================
 #     ADMIN — CRUD COMPLETO DE ESTUDIANTES (NUEVO)
 # =============================================================
 
 @login_required
+@role_required("administrador")
 def admin_crear_estudiante(request):
     """
     Crear un estudiante desde el panel administrador.
@@ -251,14 +245,6 @@ def admin_crear_estudiante(request):
       - Estudiante
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder aquí.")
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:
-            return redirect("panel_usuario")
-
     if request.method == "POST":
         nombre = request.POST.get("nombre")
         apellido = request.POST.get("apellido")
@@ -307,20 +293,62 @@ def admin_crear_estudiante(request):
 
 
 @login_required
+@role_required("administrador")
+def admin_importar_estudiantes(request):
+    """
+    Importación masiva de estudiantes desde una planilla CSV/XLSX.
+    Valida todas las filas antes de escribir y crea User + PerfilUsuario +
+    Estudiante en bloque (ver gestorusers/importacion.py).
+    """
+
+    errores = []
+
+    if request.method == "POST":
+        archivo = request.FILES.get("archivo")
+
+        if not archivo:
+            messages.error(request, "Debes seleccionar un archivo CSV o XLSX.")
+            return redirect("admin_importar_estudiantes")
+
+        try:
+            filas = importacion.leer_archivo(archivo, archivo.name)
+        except importacion.ImportacionError as e:
+            messages.error(request, str(e))
+            return redirect("admin_importar_estudiantes")
+
+        validas, errores = importacion.validar(filas)
+
+        if request.POST.get("solo_validar"):
+            messages.info(request, f"Validación: {len(validas)} filas válidas, {len(errores)} con errores.")
+        else:
+            # En hilos: no se levantan procesos desde una petición web
+            try:
+                creados = importacion.importar(validas, hilos=True)
+            except importacion.ImportacionError as e:
+                messages.error(request, str(e))
+                # Las filas que chocaron aparecen ahora como duplicadas
+                _, errores = importacion.validar(filas)
+                creados = 0
+            if creados:
+                messages.success(request, f"{creados} estudiantes importados correctamente.")
+            if errores:
+                messages.warning(request, f"{len(errores)} filas no se importaron (ver detalle).")
+            elif creados:
+                return redirect("admin_listar_estudiantes")
+
+    return render(request, "usuarios/admin/estudiantes_importar.html", {
+        "errores": errores,
+    })
+
+
+@login_required
+@role_required("administrador")
 def admin_editar_estudiante(request, estudiante_id):
     """
     Editar datos básicos de un estudiante:
     nombre, apellido, correo y RUT.
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder aquí.")
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:
-            return redirect("panel_usuario")
-
     est = get_object_or_404(Estudiante, id=estudiante_id)
     user = est.user
 
@@ -363,29 +391,52 @@ def admin_editar_estudiante(request, estudiante_id):
 
 
 @login_required
+@role_required("administrador")
+@require_POST
 def admin_eliminar_estudiante(request, estudiante_id):
     """
-    Eliminar un estudiante.
-    Se elimina también su usuario asociado.
+    Eliminar un estudiante (solo por POST: formulario con CSRF en el listado).
+    Se elimina también su usuario asociado. El usuario queda desactivado
+    al instante y el borrado (inscripciones por lotes, perfil, usuario) lo
+    hace el worker: python manage.py run_worker (gestortareas).
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder aquí.")
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:
-            return redirect("panel_usuario")
+    est = get_object_or_404(Estudiante.objects.select_related("user"), id=estudiante_id)
+    eliminacion.encolar_estudiante(est)
 
-    est = get_object_or_404(Estudiante, id=estudiante_id)
-    user = est.user
+    messages.success(
+        request,
+        "Estudiante eliminado: ya no puede ingresar y sus inscripciones se borran en segundo plano.",
+    )
+    return redirect("admin_listar_estudiantes")
 
-    # Aquí podrías hacer un "soft delete" si quisieras.
-    # Por ahora, borramos el usuario, lo que arrastra al Estudiante
-    user.delete()
 
-    messages.success(request, "Estudiante eliminado correctamente.")
-    return redirect("admin_listar_estudiantes")
+# =============================================================
+#          ADMIN — TAREAS EN SEGUNDO PLANO (gestortareas)
+# =============================================================
+
+@login_required
+@role_required("administrador")
+def admin_tareas(request):
+    """
+    Estado de la cola de tareas (eliminaciones por lotes): pendientes,
+    en curso con su avance, completadas y fallidas (con opción de reintentar).
+    """
+
+    if request.method == "POST":
+        tarea_id = request.POST.get("reintentar", "")
+        if tarea_id.isdigit() and tareas.reintentar(int(tarea_id)):
+            messages.success(request, f"Tarea #{tarea_id} encolada de nuevo.")
+        return redirect("admin_tareas")
+
+    pagina = paginar(request, Tarea.objects.all(), ("-id",))
+
+    return render(request, "usuarios/admin/tareas.html", {
+        "tareas": pagina.object_list,
+        "pagina": pagina,
+        # Mientras haya trabajo, la página se recarga sola
+        "activas": any(t.estado in (Tarea.PENDIENTE, Tarea.EN_CURSO) for t in pagina.object_list),
+    })
 
 
 # =============================================================
@@ -393,22 +444,26 @@ def admin_eliminar_estudiante(request, estudiante_id):
 # =============================================================
 
 @login_required
+@role_required("administrador")
+@usar_replica
 def admin_reportes(request):
     """
     Módulo de Reportes accesible solo para administradores.
-    Carga la plantilla base de reportes.
+    Lee únicamente las tablas de reportes precalculadas (gestorreportes),
+    así su costo no crece con el tamaño de Inscripcion.
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
+    return render(request, "usuarios/admin/reportes.html", rollups.resumen())
 
-    if perfil.rol != "administrador":
-        messages.error(request, "No tiene permisos para acceder aquí.")
-        if perfil.rol == "estudiante":
-            return redirect("panel_estudiante")
-        else:
-            return redirect("panel_usuario")
 
-    return render(request, "usuarios/admin/reportes.html")
+@login_required
+@role_required("administrador")
+def admin_estadisticas_bd(request):
+    """
+    Métricas del pool de conexiones (JSON). Son por proceso: cada worker
+    de gunicorn responde con las suyas (campo "pid").
+    """
+    return JsonResponse(pool.estadisticas())
 
 
 # =============================================================
@@ -416,32 +471,48 @@ def admin_reportes(request):
 # =============================================================
 
 @login_required
+@role_required("estudiante", mensaje="Solo los estudiantes pueden acceder a 'Mis cursos'.")
 def mis_cursos(request):
     """
     Vista exclusiva para estudiantes.
     Muestra cursos disponibles + inscripciones del alumno.
     """
 
-    perfil = PerfilUsuario.objects.get(user=request.user)
-    if perfil.rol != "estudiante":
-        messages.error(request, "Solo los estudiantes pueden acceder a 'Mis cursos'.")
-        if perfil.rol == "administrador":
-            return redirect("panel_admin")
-        else:
-            return redirect("panel_usuario")
-
     try:
-        estudiante = Estudiante.objects.get(user=request.user)
+        estudiante = Estudiante.objects.with_enrollment_stats().get(user=request.user)
         inscripciones = Inscripcion.objects.filter(estudiante=estudiante)
-        total_cursos = inscripciones.count()
+        total_cursos = estudiante.total_cursos
+        cursos_inscritos_ids = set(inscripciones.values_list("curso_id", flat=True))
     except Estudiante.DoesNotExist:
         inscripciones = []
         total_cursos = 0
+        cursos_inscritos_ids = set()
 
-    cursos = Curso.objects.all()
+    # Tarjetas del catálogo desde la caché + estado personal encima
+    q = request.GET.get("q", "").strip()
+    cursos = catalogo.lista_tarjetas(busqueda.buscar(q) if q else None)
 
     return render(request, "cursos/mis_cursos.html", {
         "cursos": cursos,
         "inscripciones": inscripciones,
         "total_cursos": total_cursos,
+        "cursos_inscritos_ids": cursos_inscritos_ids,
+        "q": q,
     })
+
+
+# =============================================================
+#      PANEL ESTUDIANTE — VERSIÓN ASYNC (ASGI, ver asgi.py)
+# =============================================================
+
+@login_required
+@role_required("estudiante", mensaje="No tiene permisos para acceder al panel de estudiante.")
+async def panel_estudiante_async(request):
+    """
+    Igual que panel_estudiante. La caché y (si falta) su única consulta
+    corren en un solo salto al hilo síncrono, junto con el render.
+    """
+    def responder():
+        return render(request, "usuarios/panel_estudiante.html", panel.resumen(request.estudiante_id))
+
+    return await sync_to_async(responder)()
@@ -0,0 +1,16 @@
+/* Registro: mostrar el campo RUT solo cuando el rol es "estudiante". */
+document.addEventListener("DOMContentLoaded", function () {
+    const selectRol = document.getElementById("rolSelect");
+    const campoRut = document.getElementById("campoRut");
+    const inputRut = campoRut.querySelector("input");
+
+    selectRol.addEventListener("change", () => {
+        if (selectRol.value === "estudiante") {
+            campoRut.style.display = "block";
+            inputRut.required = true;
+        } else {
+            campoRut.style.display = "none";
+            inputRut.required = false;
+        }
+    });
+});
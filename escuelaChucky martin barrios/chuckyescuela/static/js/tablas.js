@@ -0,0 +1,18 @@
+/*
+ * DataTables en español para las tablas marcadas con data-tabla.
+ * Orden inicial: atributo data-orden (JSON, p. ej. '[[0, "asc"]]');
+ * data-orden="[]" respeta el orden que viene del servidor.
+ */
+$(document).ready(function () {
+    $("table[data-tabla]").each(function () {
+        var orden = this.dataset.orden ? JSON.parse(this.dataset.orden) : [[0, "asc"]];
+        $(this).DataTable({
+            pageLength: 10,
+            lengthMenu: [5, 10, 25, 50],
+            order: orden,
+            language: {
+                url: "https://cdn.datatables.net/plug-ins/1.13.8/i18n/es-ES.json"
+            }
+        });
+    });
+});